@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Pokemon, GameSession, Guess
+from .models import (
+    DatasetVersion, FirstGuessDailyRollup, GameArchive, GameSession, Guess, PlayerStats, Pokemon,
+    TargetDailyRollup,
+)
 
 @admin.register(Pokemon)
 class PokemonAdmin(admin.ModelAdmin):
@@ -14,4 +17,41 @@ class GameSessionAdmin(admin.ModelAdmin):
 
 @admin.register(Guess)
 class GuessAdmin(admin.ModelAdmin):
-    list_display = ['game_session', 'pokemon', 'guess_number', 'created_at']
\ No newline at end of file
+    list_display = ['game_session', 'pokemon', 'guess_number', 'created_at']
+
+@admin.register(DatasetVersion)
+class DatasetVersionAdmin(admin.ModelAdmin):
+    list_display = ['name', 'content_hash', 'record_count', 'loaded_at']
+
+@admin.register(PlayerStats)
+class PlayerStatsAdmin(admin.ModelAdmin):
+    list_display = ['key', 'games_played', 'games_won', 'current_streak', 'max_streak', 'last_game_at']
+    search_fields = ['key']
+
+@admin.register(TargetDailyRollup)
+class TargetDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ['day', 'target_pokemon', 'games_completed', 'games_won', 'solve_rate', 'average_guesses']
+    list_filter = ['day']
+    search_fields = ['target_pokemon__name']
+    date_hierarchy = 'day'
+    list_select_related = ['target_pokemon']
+    
+    @admin.display(description='Solve rate')
+    def solve_rate(self, obj):
+        return f"{obj.games_won / obj.games_completed * 100:.1f}%" if obj.games_completed else '-'
+    
+    @admin.display(description='Avg guesses to solve')
+    def average_guesses(self, obj):
+        return f"{obj.guesses_to_win / obj.games_won:.2f}" if obj.games_won else '-'
+
+@admin.register(FirstGuessDailyRollup)
+class FirstGuessDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ['day', 'pokemon', 'times_guessed']
+    list_filter = ['day']
+    search_fields = ['pokemon__name']
+    date_hierarchy = 'day'
+    list_select_related = ['pokemon']
+
+@admin.register(GameArchive)
+class GameArchiveAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'before', 'sessions', 'guesses', 'file']
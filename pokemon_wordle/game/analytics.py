@@ -0,0 +1,152 @@
+"""
+Global per-Pokemon analytics, kept as daily rollups.
+
+Two tables answer questions like "solve rate for target X", "average guesses
+to solve" and "most common first guess" without aggregating over
+GameSession:
+
+* ``TargetDailyRollup``: (target Pokemon, day) -> games finished, games won
+  and the guesses those wins took;
+* ``FirstGuessDailyRollup``: (opening guess, day) -> number of games.
+
+Rows are bumped with ``F()`` increments as each game finishes (the
+``game_completed`` signal). ``rollup_games`` recomputes whole days from the
+history, streaming one day at a time so memory stays bounded by the number
+of Pokemon rather than the number of games. Only past days are recomputed:
+games still finishing today would be incremented into rows the rebuild is
+about to replace, and lost.
+"""
+
+import datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import FirstGuessDailyRollup, GameSession, TargetDailyRollup
+
+
+def increment(model, lookup, **deltas):
+    """Add ``deltas`` to the row matching ``lookup``, creating it if needed"""
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Another worker created the row between our UPDATE and INSERT
+        model.objects.filter(**lookup).update(**changes)
+
+
+def game_day(game):
+    return timezone.localdate(game.completed_at)
+
+
+def record_completed_game(game):
+    """Fold one finished game into the rollups"""
+    if game.completed_at is None:
+        return
+    day = game_day(game)
+    with transaction.atomic():
+        increment(
+            TargetDailyRollup,
+            {'target_pokemon_id': game.target_pokemon_id, 'day': day},
+            games_completed=1,
+            games_won=int(game.is_won),
+            guesses_to_win=game.guesses_count if game.is_won else 0,
+        )
+        if game.guess_ids:
+            increment(FirstGuessDailyRollup, {'pokemon_id': game.guess_ids[0], 'day': day}, times_guessed=1)
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    return start, start + datetime.timedelta(days=1)
+
+
+def finished_games_between(since, until):
+    """Finished games completed on days ``since``..``until``, with their guesses"""
+    start, _ = day_bounds(since)
+    _, end = day_bounds(until)
+    return (
+        GameSession.objects.filter(completed_at__gte=start, completed_at__lt=end)
+        .order_by('completed_at')
+        .values_list('completed_at', 'target_pokemon_id', 'is_won', 'guesses_count', 'guess_ids')
+    )
+
+
+def replace_day(day, targets, first_guesses):
+    """Overwrite one day's rollup rows with freshly computed totals"""
+    with transaction.atomic():
+        TargetDailyRollup.objects.filter(day=day).delete()
+        FirstGuessDailyRollup.objects.filter(day=day).delete()
+        TargetDailyRollup.objects.bulk_create([
+            TargetDailyRollup(target_pokemon_id=target_id, day=day, games_completed=completed,
+                              games_won=won, guesses_to_win=guesses)
+            for target_id, (completed, won, guesses) in targets.items()
+        ])
+        FirstGuessDailyRollup.objects.bulk_create([
+            FirstGuessDailyRollup(pokemon_id=pokemon_id, day=day, times_guessed=count)
+            for pokemon_id, count in first_guesses.items()
+        ])
+
+
+def rebuild_rollups(since, until, chunk_size=2000, log=None):
+    """Recompute the rollups for every day from ``since`` to ``until``; returns games counted"""
+    if until >= timezone.localdate():
+        raise ValueError(f'Cannot rebuild the rollups for {until}: games are still finishing that day')
+    log = log or (lambda message: None)
+    counted = 0
+    day = since
+    targets, first_guesses = {}, {}
+
+    def flush(day):
+        replace_day(day, targets, first_guesses)
+        log(f'{day}: {sum(t[0] for t in targets.values())} games, {len(targets)} targets')
+        targets.clear()
+        first_guesses.clear()
+
+    for completed_at, target_id, is_won, guesses, guess_ids in (
+        finished_games_between(since, until).iterator(chunk_size=chunk_size)
+    ):
+        game_date = timezone.localdate(completed_at)
+        while day < game_date:
+            flush(day)
+            day += datetime.timedelta(days=1)
+        completed, won, to_win = targets.get(target_id, (0, 0, 0))
+        targets[target_id] = (completed + 1, won + is_won, to_win + (guesses if is_won else 0))
+        if guess_ids:
+            first_guesses[guess_ids[0]] = first_guesses.get(guess_ids[0], 0) + 1
+        counted += 1
+    # Days with no games left are still cleared
+    while day <= until:
+        flush(day)
+        day += datetime.timedelta(days=1)
+    return counted
+
+
+def latest_rollup_day():
+    return TargetDailyRollup.objects.order_by('-day').values_list('day', flat=True).first()
+
+
+def target_summary(since, until):
+    """Per-target totals over a day range, most played first"""
+    rows = (
+        TargetDailyRollup.objects.filter(day__gte=since, day__lte=until)
+        .values('target_pokemon_id')
+        .annotate(games=Sum('games_completed'), won=Sum('games_won'), guesses=Sum('guesses_to_win'))
+        .order_by('-games', 'target_pokemon_id')
+    )
+    return list(rows)
+
+
+def first_guess_summary(since, until, limit=10):
+    """The most common opening guesses over a day range"""
+    rows = (
+        FirstGuessDailyRollup.objects.filter(day__gte=since, day__lte=until)
+        .values('pokemon_id')
+        .annotate(times=Sum('times_guessed'))
+        .order_by('-times', 'pokemon_id')[:limit]
+    )
+    return list(rows)
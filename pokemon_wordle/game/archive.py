@@ -0,0 +1,175 @@
+"""
+Retention for GameSession/Guess.
+
+``archive_games`` moves every completed game (won, lost or abandoned for a
+new one) created, and if finished by play also finished, before a cutoff
+day out of the database into a gzip JSON-lines file. Games still in
+progress stay, however old::
+
+    {"format": "pokeguess-games", "version": 1, "before": "2024-01-01",
+     "session_fields": [...], "guess_fields": [...]}
+    [<session values in session_fields order>, [[<guess values>], ...]]
+
+A game's guesses are its ``guess_ids`` session field. The guess values are
+the game's ``Guess`` log rows, if ``GAME_GUESS_LOG`` wrote any.
+
+Games go in batches. Each batch is locked, appended to the file as its own
+gzip member and fsynced, then deleted, all in one short transaction. An
+interrupted run therefore leaves a readable file that holds every game it
+deleted. ``gzip`` reads the concatenated members as one stream.
+
+Player stats and the daily rollups outlive the games they were built from.
+Before the first deletion, the rollups for the archived days are recomputed
+from the history while it is still complete. On the very first archive, the
+player stats are recomputed too. From then on, the ``game_completed``
+increments keep both current. Rebuilding either one over archived days would
+drop the archived games, so ``rollup_games`` and ``backfill_player_stats``
+check ``archived_before()``.
+"""
+
+import datetime
+import gzip
+import json
+import os
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .analytics import day_bounds, rebuild_rollups
+from .models import GameArchive, GameSession, Guess
+from .stats import rebuild_stats
+
+ARCHIVE_FORMAT = 'pokeguess-games'
+ARCHIVE_VERSION = 1
+
+SESSION_FIELDS = [
+    'id', 'session_key', 'user_id', 'target_pokemon_id', 'generation', 'is_completed', 'is_won',
+    'guesses_count', 'max_guesses', 'created_at', 'completed_at', 'puzzle_date', 'guess_ids',
+]
+GUESS_FIELDS = ['pokemon_id', 'guess_number', 'created_at']
+
+
+def _record_line(values):
+    return json.dumps(values, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+
+def expired_games(before):
+    """Completed games created before ``before`` and not finished on or after it"""
+    cutoff, _ = day_bounds(before)
+    return (
+        GameSession.objects.filter(is_completed=True, created_at__lt=cutoff)
+        .exclude(completed_at__gte=cutoff)
+    )
+
+
+def archived_before():
+    """The latest day games were archived before, or None"""
+    return GameArchive.objects.order_by('-before').values_list('before', flat=True).first()
+
+
+def archive_path(directory, before):
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%S')
+    return os.path.join(directory, f'games-before-{before}-{stamp}.jsonl.gz')
+
+
+def write_member(out, lines):
+    """Append ``lines`` to ``out`` as one gzip member and flush it to disk"""
+    out.write(gzip.compress(('\n'.join(lines) + '\n').encode('utf-8'), mtime=0))
+    out.flush()
+    os.fsync(out.fileno())
+
+
+def read_archive(path):
+    """Yield every archived game as a dict, with its guesses under ``guesses``"""
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        header = json.loads(archive.readline())
+        if header.get('format') != ARCHIVE_FORMAT or header.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f'{path} is not a version {ARCHIVE_VERSION} game archive')
+        for line in archive:
+            *values, guesses = json.loads(line)
+            game = dict(zip(header['session_fields'], values))
+            game['guesses'] = [dict(zip(header['guess_fields'], guess)) for guess in guesses]
+            yield game
+
+
+def preserve_aggregates(before, chunk_size=2000, log=None):
+    """Bring the rollups (and, before the first archive, the player stats) up to date from history"""
+    log = log or (lambda message: None)
+    first = (
+        expired_games(before).filter(completed_at__isnull=False)
+        .order_by('completed_at').values_list('completed_at', flat=True).first()
+    )
+    if first is not None:
+        # Every game finished on these days is about to be archived, so the days are complete
+        since, until = timezone.localdate(first), before - datetime.timedelta(days=1)
+        counted = rebuild_rollups(since, until, chunk_size=chunk_size)
+        log(f'Rolled up {counted} games from {since} to {until}')
+    if not GameArchive.objects.exists():
+        written = rebuild_stats(chunk_size=chunk_size)
+        log(f'Rebuilt {written} player stats rows')
+
+
+def archive_batch(before, after_id, batch_size, out):
+    """Archive and delete up to ``batch_size`` games with ids above ``after_id``
+
+    Returns (last id, sessions, guesses), or None when nothing is left.
+    """
+    with transaction.atomic():
+        ids = list(
+            expired_games(before).filter(id__gt=after_id).select_for_update()
+            .order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return None
+        guesses = {}
+        for game_id, *guess in (
+            Guess.objects.filter(game_session_id__in=ids)
+            .order_by('game_session_id', 'guess_number')
+            .values_list('game_session_id', *GUESS_FIELDS)
+        ):
+            guesses.setdefault(game_id, []).append(guess)
+        rows = GameSession.objects.filter(id__in=ids).order_by('id').values_list(*SESSION_FIELDS)
+        write_member(out, [_record_line([*row, guesses.get(row[0], [])]) for row in rows])
+        # Guesses go with their game (on_delete=CASCADE)
+        _, deleted = GameSession.objects.filter(id__in=ids).delete()
+    return ids[-1], deleted.get('game.GameSession', 0), deleted.get('game.Guess', 0)
+
+
+def archive_games(before, path, batch_size=500, chunk_size=2000, log=None, pause=0):
+    """Move every expired game to a new archive file at ``path``; returns the GameArchive
+
+    ``pause`` seconds are slept between batches to leave room for live traffic.
+    """
+    log = log or (lambda message: None)
+    preserve_aggregates(before, chunk_size=chunk_size, log=log)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # The run is recorded before anything is deleted, so the rebuild guards hold even if it dies
+    record = GameArchive.objects.create(file=str(path), before=before)
+    after_id = 0
+    with open(path, 'xb') as out:
+        header = {
+            'format': ARCHIVE_FORMAT,
+            'version': ARCHIVE_VERSION,
+            'before': before.isoformat(),
+            'session_fields': SESSION_FIELDS,
+            'guess_fields': GUESS_FIELDS,
+        }
+        write_member(out, [json.dumps(header)])
+        while True:
+            batch = archive_batch(before, after_id, batch_size, out)
+            if batch is None:
+                break
+            after_id, sessions, guesses = batch
+            GameArchive.objects.filter(pk=record.pk).update(
+                sessions=F('sessions') + sessions, guesses=F('guesses') + guesses,
+            )
+            record.sessions += sessions
+            record.guesses += guesses
+            log(f'{record.sessions} games, {record.guesses} guesses archived')
+            if pause:
+                time.sleep(pause)
+    return record
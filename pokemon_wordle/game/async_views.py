@@ -0,0 +1,149 @@
+"""
+Async versions of the hot game endpoints, for serving under ASGI.
+
+Enabled with ``GAME_ASYNC_VIEWS = True`` and an ASGI server (see the README).
+They use Django's async ORM API, so a slow database round trip suspends one
+coroutine instead of blocking a whole worker. Validation and response
+building are shared with the sync views in ``game.views``.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core import signing
+from django.db import IntegrityError
+from django.http import JsonResponse
+
+from .models import GameSession
+from .payloads import build_pokemon_list, pokemon_list_cache_control
+from .registry import aget_registry
+from .stats import request_user_id
+from .targets import bag_store, pick_target
+from .tokens import TokenGame
+from .views import (
+    candidates_response, choose_target, game_response, game_state_response, game_token_from,
+    guess_response, parse_guess, replace_active_game, requested_difficulty, requested_game_mode,
+    resolve_guess, uses_game_tokens, wants_compact,
+)
+
+
+async def aensure_session_key(request):
+    """Make sure the request has a session key, creating the session if needed"""
+    if not request.session.session_key:
+        await sync_to_async(request.session.create)()
+    return request.session.session_key
+
+
+async def aget_or_create_session(request, registry):
+    """Async version of views.get_or_create_session()"""
+    session_key = await aensure_session_key(request)
+
+    try:
+        game_session = await GameSession.objects.aget(
+            session_key=session_key,
+            is_completed=False
+        )
+        game_session.target_pokemon = registry.get(game_session.target_pokemon_id)
+    except GameSession.DoesNotExist:
+        # The shuffle bag lives in the session, which is only loaded synchronously
+        target_pokemon = await sync_to_async(pick_target)(registry, bag_store(request))
+        # request.user also reads the session (and the user row when logged in)
+        user_id = await sync_to_async(request_user_id)(request)
+        try:
+            game_session = await GameSession.objects.acreate(
+                session_key=session_key,
+                user_id=user_id,
+                target_pokemon=target_pokemon,
+                generation=1
+            )
+        except IntegrityError:
+            # A concurrent request created the active game first (one_active_game_per_session)
+            game_session = await GameSession.objects.aget(session_key=session_key, is_completed=False)
+            game_session.target_pokemon = registry.get(game_session.target_pokemon_id)
+
+    return game_session
+
+
+async def aget_current_game(request, registry, token=None, mode=None, difficulty=None):
+    """Async version of views.get_current_game()"""
+    if not uses_game_tokens():
+        return await aget_or_create_session(request, registry)
+    if token:
+        return TokenGame.from_token(token, registry)
+    target_pokemon, puzzle_date = choose_target(registry, mode, difficulty=difficulty)
+    return TokenGame.start(target_pokemon, puzzle_date=puzzle_date)
+
+
+async def new_game(request):
+    """Start a new game (``mode=daily`` plays the shared daily puzzle)"""
+    registry = await aget_registry()
+    mode = requested_game_mode(request)
+    if uses_game_tokens():
+        game = await aget_current_game(request, registry, mode=mode, difficulty=requested_difficulty(request))
+        return game_response(game, {'status': 'success', 'message': 'New game started!'})
+
+    session_key = await aensure_session_key(request)
+    target_pokemon, puzzle_date = await sync_to_async(choose_target)(
+        registry, mode, bag_store(request), requested_difficulty(request)
+    )
+    user_id = await sync_to_async(request_user_id)(request)
+    # Transactions need one connection, so ending and creating run together in a thread
+    await sync_to_async(replace_active_game)(session_key, user_id, target_pokemon, puzzle_date)
+    return JsonResponse({'status': 'success', 'message': 'New game started!'})
+
+
+async def get_pokemon_list(request):
+    """Get list of Gen 1 Pokemon for autocomplete"""
+    registry = await aget_registry()
+    payload = registry.derived('pokemon_list', build_pokemon_list)
+    return payload.serve(request, pokemon_list_cache_control())
+
+
+async def make_guess(request):
+    """Process a guess"""
+    data, pokemon_name, error = parse_guess(request)
+    if error:
+        return error
+
+    registry = await aget_registry()
+    try:
+        game = await aget_current_game(request, registry, data.get('game_token'))
+    except signing.BadSignature:
+        return JsonResponse({'error': 'Invalid game token'}, status=400)
+
+    guessed_pokemon, error = resolve_guess(registry, game, pokemon_name)
+    if error:
+        return error
+
+    if await game.ahas_guessed(guessed_pokemon):
+        return JsonResponse({'error': 'Pokemon already guessed'}, status=400)
+
+    is_correct = await game.arecord_guess(guessed_pokemon)
+    return guess_response(registry, game, guessed_pokemon, is_correct, wants_compact(request, data))
+
+
+async def get_game_state(request):
+    """Get current game state with images"""
+    registry = await aget_registry()
+    try:
+        game = await aget_current_game(request, registry, game_token_from(request))
+    except signing.BadSignature:
+        game = await aget_current_game(request, registry)
+
+    return game_state_response(registry, game, await game.aguessed_pokemon_ids(), wants_compact(request))
+
+
+
+async def get_candidates(request):
+    """Pokemon still consistent with the current game's feedback (``list=1`` names them)"""
+    registry = await aget_registry()
+    try:
+        game = await aget_current_game(request, registry, game_token_from(request))
+    except signing.BadSignature:
+        return JsonResponse({'error': 'Invalid game token'}, status=400)
+
+    include_list = request.GET.get('list') in ('1', 'true')
+    return candidates_response(registry, game, await game.aguessed_pokemon_ids(), include_list)
+
+
+# csrf_exempt() only wraps sync callables in Django 4.2; mark these directly
+new_game.csrf_exempt = True
+make_guess.csrf_exempt = True
@@ -0,0 +1,111 @@
+"""
+Sprite atlases for the autocomplete dropdown.
+
+``build_sprite_atlas`` packs every sprite of a generation into one image in
+the local image store (see ``game.images``), next to a JSON manifest::
+
+    <POKEMON_IMAGE_ROOT>/atlas/<hash>.webp
+    <POKEMON_IMAGE_ROOT>/atlas/gen1.json    {"url": ..., "cell": 64, "offsets": {"25": [x, y]}, ...}
+
+``/pokemon-list/`` exposes the manifest so the client loads a single image and
+positions it per Pokemon. The sprite set hash covers the sprite URLs, the cell
+size and the image format; an atlas is only rebuilt when it changes.
+"""
+
+import hashlib
+from io import BytesIO
+import json
+import math
+import os
+
+from .images import Image, image_root, local_image_url, thumbnail_format, write_once
+from .importer import write_json_atomic
+
+ATLAS_DIR = 'atlas'
+
+
+def sprite_source(pokemon):
+    return pokemon.sprite_url or pokemon.image_url
+
+
+def sprite_set_hash(pokemon_list, cell):
+    _, extension = thumbnail_format()
+    sources = [[p.pokedex_number, sprite_source(p)] for p in pokemon_list]
+    return hashlib.sha256(json.dumps([cell, extension, sources]).encode('utf-8')).hexdigest()
+
+
+def manifest_path(generation, root=None):
+    return os.path.join(root or image_root(), ATLAS_DIR, f'gen{generation}.json')
+
+
+def read_atlas(generation, root=None):
+    """The atlas manifest for a generation, or None if none was built"""
+    try:
+        with open(manifest_path(generation, root), encoding='utf-8') as manifest:
+            return json.load(manifest)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(generation, set_hash, root=None):
+    atlas = read_atlas(generation, root)
+    # An atlas with missing sprites is retried on the next run
+    return bool(
+        atlas and atlas.get('sprite_set_hash') == set_hash and atlas.get('complete')
+        and os.path.exists(os.path.join(root or image_root(), atlas['file']))
+    )
+
+
+def fit_sprite(data, cell):
+    """Crop a sprite to its visible pixels and fit it in a ``cell`` square"""
+    with Image.open(BytesIO(data)) as source:
+        sprite = source.convert('RGBA')
+    bbox = sprite.getbbox()
+    if bbox:
+        sprite = sprite.crop(bbox)
+    sprite.thumbnail((cell, cell), Image.LANCZOS)
+    return sprite
+
+
+def build_atlas(generation, pokemon_list, sprites, cell, set_hash, root=None):
+    """Pack ``sprites`` (pokedex_number -> bytes) into an atlas; returns its manifest
+
+    Pokemon without sprite bytes get no offset, so the client falls back to
+    their own image.
+    """
+    root = root or image_root()
+    packed = [p for p in pokemon_list if sprites.get(p.pokedex_number)]
+    columns = max(1, math.ceil(math.sqrt(len(packed))))
+    rows = max(1, math.ceil(len(packed) / columns))
+    canvas = Image.new('RGBA', (columns * cell, rows * cell), (0, 0, 0, 0))
+
+    offsets = {}
+    for index, pokemon in enumerate(packed):
+        sprite = fit_sprite(sprites[pokemon.pokedex_number], cell)
+        x, y = (index % columns) * cell, (index // columns) * cell
+        canvas.paste(sprite, (x + (cell - sprite.width) // 2, y + (cell - sprite.height) // 2))
+        offsets[str(pokemon.pokedex_number)] = [x, y]
+
+    image_format, extension = thumbnail_format()
+    out = BytesIO()
+    if image_format == 'WEBP':
+        canvas.save(out, image_format, lossless=True, method=6)
+    else:
+        canvas.save(out, image_format, optimize=True)
+    data = out.getvalue()
+    name = f'{ATLAS_DIR}/{hashlib.sha256(data).hexdigest()}.{extension}'
+    write_once(os.path.join(root, name), data)
+
+    manifest = {
+        'generation': generation,
+        'sprite_set_hash': set_hash,
+        'file': name,
+        'url': local_image_url(name),
+        'cell': cell,
+        'width': canvas.width,
+        'height': canvas.height,
+        'offsets': offsets,
+        'complete': len(packed) == len(pokemon_list),
+    }
+    write_json_atomic(manifest_path(generation, root), manifest)
+    return manifest
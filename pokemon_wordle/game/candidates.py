@@ -0,0 +1,110 @@
+"""
+Remaining candidates: which Pokemon are still consistent with a game's feedback.
+
+``CandidateIndex`` answers with bitsets. A set of Pokemon is a Python int
+where bit ``i`` stands for the ``i``-th Pokemon of the pool. Per compared
+attribute it keeps:
+
+* exact attributes (types, colour, habitat, legendary): one bitset per value;
+* numeric attributes (number, height, weight, BST): the distinct values in
+  order, with running bitsets of the Pokemon below and above each one.
+
+One piece of feedback is one AND. ``correct`` keeps the Pokemon equal to the
+guess, ``incorrect`` drops them, and ``low`` / ``high`` keep the Pokemon above
+or below it. A whole game is at most ``max_guesses * 9`` ANDs over ``n``-bit
+ints, a few microseconds even with every generation loaded. The index is
+built once per registry snapshot and generation.
+"""
+
+import bisect
+import random
+
+from .comparison import ATTRIBUTES, CORRECT, EXACT, HIGH, INCORRECT, LOW
+
+
+class CandidateIndex:
+    """Bitsets per (attribute, value) over one pool of Pokemon"""
+
+    def __init__(self, pool):
+        self.pokemon = tuple(pool)
+        self.everyone = (1 << len(self.pokemon)) - 1
+        self.attributes = []
+        for field, kind, _ in ATTRIBUTES:
+            equal = {}
+            for position, pokemon in enumerate(self.pokemon):
+                value = getattr(pokemon, field)
+                equal[value] = equal.get(value, 0) | (1 << position)
+            if kind == EXACT:
+                self.attributes.append((field, kind, equal, None, None, None))
+                continue
+            values = sorted(equal)
+            below, above = [0], [0]
+            for value in values:
+                below.append(below[-1] | equal[value])
+            for value in reversed(values):
+                above.append(above[-1] | equal[value])
+            above.reverse()
+            # below[i]: values < values[i]; above[i]: values >= values[i]
+            self.attributes.append((field, kind, equal, values, below, above))
+
+    def narrow(self, candidates, guess, statuses):
+        """Keep the ``candidates`` that would give ``statuses`` for ``guess``"""
+        for (field, kind, equal, values, below, above), status in zip(self.attributes, statuses):
+            value = getattr(guess, field)
+            if status == CORRECT:
+                candidates &= equal.get(value, 0)
+            elif status == INCORRECT:
+                candidates &= ~equal.get(value, 0)
+            elif status == LOW:
+                # The guess was too low: the target's value is above it
+                candidates &= above[bisect.bisect_right(values, value)]
+            elif status == HIGH:
+                candidates &= below[bisect.bisect_left(values, value)]
+            if not candidates:
+                break
+        return candidates
+
+    def filter(self, feedback):
+        """Bitset of the Pokemon consistent with every (guess, statuses) pair"""
+        candidates = self.everyone
+        for guess, statuses in feedback:
+            candidates = self.narrow(candidates, guess, statuses)
+        return candidates
+
+    @staticmethod
+    def count(candidates):
+        return bin(candidates).count('1')
+
+    def members(self, candidates):
+        """The Pokemon in a bitset, in pool order"""
+        found = []
+        while candidates:
+            lowest = candidates & -candidates
+            found.append(self.pokemon[lowest.bit_length() - 1])
+            candidates ^= lowest
+        return found
+
+    def pick(self, candidates, seed):
+        """One Pokemon of a non-empty bitset, the same for the same ``seed``"""
+        return self.members(candidates)[random.Random(seed).randrange(self.count(candidates))]
+
+
+def get_candidate_index(registry, generation=1):
+    return registry.derived(
+        ('candidates', generation), lambda r: CandidateIndex(r.generation(generation))
+    )
+
+
+def game_feedback(registry, game, pokemon_ids):
+    """(guess, statuses) for every guess of a game, as the player saw them"""
+    return [
+        (guess, registry.comparison.statuses(guess, game.target_pokemon))
+        for guess in map(registry.get, pokemon_ids)
+    ]
+
+
+def remaining_candidates(registry, game, pokemon_ids):
+    """(index, bitset) of the Pokemon still consistent with a game's guesses"""
+    index = get_candidate_index(registry, game.generation)
+    return index, index.filter(game_feedback(registry, game, pokemon_ids))
+
@@ -0,0 +1,150 @@
+"""
+Precomputed guess-vs-target comparison matrix.
+
+Every (guess, target) pair gets one status byte per compared attribute. The
+matrix is a single ``bytearray`` laid out target-major::
+
+    matrix[((target_index * n) + guess_index) * width + attribute]
+
+so the nine statuses for a guess are one contiguous slice, and all the rows a
+game ever reads (one target, many guesses) sit in the same ``n * width`` block.
+With ~1000 Pokemon that is ~9 MB per worker.
+"""
+
+CORRECT = 0
+INCORRECT = 1
+LOW = 2
+HIGH = 3
+
+STATUS_NAMES = ('correct', 'incorrect', 'low', 'high')
+
+EXACT = 'exact'
+NUMERIC = 'numeric'
+
+# (field, comparison kind, value shown when the field is empty)
+ATTRIBUTES = (
+    ('pokedex_number', NUMERIC, None),
+    ('type1', EXACT, None),
+    ('type2', EXACT, 'None'),
+    ('height', NUMERIC, None),
+    ('weight', NUMERIC, None),
+    ('base_stat_total', NUMERIC, None),
+    ('is_legendary', EXACT, None),
+    ('color', EXACT, None),
+    ('habitat', EXACT, 'Unknown'),
+)
+
+FIELDS = tuple(field for field, _, _ in ATTRIBUTES)
+
+
+def compare_value(kind, guess_val, target_val):
+    """Status code for a single attribute"""
+    if guess_val == target_val:
+        return CORRECT
+    if kind == EXACT:
+        return INCORRECT
+    return LOW if guess_val < target_val else HIGH
+
+
+def compare(guess, target):
+    """Status codes for every attribute, computed field by field"""
+    return bytes(
+        compare_value(kind, getattr(guess, field), getattr(target, field))
+        for field, kind, _ in ATTRIBUTES
+    )
+
+
+class ComparisonEngine:
+    """Status matrix for every (guess, target) pair of a set of Pokemon"""
+
+    width = len(ATTRIBUTES)
+
+    def __init__(self, pokemon):
+        self.pokemon = tuple(pokemon)
+        self.index = {p.id: i for i, p in enumerate(self.pokemon)}
+        self.size = len(self.pokemon)
+        self.matrix = bytearray(self.size * self.size * self.width)
+        # Displayed values never change either, so keep them next to the matrix
+        self.values = [display_values(p) for p in self.pokemon]
+        self._build()
+
+    @property
+    def nbytes(self):
+        return len(self.matrix)
+
+    def _build(self):
+        n, width = self.size, self.width
+        pokemon = self.pokemon
+        for a, (field, kind, _) in enumerate(ATTRIBUTES):
+            column = [getattr(p, field) for p in pokemon]
+            if kind == NUMERIC:
+                # Rank once so every row compares small ints instead of floats
+                ranks = {value: r for r, value in enumerate(sorted(set(column)))}
+                column = [ranks[v] for v in column]
+            rows = {}
+            for t, target_value in enumerate(column):
+                row = rows.get(target_value)
+                if row is None:
+                    if kind == EXACT:
+                        row = bytes(CORRECT if v == target_value else INCORRECT for v in column)
+                    else:
+                        row = bytes(
+                            CORRECT if v == target_value else LOW if v < target_value else HIGH
+                            for v in column
+                        )
+                    rows[target_value] = row
+                base = t * n * width
+                self.matrix[base + a:base + n * width:width] = row
+
+    def lookup(self, guess, target):
+        """Displayed values and status codes for ``guess`` against ``target``"""
+        g = self.index.get(guess.id)
+        t = self.index.get(target.id)
+        if g is None or t is None:
+            return display_values(guess), compare(guess, target)
+        offset = (t * self.size + g) * self.width
+        return self.values[g], self.matrix[offset:offset + self.width]
+
+    def statuses(self, guess, target):
+        """Status codes for ``guess`` against ``target`` (one byte per attribute)"""
+        return bytes(self.lookup(guess, target)[1])
+
+
+def display_values(pokemon):
+    """Attribute values as shown to the player, in ``ATTRIBUTES`` order"""
+    values = []
+    for field, _, empty in ATTRIBUTES:
+        value = getattr(pokemon, field)
+        values.append(empty if empty is not None and not value else value)
+    return tuple(values)
+
+
+def pack_statuses(statuses):
+    """Status codes as one int, two bits per attribute (attribute ``a`` at bits ``2a``)"""
+    code = 0
+    for status in reversed(statuses):
+        code = (code << 2) | status
+    return code
+
+
+def build_compact_guess_result(engine, guess, target):
+    """Compact per-guess payload: ``[pokedex_number, packed statuses]``
+
+    The client takes the name, images and displayed values from
+    ``/pokemon-list/``, so only what depends on the target is sent.
+    """
+    return [guess.pokedex_number, pack_statuses(engine.lookup(guess, target)[1])]
+
+
+def build_guess_result(engine, guess, target):
+    """Build the per-guess payload returned by ``make_guess`` and ``get_game_state``"""
+    values, statuses = engine.lookup(guess, target)
+    result = {
+        'pokemon_name': guess.name,
+        'image_url': guess.image_url,
+        'sprite_url': guess.sprite_url,
+        'display_image': guess.get_display_image(),  # Best available image
+    }
+    for field, value, status in zip(FIELDS, values, statuses):
+        result[field] = {'value': value, 'status': STATUS_NAMES[status]}
+    return result
@@ -0,0 +1,89 @@
+"""
+Daily shared puzzle.
+
+Every player gets the same target on a given day. Targets follow a seeded
+schedule: each cycle of ``len(pool)`` days is a keyed shuffle of the pool, so
+no Pokemon repeats until every other one has been the answer, and the order
+can't be predicted without ``SECRET_KEY``.
+
+Because the target is shared, a guess result only depends on (day, guessed
+Pokemon). Each worker memoizes results in today's ``DailyPuzzle``, so peak
+traffic on one puzzle is mostly memo hits. Only today's puzzle is kept; a game
+still finishing an older puzzle gets a fresh, uncached ``DailyPuzzle``.
+"""
+
+import datetime
+import random
+
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from .comparison import build_guess_result
+
+SCHEDULE_EPOCH = datetime.date(2025, 1, 1)
+
+
+def puzzle_day():
+    """Today's puzzle date, in the site's time zone"""
+    return timezone.localdate()
+
+
+def seconds_until_next_puzzle():
+    now = timezone.localtime()
+    tomorrow = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time(),
+                                         tzinfo=now.tzinfo)
+    return max(1, int((tomorrow - now).total_seconds()))
+
+
+def daily_target(registry, day, generation=1):
+    """The scheduled target for ``day``"""
+    pool = registry.generation(generation)
+    cycle, position = divmod((day - SCHEDULE_EPOCH).days, len(pool))
+    order = list(range(len(pool)))
+    seed = salted_hmac('game.daily', f'{generation}:{cycle}').hexdigest()
+    random.Random(seed).shuffle(order)
+    return pool[order[position]]
+
+
+class DailyPuzzle:
+    """Precomputed target, reveal payload and guess results for one day"""
+
+    def __init__(self, registry, day, generation=1):
+        self.registry = registry
+        self.day = day
+        self.generation = generation
+        self.number = (day - SCHEDULE_EPOCH).days + 1
+        self.target = daily_target(registry, day, generation)
+        self.reveal = {
+            'target_pokemon': self.target.name,
+            'target_image': self.target.get_display_image('lg'),
+        }
+        self.results = {}
+
+    def info(self):
+        """Public description of the puzzle (never includes the answer)"""
+        return {'date': self.day.isoformat(), 'number': self.number, 'generation': self.generation}
+
+    def guess_result(self, guessed_pokemon):
+        """Result for a guess, memoized for the day"""
+        result = self.results.get(guessed_pokemon.id)
+        if result is None:
+            result = self.results[guessed_pokemon.id] = build_guess_result(
+                self.registry.comparison, guessed_pokemon, self.target
+            )
+        return result
+
+
+def get_daily_puzzle(registry, day=None, generation=1):
+    """The puzzle for ``day`` (default today); today's is built once per worker and dataset version"""
+    today = puzzle_day()
+    day = day or today
+    # One slot per generation, so a long-lived worker only ever holds today's puzzle
+    slot = registry.derived(('daily', generation), lambda r: {})
+    puzzle = slot.get(day)
+    if puzzle is None:
+        puzzle = DailyPuzzle(registry, day, generation)
+        if day == today:
+            slot.clear()
+            slot[day] = puzzle
+    return puzzle
@@ -0,0 +1,132 @@
+"""
+Versioned offline Pokédex bundle.
+
+A bundle is a gzip-compressed JSON-lines file. The first line is a header::
+
+    {"format": "pokeguess-pokedex", "version": 1, "fields": [...],
+     "count": 151, "content_hash": "<sha256>"}
+
+and every following line is one Pokemon as a JSON array in ``fields`` order.
+The content hash covers the field list and every record line, so it identifies
+the dataset independently of when or where it was exported. Loading stores it
+in ``DatasetVersion``; a database that already holds the same hash is left
+alone, and the hash becomes the registry's version stamp so everything derived
+from the Pokédex is keyed by it.
+"""
+
+import gzip
+import hashlib
+import json
+
+from django.db import transaction
+
+from .models import DatasetVersion, Pokemon
+from .registry import invalidate_registry
+
+BUNDLE_FORMAT = 'pokeguess-pokedex'
+BUNDLE_VERSION = 1
+DATASET_NAME = 'pokedex'
+
+BUNDLE_FIELDS = [
+    'pokedex_number', 'name', 'type1', 'type2', 'generation', 'height', 'weight',
+    'base_stat_total', 'is_legendary', 'color', 'habitat', 'image_url', 'sprite_url',
+]
+
+
+class BundleError(Exception):
+    """The bundle is unreadable, of an unknown format or fails its hash check"""
+
+
+def _record_line(values):
+    return json.dumps(values, ensure_ascii=False, separators=(',', ':'))
+
+
+def content_hash(lines):
+    digest = hashlib.sha256(_record_line(BUNDLE_FIELDS).encode('utf-8'))
+    for line in lines:
+        digest.update(b'\n')
+        digest.update(line.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def export_bundle(path, queryset=None):
+    """Write the Pokemon table (or ``queryset``) to ``path``; returns the header"""
+    queryset = Pokemon.objects.order_by('pokedex_number') if queryset is None else queryset
+    lines = [_record_line(list(values)) for values in queryset.values_list(*BUNDLE_FIELDS)]
+    header = {
+        'format': BUNDLE_FORMAT,
+        'version': BUNDLE_VERSION,
+        'fields': BUNDLE_FIELDS,
+        'count': len(lines),
+        'content_hash': content_hash(lines),
+    }
+    # mtime=0 keeps identical datasets byte-identical
+    with open(path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as bundle:
+        bundle.write('\n'.join([json.dumps(header)] + lines).encode('utf-8') + b'\n')
+    return header
+
+
+def read_bundle_header(path):
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as bundle:
+            header = json.loads(bundle.readline())
+    except (OSError, ValueError) as e:
+        raise BundleError(f'Cannot read bundle {path}: {e}')
+    if header.get('format') != BUNDLE_FORMAT or header.get('version') != BUNDLE_VERSION:
+        raise BundleError(f'{path} is not a version {BUNDLE_VERSION} Pokédex bundle')
+    return header
+
+
+def read_bundle(path):
+    """Return (header, records) after verifying the content hash"""
+    header = read_bundle_header(path)
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as bundle:
+            bundle.readline()
+            lines = [line.rstrip('\n') for line in bundle if line.strip()]
+    except (OSError, ValueError) as e:
+        raise BundleError(f'Cannot read bundle {path}: {e}')
+    if len(lines) != header['count'] or content_hash(lines) != header['content_hash']:
+        raise BundleError(f'{path} failed its content hash check')
+    fields = header['fields']
+    return header, [dict(zip(fields, json.loads(line))) for line in lines]
+
+
+def current_version():
+    """Content hash of the loaded dataset, or None"""
+    return (
+        DatasetVersion.objects.filter(name=DATASET_NAME)
+        .values_list('content_hash', flat=True)
+        .first()
+    )
+
+
+def load_bundle(path, force=False):
+    """Load a bundle unless its hash is already loaded; returns (header, loaded)"""
+    header = read_bundle_header(path)
+    if not force and current_version() == header['content_hash']:
+        return header, False
+
+    header, records = read_bundle(path)
+    update_fields = [field for field in header['fields'] if field != 'pokedex_number']
+    with transaction.atomic():
+        Pokemon.objects.bulk_create(
+            [Pokemon(**record) for record in records],
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['pokedex_number'],
+            update_fields=update_fields,
+        )
+        DatasetVersion.objects.update_or_create(
+            name=DATASET_NAME,
+            defaults={'content_hash': header['content_hash'], 'record_count': header['count']}
+        )
+        # The content hash doubles as the registry version stamp
+        transaction.on_commit(lambda: invalidate_registry(header['content_hash']))
+    return header, True
+
+
+def mark_dataset_changed():
+    """Record that the Pokemon table no longer matches any loaded bundle"""
+    DatasetVersion.objects.filter(name=DATASET_NAME).delete()
+    transaction.on_commit(invalidate_registry)
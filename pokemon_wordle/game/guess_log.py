@@ -0,0 +1,96 @@
+"""
+Optional per-guess analytics log: the ``Guess`` table.
+
+A game keeps its guesses in ``GameSession.guess_ids``, so reading a game is
+one row and recording a guess is one UPDATE. Nothing on the request path
+reads ``Guess`` any more. With ``GAME_GUESS_LOG`` on, each recorded guess is
+queued here. One background thread per process drains the queue and
+bulk-inserts the rows, up to ``BATCH_SIZE`` per INSERT. The log is best
+effort: a batch that fails is reported and dropped, and the game itself is
+unaffected.
+"""
+
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# Queued by flush(): the writer closes its connection once the batch is written
+CLOSE = None
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def enabled():
+    return getattr(settings, 'GAME_GUESS_LOG', True)
+
+
+def log_guesses(game_session_id, pokemon_ids, first_number=1):
+    """Queue Guess rows for ``pokemon_ids``, numbered from ``first_number``"""
+    if not enabled() or not pokemon_ids:
+        return
+    for number, pokemon_id in enumerate(pokemon_ids, start=first_number):
+        _queue.put((game_session_id, pokemon_id, number))
+    _ensure_writer()
+
+
+def _ensure_writer():
+    global _writer
+    # After a fork the child has the queue but not the thread
+    if _writer is not None and _writer.is_alive():
+        return
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_drain, name='guess-log', daemon=True)
+            _writer.start()
+
+
+def _drain():
+    while True:
+        batch = [_queue.get()]
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            write_batch([row for row in batch if row is not CLOSE])
+            if CLOSE in batch:
+                connection.close()
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def write_batch(batch):
+    from .models import Guess
+    if not batch:
+        return
+    close_old_connections()
+    try:
+        # A replayed guess hits unique (game_session, pokemon) and is skipped
+        Guess.objects.bulk_create([
+            Guess(game_session_id=game_id, pokemon_id=pokemon_id, guess_number=number)
+            for game_id, pokemon_id, number in batch
+        ], ignore_conflicts=True)
+    except DatabaseError:
+        logger.exception('Dropped %d guess log rows', len(batch))
+        connection.close()
+
+
+def flush():
+    """Block until every queued guess is written and the writer's connection is closed
+
+    For management commands and benchmarks that are about to drop or swap the database.
+    """
+    if _writer is None or not _writer.is_alive():
+        return
+    _queue.put(CLOSE)
+    _queue.join()
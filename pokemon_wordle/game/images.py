@@ -0,0 +1,104 @@
+"""
+Local, content-addressed store for Pokemon artwork.
+
+``cache_pokemon_images`` downloads each Pokemon's artwork once and names every
+file after the SHA-256 of the downloaded bytes::
+
+    <POKEMON_IMAGE_ROOT>/original/<hash>.png
+    <POKEMON_IMAGE_ROOT>/<size>/<hash>.webp     (one per POKEMON_IMAGE_SIZES entry)
+
+Because a name can only ever refer to one set of bytes, the files are served
+with immutable cache headers (see ``game.middleware``). What was stored for a
+Pokemon is recorded in ``Pokemon.local_images``, e.g.
+``{"source": <url>, "original": "original/<hash>.png", "md": "md/<hash>.webp"}``.
+
+Thumbnails need Pillow (in requirements.txt). ``cache_pokemon_images
+--originals-only`` stores just the original, which still moves the artwork
+off the third-party host.
+"""
+
+import hashlib
+from io import BytesIO
+import os
+
+from django.conf import settings
+
+try:
+    from PIL import Image
+except ImportError:  # Without Pillow only originals can be stored
+    Image = None
+
+
+def image_root():
+    return str(settings.POKEMON_IMAGE_ROOT)
+
+
+def local_image_url(name):
+    """Public URL of a file in the image store"""
+    return settings.POKEMON_IMAGE_URL + name
+
+
+def thumbnail_format():
+    """('WEBP', 'webp') when Pillow can write WebP, else ('PNG', 'png')"""
+    if Image is not None and 'WEBP' in Image.registered_extensions().values():
+        return 'WEBP', 'webp'
+    return 'PNG', 'png'
+
+
+def write_once(path, data):
+    """Write ``data`` to a content-addressed ``path`` unless it is already there"""
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as tmp:
+        tmp.write(data)
+    os.replace(tmp_path, path)
+
+
+def make_thumbnail(data, size, image_format):
+    """Fit the artwork in a ``size`` x ``size`` transparent square"""
+    with Image.open(BytesIO(data)) as source:
+        image = source.convert('RGBA')
+    image.thumbnail((size, size), Image.LANCZOS)
+    canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    canvas.paste(image, ((size - image.width) // 2, (size - image.height) // 2))
+    out = BytesIO()
+    if image_format == 'WEBP':
+        canvas.save(out, image_format, quality=85, method=6)
+    else:
+        canvas.save(out, image_format, optimize=True)
+    return out.getvalue()
+
+
+def store_image(data, source_url, root=None, sizes=None):
+    """Store artwork bytes and their thumbnails; returns the ``local_images`` dict"""
+    root = root or image_root()
+    sizes = settings.POKEMON_IMAGE_SIZES if sizes is None else sizes
+    digest = hashlib.sha256(data).hexdigest()
+
+    extension = os.path.splitext(source_url.split('?')[0])[1].lower() or '.png'
+    stored = {'source': source_url, 'original': f'original/{digest}{extension}'}
+    write_once(os.path.join(root, stored['original']), data)
+
+    if Image is not None:
+        image_format, thumb_extension = thumbnail_format()
+        for name, size in sizes.items():
+            stored[name] = f'{name}/{digest}.{thumb_extension}'
+            path = os.path.join(root, stored[name])
+            if not os.path.exists(path):
+                write_once(path, make_thumbnail(data, size, image_format))
+    return stored
+
+
+def is_cached(local_images, source_url, root=None, sizes=None):
+    """Whether ``local_images`` is complete, on disk and taken from ``source_url``"""
+    root = root or image_root()
+    sizes = settings.POKEMON_IMAGE_SIZES if sizes is None else sizes
+    if not local_images or local_images.get('source') != source_url:
+        return False
+    names = ['original'] + (list(sizes) if Image is not None else [])
+    return all(
+        local_images.get(name) and os.path.exists(os.path.join(root, local_images[name]))
+        for name in names
+    )
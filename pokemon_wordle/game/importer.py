@@ -0,0 +1,205 @@
+"""
+Concurrent, resumable PokeAPI importer used by ``populate_pokemon``.
+
+* One pooled ``requests.Session`` with retries, shared by a bounded thread pool.
+* Every response body is cached on disk by URL, so reruns are nearly free.
+* Parsed records are checkpointed to a JSON file as they arrive; after a
+  failure the next run only fetches what is missing.
+* The database sees a single transaction of bulk upserts at the end.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from django.db import transaction
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .models import Pokemon
+from .dataset import mark_dataset_changed
+
+POKEAPI_URL = 'https://pokeapi.co/api/v2'
+
+# National Pokédex ranges per generation
+GENERATION_RANGES = {
+    1: (1, 151),
+    2: (152, 251),
+    3: (252, 386),
+    4: (387, 493),
+    5: (494, 649),
+    6: (650, 721),
+    7: (722, 809),
+    8: (810, 905),
+    9: (906, 1025),
+}
+
+POKEMON_FIELDS = [
+    'name', 'type1', 'type2', 'generation', 'height', 'weight',
+    'base_stat_total', 'is_legendary', 'color', 'habitat', 'image_url', 'sprite_url',
+]
+
+
+def pooled_session(pool_size=8):
+    """A ``requests.Session`` with ``pool_size`` keep-alive connections and retries"""
+    session = requests.Session()
+    retry = Retry(total=4, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class PokeAPIClient:
+    """Thread-safe PokeAPI client with connection pooling and an on-disk response cache"""
+
+    def __init__(self, base_url=POKEAPI_URL, cache_dir=None, pool_size=8, timeout=30, refresh=False):
+        self.base_url = base_url.rstrip('/')
+        self.cache_dir = cache_dir
+        # Refetch everything but still write the cache
+        self.refresh = refresh
+        self.timeout = timeout
+        self.session = pooled_session(pool_size)
+        self.requests_made = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + '.json')
+
+    def get_json(self, path):
+        """GET ``base_url + path`` as JSON, from the disk cache when possible"""
+        url = self.base_url + path
+        if self.cache_dir and not self.refresh:
+            try:
+                with open(self._cache_path(url), encoding='utf-8') as cached:
+                    data = json.load(cached)
+                with self._lock:
+                    self.cache_hits += 1
+                return data
+            except (OSError, ValueError):
+                pass
+
+        response = self.session.get(url, timeout=self.timeout)
+        with self._lock:
+            self.requests_made += 1
+        response.raise_for_status()
+        data = response.json()
+        if self.cache_dir:
+            write_json_atomic(self._cache_path(url), data)
+        return data
+
+
+def write_json_atomic(path, data):
+    """Write JSON so readers never see a half-written file"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as tmp:
+        json.dump(data, tmp)
+    os.replace(tmp_path, path)
+
+
+def parse_pokemon(pokemon_data, species_data, generation):
+    """Map PokeAPI pokemon + species payloads onto Pokemon fields"""
+    types = [t['type']['name'].title() for t in sorted(pokemon_data['types'], key=lambda t: t['slot'])]
+    sprites = pokemon_data.get('sprites') or {}
+    artwork = ((sprites.get('other') or {}).get('official-artwork') or {}).get('front_default')
+    habitat = species_data.get('habitat')
+    return {
+        'pokedex_number': pokemon_data['id'],
+        'name': pokemon_data['name'].title(),
+        'type1': types[0] if types else 'Unknown',
+        'type2': types[1] if len(types) > 1 else None,
+        'generation': generation,
+        'height': pokemon_data['height'] / 10,  # Convert decimeters to meters
+        'weight': pokemon_data['weight'] / 10,  # Convert hectograms to kg
+        'base_stat_total': sum(stat['base_stat'] for stat in pokemon_data['stats']),
+        'is_legendary': species_data.get('is_legendary', False),
+        'color': (species_data.get('color') or {}).get('name', 'Unknown').title(),
+        'habitat': habitat['name'].title() if habitat else None,
+        'image_url': artwork,
+        'sprite_url': sprites.get('front_default'),
+    }
+
+
+class PokemonImporter:
+    """Fetch generations from PokeAPI concurrently and upsert them in bulk"""
+
+    def __init__(self, client, workers=8, checkpoint_path=None, log=None):
+        self.client = client
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self.log = log or (lambda message: None)
+        self.records = self._load_checkpoint()
+        self.failures = {}
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_path:
+            return {}
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as checkpoint:
+                return {int(number): record for number, record in json.load(checkpoint).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def save_checkpoint(self):
+        if self.checkpoint_path:
+            write_json_atomic(self.checkpoint_path, self.records)
+
+    def clear_checkpoint(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def fetch(self, pokedex_number, generation):
+        pokemon_data = self.client.get_json(f'/pokemon/{pokedex_number}')
+        species_data = self.client.get_json(f'/pokemon-species/{pokedex_number}')
+        return parse_pokemon(pokemon_data, species_data, generation)
+
+    def fetch_generations(self, generations, checkpoint_every=25):
+        """Fetch every Pokemon of ``generations`` not already checkpointed"""
+        pending = [
+            (number, generation)
+            for generation in generations
+            for number in range(GENERATION_RANGES[generation][0], GENERATION_RANGES[generation][1] + 1)
+            if number not in self.records
+        ]
+        self.log(f'{len(pending)} to fetch, {len(self.records)} already checkpointed')
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.fetch, number, generation): number for number, generation in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                number = futures[future]
+                try:
+                    self.records[number] = future.result()
+                except (requests.RequestException, KeyError, ValueError) as e:
+                    self.failures[number] = str(e)
+                    self.log(f'Failed to fetch Pokemon {number}: {e}')
+                if done % checkpoint_every == 0:
+                    self.save_checkpoint()
+        self.save_checkpoint()
+        return self.records
+
+    def save(self, generations, batch_size=500):
+        """Upsert the fetched records in one transaction; returns (created, updated)"""
+        records = [r for r in self.records.values() if r['generation'] in generations]
+        existing = set(
+            Pokemon.objects.filter(pokedex_number__in=[r['pokedex_number'] for r in records])
+            .values_list('pokedex_number', flat=True)
+        )
+        with transaction.atomic():
+            Pokemon.objects.bulk_create(
+                [Pokemon(**record) for record in sorted(records, key=lambda r: r['pokedex_number'])],
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['pokedex_number'],
+                update_fields=POKEMON_FIELDS,
+            )
+            # bulk_create() sends no post_save signals
+            mark_dataset_changed()
+        return len(records) - len(existing), len(existing)
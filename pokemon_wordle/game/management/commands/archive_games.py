@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.utils import timezone
+from game.archive import archive_games, archive_path, expired_games
+from game.models import Guess
+import datetime
+import time
+
+class Command(BaseCommand):
+    help = 'Archive old finished and abandoned games to a gzip JSON-lines file and delete them in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.GAME_RETENTION_DAYS,
+            help=f'Keep games from the last N days (default: GAME_RETENTION_DAYS, {settings.GAME_RETENTION_DAYS})'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Games archived and deleted per transaction (default: 500)'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to sleep between batches (default: 0)'
+        )
+        parser.add_argument(
+            '--output-dir',
+            default=None,
+            help='Directory for archive files (default: GAME_ARCHIVE_DIR)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the games that would be archived'
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        before = timezone.localdate() - datetime.timedelta(days=options['days'])
+        games = expired_games(before)
+
+        if options['dry_run']:
+            counts = games.aggregate(sessions=Count('id'), completed=Count('completed_at'))
+            guesses = Guess.objects.filter(game_session__in=games).count()
+            self.stdout.write(
+                f'Would archive {counts["sessions"]} games ({counts["completed"]} finished by play) '
+                f'and {guesses} guesses from before {before}'
+            )
+            return
+        if not games.exists():
+            self.stdout.write(self.style.SUCCESS(f'No games from before {before} to archive'))
+            return
+
+        path = archive_path(options['output_dir'] or settings.GAME_ARCHIVE_DIR, before)
+        self.stdout.write(f'Archiving games from before {before} to {path}...')
+        start = time.perf_counter()
+        record = archive_games(
+            before, path, batch_size=options['batch_size'], log=self.stdout.write, pause=options['pause'],
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {record.sessions} games and {record.guesses} guesses in {elapsed:.1f}s '
+            f'({record.sessions / elapsed:.0f} games/s, {record.guesses / elapsed:.0f} guesses/s)'
+        ))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from game.archive import archived_before
+from game.stats import rebuild_stats
+import time
+
+class Command(BaseCommand):
+    help = 'Rebuild per-player statistics from the GameSession history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Games fetched and stats rows written per batch (default: 2000)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild even though some games were archived (their results are lost from the stats)'
+        )
+
+    def handle(self, *args, **options):
+        archived = archived_before()
+        if archived and not options['force']:
+            raise CommandError(
+                f'Games before {archived} were archived and are no longer in the history; '
+                'the current stats already include them. Use --force to rebuild anyway.'
+            )
+        start = time.perf_counter()
+        written = rebuild_stats(chunk_size=options['chunk_size'], log=self.stdout.write)
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {written} player stats rows in {time.perf_counter() - start:.1f}s')
+        )
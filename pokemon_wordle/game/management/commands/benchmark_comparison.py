@@ -0,0 +1,154 @@
+from django.core.management.base import BaseCommand
+from game.comparison import ComparisonEngine, build_guess_result, compare
+from game.models import Pokemon
+import random
+import time
+
+
+def legacy_guess_result(guessed_pokemon, target):
+    """The field-by-field comparison the views used before the matrix existed"""
+    def compare_attribute(guess_val, target_val):
+        return 'correct' if guess_val == target_val else 'incorrect'
+
+    def compare_numeric(guess_val, target_val):
+        if guess_val == target_val:
+            return 'correct'
+        elif guess_val < target_val:
+            return 'low'
+        else:
+            return 'high'
+
+    return {
+        'pokemon_name': guessed_pokemon.name,
+        'image_url': guessed_pokemon.image_url,
+        'sprite_url': guessed_pokemon.sprite_url,
+        'display_image': guessed_pokemon.get_display_image(),
+        'pokedex_number': {
+            'value': guessed_pokemon.pokedex_number,
+            'status': compare_numeric(guessed_pokemon.pokedex_number, target.pokedex_number)
+        },
+        'type1': {
+            'value': guessed_pokemon.type1,
+            'status': compare_attribute(guessed_pokemon.type1, target.type1)
+        },
+        'type2': {
+            'value': guessed_pokemon.type2 or 'None',
+            'status': compare_attribute(guessed_pokemon.type2, target.type2)
+        },
+        'height': {
+            'value': guessed_pokemon.height,
+            'status': compare_numeric(guessed_pokemon.height, target.height)
+        },
+        'weight': {
+            'value': guessed_pokemon.weight,
+            'status': compare_numeric(guessed_pokemon.weight, target.weight)
+        },
+        'base_stat_total': {
+            'value': guessed_pokemon.base_stat_total,
+            'status': compare_numeric(guessed_pokemon.base_stat_total, target.base_stat_total)
+        },
+        'is_legendary': {
+            'value': guessed_pokemon.is_legendary,
+            'status': compare_attribute(guessed_pokemon.is_legendary, target.is_legendary)
+        },
+        'color': {
+            'value': guessed_pokemon.color,
+            'status': compare_attribute(guessed_pokemon.color, target.color)
+        },
+        'habitat': {
+            'value': guessed_pokemon.habitat or 'Unknown',
+            'status': compare_attribute(guessed_pokemon.habitat, target.habitat)
+        }
+    }
+
+
+def synthetic_pokemon(count, seed=0):
+    """Unsaved Pokemon with realistic value spreads, for sizing beyond the loaded dataset"""
+    rng = random.Random(seed)
+    types = ['Normal', 'Fire', 'Water', 'Grass', 'Electric', 'Ice', 'Fighting', 'Poison', 'Ground',
+             'Flying', 'Psychic', 'Bug', 'Rock', 'Ghost', 'Dragon', 'Dark', 'Steel', 'Fairy']
+    colors = ['Red', 'Blue', 'Yellow', 'Green', 'Black', 'Brown', 'Purple', 'Gray', 'White', 'Pink']
+    habitats = ['Cave', 'Forest', 'Grassland', 'Mountain', 'Rare', 'Rough-terrain', 'Sea', 'Urban',
+                'Waters-edge', None]
+    return [
+        Pokemon(
+            id=number,
+            name=f'Synthetic {number}',
+            pokedex_number=number,
+            type1=rng.choice(types),
+            type2=rng.choice(types + [None] * 18),
+            generation=1,
+            height=round(rng.uniform(0.1, 10.0), 1),
+            weight=round(rng.uniform(0.1, 999.9), 1),
+            base_stat_total=rng.randint(175, 720),
+            is_legendary=rng.random() < 0.05,
+            color=rng.choice(colors),
+            habitat=rng.choice(habitats),
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the precomputed comparison matrix against field-by-field comparison'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--synthetic',
+            type=int,
+            default=0,
+            help='Benchmark N generated Pokemon instead of the database (e.g. 1000)'
+        )
+        parser.add_argument(
+            '--lookups',
+            type=int,
+            default=100000,
+            help='Number of (guess, target) pairs to compare (default: 100000)'
+        )
+
+    def handle(self, *args, **options):
+        if options['synthetic']:
+            pokemon = synthetic_pokemon(options['synthetic'])
+        else:
+            pokemon = list(Pokemon.objects.all())
+        if not pokemon:
+            self.stdout.write(self.style.ERROR('No Pokemon to benchmark'))
+            return
+
+        start = time.perf_counter()
+        engine = ComparisonEngine(pokemon)
+        build_seconds = time.perf_counter() - start
+        self.stdout.write(
+            f'Built {len(pokemon)}x{len(pokemon)} matrix in {build_seconds * 1000:.1f} ms '
+            f'({engine.nbytes / 1024 / 1024:.2f} MiB)'
+        )
+
+        rng = random.Random(1)
+        pairs = [(rng.choice(pokemon), rng.choice(pokemon)) for _ in range(options['lookups'])]
+
+        mismatches = sum(
+            1 for guess, target in pairs[:1000]
+            if legacy_guess_result(guess, target) != build_guess_result(engine, guess, target)
+        )
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'{mismatches} results differ from the legacy path'))
+
+        # Status vectors alone isolate the comparison; full results include building the payload
+        self.report(pairs, 'statuses', compare, engine.statuses)
+        self.report(
+            pairs, 'results', legacy_guess_result,
+            lambda guess, target: build_guess_result(engine, guess, target)
+        )
+
+    def report(self, pairs, label, legacy, matrix):
+        timings = {}
+        for name, func in (('legacy', legacy), ('matrix', matrix)):
+            start = time.perf_counter()
+            for guess, target in pairs:
+                func(guess, target)
+            timings[name] = time.perf_counter() - start
+            self.stdout.write(f'{label} {name:>6}: {timings[name] / len(pairs) * 1e6:.2f} us each')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{label}: matrix path is {timings["legacy"] / timings["matrix"]:.2f}x the legacy throughput'
+        ))
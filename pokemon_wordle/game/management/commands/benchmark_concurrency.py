@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+import requests
+import statistics
+import threading
+import time
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = 'Hammer a running server with concurrent players to compare sync and async workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', action='append', required=True,
+                            help='Base URL of a running server; repeat to compare several')
+        parser.add_argument('--concurrency', type=int, default=200,
+                            help='Simultaneous players (default: 200)')
+        parser.add_argument('--requests', type=int, default=20,
+                            help='Requests per player (default: 20)')
+        parser.add_argument('--path', default='/game-state/',
+                            help='Endpoint to request (default: /game-state/)')
+
+    def handle(self, *args, **options):
+        for base_url in options['url']:
+            self.run(base_url.rstrip('/'), options['path'], options['concurrency'], options['requests'])
+
+    def run(self, base_url, path, concurrency, per_player):
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+
+        def player(_):
+            nonlocal errors
+            session = requests.Session()  # one cookie jar, i.e. one game, per player
+            timings, failed = [], 0
+            for _ in range(per_player):
+                start = time.perf_counter()
+                try:
+                    ok = session.get(base_url + path, timeout=30).status_code < 400
+                except requests.RequestException:
+                    ok = False
+                timings.append(time.perf_counter() - start)
+                failed += not ok
+            with lock:
+                latencies.extend(timings)
+                errors += failed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(player, range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        self.stdout.write(
+            f'{base_url}{path}: {len(latencies)} requests, {concurrency} concurrent, '
+            f'{len(latencies) / elapsed:.1f} req/s, errors {errors}\n'
+            f'  mean {statistics.mean(latencies) * 1000:.1f} ms  '
+            f'p50 {percentile(latencies, 0.50) * 1000:.1f} ms  '
+            f'p95 {percentile(latencies, 0.95) * 1000:.1f} ms  '
+            f'p99 {percentile(latencies, 0.99) * 1000:.1f} ms'
+        )
@@ -0,0 +1,307 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from game import guess_log
+from game.dataset import load_bundle
+from game.importer import write_json_atomic
+from game.management.commands.benchmark_concurrency import percentile
+from game.models import GameSession, Guess
+from game.registry import get_registry, invalidate_registry
+import datetime
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+ENDPOINTS = ['new_game', 'make_guess', 'get_game_state']
+LOCMEM_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+def private_caches(tmp_dir):
+    """CACHES with no alias shared with live workers: file caches move into tmp_dir, others go in memory"""
+    private = {}
+    for alias, config in settings.CACHES.items():
+        if config['BACKEND'].endswith('.FileBasedCache'):
+            private[alias] = dict(config, LOCATION=os.path.join(tmp_dir, alias))
+        elif config['BACKEND'] == LOCMEM_CACHE:
+            private[alias] = config
+        else:
+            private[alias] = {'BACKEND': LOCMEM_CACHE, 'LOCATION': alias}
+    return private
+
+
+@contextmanager
+def throwaway_environment():
+    """A migrated throwaway database with the Pokédex loaded, and private caches
+
+    The registry stamp and stored sessions live in caches that every worker on
+    the host shares. Loading the Pokédex there would make live workers reload
+    their registry, so the benchmark gets caches of its own.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir, override_settings(CACHES=private_caches(tmp_dir)):
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        test_name = test_settings.get('NAME')
+        if connection.vendor == 'sqlite' and not test_name:
+            # A file rather than memory, so concurrent threads share one database
+            test_settings['NAME'] = os.path.join(tmp_dir, 'benchmark.sqlite3')
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            load_bundle(settings.POKEDEX_BUNDLE_PATH, force=True)
+            invalidate_registry()
+            yield
+        finally:
+            guess_log.flush()
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings['NAME'] = test_name
+
+
+class Command(BaseCommand):
+    help = ('Drive new game -> guesses -> game state flows against a throwaway database and '
+            'compare latency, throughput and queries per request with a baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--players',
+            type=int,
+            default=200,
+            help='Games played in the measured run (default: 200)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Players playing at the same time (default: 8)'
+        )
+        parser.add_argument(
+            '--guesses',
+            type=int,
+            default=4,
+            help='Guesses per game, fewer if the game ends first (default: 4)'
+        )
+        parser.add_argument(
+            '--history',
+            type=int,
+            default=20000,
+            help='Finished games bulk-created first so tables and indexes have a realistic size '
+                 '(default: 20000)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Random seed for the synthetic games (default: 1)'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=settings.BENCHMARK_BASELINE_PATH,
+            help='Baseline JSON to compare with (default: BENCHMARK_BASELINE_PATH)'
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Write this run as the new baseline instead of comparing'
+        )
+        parser.add_argument(
+            '--max-latency-regression',
+            type=float,
+            default=0.25,
+            help='Allowed p95 latency increase per endpoint, as a fraction (default: 0.25)'
+        )
+        parser.add_argument(
+            '--max-throughput-regression',
+            type=float,
+            default=0.20,
+            help='Allowed requests/s decrease per endpoint, as a fraction (default: 0.20)'
+        )
+        parser.add_argument(
+            '--max-query-increase',
+            type=float,
+            default=0,
+            help='Allowed increase in queries per request (default: 0)'
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        with throwaway_environment():
+            self.stdout.write(f'Benchmark database: {connection.settings_dict["NAME"]} ({connection.vendor})')
+            self.create_history(options['history'])
+            names = [pokemon.name for pokemon in get_registry().generation(1)]
+            self.play(names, 1, options['guesses'], {})  # warm up the registry and the caches
+            start = time.perf_counter()
+            samples = {endpoint: [] for endpoint in ENDPOINTS}
+            errors = self.run(names, options, samples)
+            elapsed = time.perf_counter() - start
+
+        results = self.summarize(samples, elapsed)
+        self.report(results, options, errors, elapsed)
+        if errors:
+            raise CommandError(f'{errors} requests failed')
+        if options['save_baseline']:
+            baseline = {
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'options': {key: options[key] for key in ('players', 'concurrency', 'guesses', 'history')},
+                'endpoints': results,
+            }
+            write_json_atomic(options['baseline'], baseline)
+            self.stdout.write(self.style.SUCCESS(f'Saved baseline to {options["baseline"]}'))
+        else:
+            self.compare(results, options)
+
+    def create_history(self, count):
+        """Bulk-create finished games, each with a few guesses"""
+        start = time.perf_counter()
+        pool = get_registry().generation(1)
+        now = timezone.now()
+        for offset in range(0, count, 1000):
+            games = []
+            for index in range(offset, min(count, offset + 1000)):
+                finished = now - datetime.timedelta(minutes=index)
+                won = random.random() < 0.6
+                guesses = random.sample(pool, random.randint(1, 6) if won else 6)
+                games.append(GameSession(
+                    session_key=f'history{index:032d}'[-32:],
+                    target_pokemon=random.choice(pool),
+                    generation=1,
+                    is_completed=True,
+                    is_won=won,
+                    guesses_count=len(guesses),
+                    completed_at=finished,
+                    guess_ids=[pokemon.id for pokemon in guesses],
+                ))
+            GameSession.objects.bulk_create(games)
+            # The analytics log, as GAME_GUESS_LOG would have written it
+            Guess.objects.bulk_create([
+                Guess(game_session=game, pokemon_id=pokemon_id, guess_number=number)
+                for game in games
+                for number, pokemon_id in enumerate(game.guess_ids, 1)
+            ])
+        self.stdout.write(f'Created {count} finished games in {time.perf_counter() - start:.1f}s')
+
+    def timed(self, samples, endpoint, request):
+        with CaptureQueriesContext(connections['default']) as queries:
+            start = time.perf_counter()
+            response = request()
+            duration = time.perf_counter() - start
+        samples.setdefault(endpoint, []).append((duration, len(queries)))
+        return response
+
+    def play(self, names, games, guesses, samples):
+        """Play ``games`` games as one player; returns the number of failed requests"""
+        client = Client()
+        failed = 0
+        for _ in range(games):
+            response = self.timed(samples, 'new_game', lambda: client.post(
+                '/new-game/', '{}', content_type='application/json'
+            ))
+            failed += response.status_code >= 400
+            token = response.json().get('game_token')
+            for name in random.sample(names, guesses):
+                response = self.timed(samples, 'make_guess', lambda: client.post(
+                    '/guess/', json.dumps({'pokemon_name': name, 'game_token': token}),
+                    content_type='application/json'
+                ))
+                failed += response.status_code >= 400
+                data = response.json()
+                token = data.get('game_token', token)
+                if data.get('game_over'):
+                    break
+            headers = {'HTTP_X_GAME_TOKEN': token} if token else {}
+            response = self.timed(samples, 'get_game_state', lambda: client.get('/game-state/', **headers))
+            failed += response.status_code >= 400
+        return failed
+
+    def run(self, names, options, samples):
+        concurrency = max(1, options['concurrency'])
+        lock = threading.Lock()
+        errors = 0
+
+        def player(games):
+            nonlocal errors
+            mine = {}
+            try:
+                failed = self.play(names, games, options['guesses'], mine)
+            finally:
+                connections.close_all()
+            with lock:
+                errors += failed
+                for endpoint, values in mine.items():
+                    samples[endpoint].extend(values)
+
+        shares = [options['players'] // concurrency + (i < options['players'] % concurrency)
+                  for i in range(concurrency)]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(player, [share for share in shares if share]))
+        return errors
+
+    def summarize(self, samples, elapsed):
+        results = {}
+        for endpoint in ENDPOINTS:
+            values = samples.get(endpoint) or []
+            if not values:
+                continue
+            latencies = sorted(duration for duration, _ in values)
+            results[endpoint] = {
+                'requests': len(values),
+                'requests_per_second': round(len(values) / elapsed, 1),
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+                'queries_per_request': round(sum(count for _, count in values) / len(values), 2),
+            }
+        return results
+
+    def report(self, results, options, errors, elapsed):
+        total = sum(result['requests'] for result in results.values())
+        self.stdout.write(
+            f'{options["players"]} games, {options["concurrency"]} concurrent: {total} requests in '
+            f'{elapsed:.1f}s ({total / elapsed:.1f} req/s), errors {errors}'
+        )
+        self.stdout.write(f'  {"endpoint":<16}{"req/s":>9}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"queries":>9}')
+        for endpoint, result in results.items():
+            self.stdout.write(
+                f'  {endpoint:<16}{result["requests_per_second"]:>9.1f}{result["p50_ms"]:>9.2f}'
+                f'{result["p95_ms"]:>9.2f}{result["p99_ms"]:>9.2f}{result["queries_per_request"]:>9.2f}'
+            )
+
+    def compare(self, results, options):
+        try:
+            with open(options['baseline'], encoding='utf-8') as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError):
+            self.stdout.write(self.style.WARNING(
+                f'No baseline at {options["baseline"]}; run with --save-baseline to record one'
+            ))
+            return
+
+        regressions = []
+        for endpoint, result in results.items():
+            before = baseline['endpoints'].get(endpoint)
+            if before is None:
+                continue
+            checks = [
+                ('p95 latency', result['p95_ms'], before['p95_ms'],
+                 result['p95_ms'] > before['p95_ms'] * (1 + options['max_latency_regression'])),
+                ('req/s', result['requests_per_second'], before['requests_per_second'],
+                 result['requests_per_second'] < before['requests_per_second'] * (1 - options['max_throughput_regression'])),
+                ('queries/request', result['queries_per_request'], before['queries_per_request'],
+                 result['queries_per_request'] > before['queries_per_request'] + options['max_query_increase']),
+            ]
+            for label, now, then, regressed in checks:
+                if regressed:
+                    regressions.append(f'{endpoint} {label}: {then} -> {now}')
+
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(
+            f'Within thresholds of the baseline from {baseline.get("created_at", "?")}'
+        ))
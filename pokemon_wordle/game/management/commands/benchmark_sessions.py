@@ -0,0 +1,97 @@
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from game.management.commands.benchmark_endpoints import throwaway_environment
+from game.registry import get_registry
+import json
+import time
+
+ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'identity': 'game.sessions',
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Count database queries per request for each session backend, on a throwaway database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--visitors',
+            type=int,
+            default=50,
+            help='Simulated players per backend (default: 50)'
+        )
+        parser.add_argument(
+            '--engine',
+            action='append',
+            choices=sorted(ENGINES),
+            help='Backend to measure; repeat for several (default: all)'
+        )
+
+    def visit(self, names):
+        """One player's requests: first visit, a guess, a reload, stats, a new game"""
+        client = Client()
+        return [
+            ('first visit', lambda: client.get('/game-state/')),
+            ('guess', lambda: client.post(
+                '/guess/', json.dumps({'pokemon_name': names[0]}), content_type='application/json'
+            )),
+            ('reload', lambda: client.get('/game-state/')),
+            ('stats', lambda: client.get('/stats/')),
+            ('new game', lambda: client.post('/new-game/')),
+        ]
+
+    def measure(self, engine, visitors, names):
+        totals = {}
+        # A private cache (see throwaway_environment), so every backend starts cold
+        caches['sessions'].clear()
+        start = time.perf_counter()
+        # Rolled back, so each backend starts from the same throwaway database
+        try:
+            with override_settings(SESSION_ENGINE=engine), transaction.atomic():
+                for visitor in range(visitors):
+                    for label, request in self.visit(names[visitor % len(names):] + names):
+                        with CaptureQueriesContext(connection) as queries:
+                            request()
+                        session = sum('django_session' in query['sql'] for query in queries)
+                        counted = totals.setdefault(label, [0, 0])
+                        counted[0] += len(queries)
+                        counted[1] += session
+                raise Rollback
+        except Rollback:
+            pass
+        return totals, time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        visitors = options['visitors']
+        results = {}
+        with throwaway_environment():
+            names = [pokemon.name for pokemon in get_registry().generation(1)]
+            for name in options['engine'] or list(ENGINES):
+                results[name] = self.measure(ENGINES[name], visitors, names)
+
+        labels = list(next(iter(results.values()))[0])
+        self.stdout.write(
+            f'Queries per request over {visitors} players (total / django_session):'
+        )
+        self.stdout.write(f'  {"request":<12}' + ''.join(f'{name:>16}' for name in results))
+        for label in labels:
+            row = ''.join(
+                f'{totals[label][0] / visitors:>9.2f} / {totals[label][1] / visitors:<4.2f}'
+                for totals, _ in results.values()
+            )
+            self.stdout.write(f'  {label:<12}{row}')
+        for name, (totals, elapsed) in results.items():
+            session = sum(counted[1] for counted in totals.values())
+            self.stdout.write(
+                f'{name}: {session / visitors:.2f} django_session queries per player, '
+                f'{elapsed / visitors * 1000:.1f}ms per player'
+            )
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from game.registry import get_registry
+from game.tokens import TokenGame
+from game.views import get_guess_history
+import gzip
+import json
+import random
+import time
+
+
+class Command(BaseCommand):
+    help = 'Compare size and serialization time of full and compact guess results'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--games',
+            type=int,
+            default=2000,
+            help='Random games to encode (default: 2000)'
+        )
+        parser.add_argument(
+            '--guesses',
+            type=int,
+            default=6,
+            help='Guesses per game (default: 6)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Random seed for the games (default: 1)'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        registry = get_registry()
+        pool = registry.generation(1)
+        games = [
+            (TokenGame.start(rng.choice(pool)), [pokemon.id for pokemon in rng.sample(pool, options['guesses'])])
+            for _ in range(options['games'])
+        ]
+        self.stdout.write(
+            f'{len(games)} game states and {len(games) * options["guesses"]} single guesses, '
+            f'{options["guesses"]} guesses per game'
+        )
+        self.stdout.write(f'  {"format":<10}{"payload":<8}{"bytes":>9}{"gzip":>9}{"µs":>9}')
+        for compact in (False, True):
+            state = self.measure(registry, games, compact, whole_game=True)
+            guess = self.measure(registry, games, compact, whole_game=False)
+            label = 'compact' if compact else 'full'
+            for payload, (size, zipped, seconds) in (('state', state), ('guess', guess)):
+                self.stdout.write(f'  {label:<10}{payload:<8}{size:>9.0f}{zipped:>9.0f}{seconds * 1e6:>9.1f}')
+
+    def measure(self, registry, games, compact, whole_game):
+        """(bytes, gzip bytes, seconds) per payload, built and encoded as the views do"""
+        bodies = []
+        start = time.perf_counter()
+        for game, pokemon_ids in games:
+            if whole_game:
+                payloads = [get_guess_history(registry, game, pokemon_ids, compact)]
+            else:
+                payloads = [get_guess_history(registry, game, [pokemon_id], compact)[0] for pokemon_id in pokemon_ids]
+            bodies.extend(json.dumps(payload, cls=DjangoJSONEncoder).encode('utf-8') for payload in payloads)
+        elapsed = time.perf_counter() - start
+        size = sum(map(len, bodies)) / len(bodies)
+        zipped = sum(len(gzip.compress(body)) for body in bodies) / len(bodies)
+        return size, zipped, elapsed / len(bodies)
@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from game import atlas, images
+from game.importer import GENERATION_RANGES, pooled_session
+from game.models import Pokemon
+from game.registry import invalidate_registry
+import requests
+import time
+
+class Command(BaseCommand):
+    help = 'Pack each generation\'s sprites into one atlas image for the autocomplete dropdown'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--generation',
+            type=int,
+            action='append',
+            help='Generation to build; repeat for several (default: every loaded generation)'
+        )
+        parser.add_argument(
+            '--cell',
+            type=int,
+            default=settings.POKEMON_IMAGE_SIZES['sm'],
+            help='Cell edge in pixels (default: the "sm" thumbnail size)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild even if the sprite set hash is unchanged'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Concurrent sprite downloads (default: 8)'
+        )
+        parser.add_argument(
+            '--root',
+            default=None,
+            help='Image store directory (default: POKEMON_IMAGE_ROOT)'
+        )
+
+    def handle(self, *args, **options):
+        if images.Image is None:
+            raise CommandError('Building sprite atlases requires Pillow (pip install -r requirements.txt)')
+        root = options['root'] or images.image_root()
+        generations = options['generation'] or sorted(
+            set(Pokemon.objects.values_list('generation', flat=True))
+        )
+        unknown = [g for g in generations if g not in GENERATION_RANGES]
+        if unknown:
+            raise CommandError(f'Unknown generation(s): {unknown}')
+
+        session = pooled_session(options['workers'])
+        built = 0
+        for generation in generations:
+            start = time.perf_counter()
+            pokemon_list = [
+                pokemon for pokemon in Pokemon.objects.filter(generation=generation).order_by('pokedex_number')
+                if atlas.sprite_source(pokemon)
+            ]
+            set_hash = atlas.sprite_set_hash(pokemon_list, options['cell'])
+            if not options['force'] and atlas.is_current(generation, set_hash, root):
+                self.stdout.write(f'Generation {generation}: atlas {set_hash[:12]} is up to date')
+                continue
+
+            def download(pokemon):
+                try:
+                    response = session.get(atlas.sprite_source(pokemon), timeout=30)
+                    response.raise_for_status()
+                    return pokemon.pokedex_number, response.content
+                except requests.RequestException as e:
+                    self.stdout.write(self.style.WARNING(f'Failed to fetch sprite for {pokemon.name}: {e}'))
+                    return pokemon.pokedex_number, None
+
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                sprites = dict(pool.map(download, pokemon_list))
+            try:
+                manifest = atlas.build_atlas(generation, pokemon_list, sprites, options['cell'], set_hash, root)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Generation {generation}: cannot build atlas: {e}')
+            built += 1
+            self.stdout.write(
+                f'Generation {generation}: packed {len(manifest["offsets"])} sprites into '
+                f'{manifest["width"]}x{manifest["height"]} {manifest["file"]} '
+                f'in {time.perf_counter() - start:.1f}s'
+            )
+
+        if built:
+            # /pokemon-list/ embeds the manifest and is cached per registry snapshot
+            invalidate_registry()
+        self.stdout.write(self.style.SUCCESS(f'Built {built} sprite atlas(es)'))
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from game import images
+from game.importer import pooled_session
+from game.models import Pokemon
+from game.registry import invalidate_registry
+import requests
+import time
+
+class Command(BaseCommand):
+    help = 'Download Pokemon artwork into the local image store and build thumbnails'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-download and rebuild images that are already stored'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Concurrent downloads (default: 8)'
+        )
+        parser.add_argument(
+            '--originals-only',
+            action='store_true',
+            help='Store the downloaded artwork without thumbnails (for hosts without Pillow)'
+        )
+        parser.add_argument(
+            '--root',
+            default=None,
+            help='Image store directory (default: POKEMON_IMAGE_ROOT)'
+        )
+
+    def handle(self, *args, **options):
+        root = options['root'] or images.image_root()
+        if images.Image is None and not options['originals_only']:
+            raise CommandError(
+                'Building thumbnails requires Pillow (pip install -r requirements.txt); '
+                'pass --originals-only to store the artwork without them'
+            )
+        if images.Image is not None and images.thumbnail_format()[0] != 'WEBP':
+            self.stdout.write(self.style.WARNING('Pillow was built without WebP support; writing PNG thumbnails'))
+        sizes = {} if options['originals_only'] else None
+
+        pokemon_list = [
+            pokemon for pokemon in Pokemon.objects.only(
+                'id', 'name', 'pokedex_number', 'image_url', 'sprite_url', 'local_images'
+            )
+            if pokemon.image_url or pokemon.sprite_url
+        ]
+        if not options['force']:
+            pokemon_list = [
+                pokemon for pokemon in pokemon_list
+                if not images.is_cached(pokemon.local_images, pokemon.image_url or pokemon.sprite_url, root, sizes)
+            ]
+        self.stdout.write(f'Caching images for {len(pokemon_list)} Pokemon...')
+
+        start = time.perf_counter()
+        session = pooled_session(options['workers'])
+
+        def download(pokemon):
+            source_url = pokemon.image_url or pokemon.sprite_url
+            try:
+                response = session.get(source_url, timeout=30)
+                response.raise_for_status()
+                return pokemon, images.store_image(response.content, source_url, root, sizes)
+            except (requests.RequestException, OSError, ValueError) as e:
+                # ValueError covers Pillow's UnidentifiedImageError
+                self.stdout.write(self.style.WARNING(f'Failed to cache {pokemon.name}: {e}'))
+                return pokemon, None
+
+        stored = 0
+        changed = []
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for pokemon, local_images in pool.map(download, pokemon_list):
+                stored += local_images is not None
+                if local_images is not None and local_images != pokemon.local_images:
+                    pokemon.local_images = local_images
+                    changed.append(pokemon)
+
+        if changed:
+            with transaction.atomic():
+                Pokemon.objects.bulk_update(changed, ['local_images'], batch_size=200)
+                # Local files are not part of the Pokedex bundle, so the dataset
+                # version stays; only the registry snapshot has to reload
+                transaction.on_commit(invalidate_registry)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Stored images for {stored} Pokemon in {root} ({len(changed)} records updated) '
+                f'in {time.perf_counter() - start:.1f}s'
+            )
+        )
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from game.dataset import export_bundle
+import time
+
+class Command(BaseCommand):
+    help = 'Export the Pokemon table as a versioned Pokedex bundle'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default=str(settings.POKEDEX_BUNDLE_PATH),
+            help='Bundle file to write (default: POKEDEX_BUNDLE_PATH)'
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        header = export_bundle(options['path'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Exported {header["count"]} Pokemon to {options["path"]} '
+                f'in {(time.perf_counter() - start) * 1000:.0f}ms (hash {header["content_hash"][:12]})'
+            )
+        )
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from game.dataset import BundleError, load_bundle
+import time
+
+class Command(BaseCommand):
+    help = 'Load a Pokedex bundle in one transaction, skipping it if already loaded'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default=str(settings.POKEDEX_BUNDLE_PATH),
+            help='Bundle file to load (default: POKEDEX_BUNDLE_PATH)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Reload even if the stored version hash matches the bundle'
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            header, loaded = load_bundle(options['path'], force=options['force'])
+        except BundleError as e:
+            raise CommandError(str(e))
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if not loaded:
+            self.stdout.write(f'Pokedex {header["content_hash"][:12]} already loaded; nothing to do ({elapsed:.0f}ms)')
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Loaded {header["count"]} Pokemon from {options["path"]} '
+                f'in {elapsed:.0f}ms (hash {header["content_hash"][:12]})'
+            )
+        )
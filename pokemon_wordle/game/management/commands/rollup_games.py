@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from game.analytics import latest_rollup_day, rebuild_rollups
+from game.archive import archived_before
+from game.models import GameSession
+import datetime
+import time
+
+class Command(BaseCommand):
+    help = 'Recompute the per-Pokemon daily analytics rollups from the game history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            type=datetime.date.fromisoformat,
+            help='First day to recompute, YYYY-MM-DD (default: the latest rolled-up day, at most --until)'
+        )
+        parser.add_argument(
+            '--until',
+            type=datetime.date.fromisoformat,
+            help='Last day to recompute, YYYY-MM-DD, before today (default: yesterday)'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute from the first finished game'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Games fetched per database round trip (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        until = options['until'] or today - datetime.timedelta(days=1)
+        if until >= today:
+            # Today's games are still being incremented into the rows a rebuild replaces
+            raise CommandError(f'--until must be before today ({today}); its rollups are still live')
+        since = None if options['all'] else options['since'] or latest_rollup_day()
+        if since is None:
+            first = (
+                GameSession.objects.filter(completed_at__isnull=False)
+                .order_by('completed_at').values_list('completed_at', flat=True).first()
+            )
+            since = timezone.localdate(first) if first else until
+        if not options['since']:
+            # The latest rolled-up day is usually today
+            since = min(since, until)
+        archived = archived_before()
+        if archived and since < archived:
+            # Those days' games are only in the archive files; their rollups are final
+            self.stdout.write(self.style.WARNING(f'Games before {archived} are archived; starting at {archived}'))
+            since = archived
+        if since > until:
+            raise CommandError(f'--since {since} is after --until {until}')
+
+        self.stdout.write(f'Rolling up games from {since} to {until}...')
+        start = time.perf_counter()
+        counted = rebuild_rollups(since, until, chunk_size=options['chunk_size'], log=self.stdout.write)
+        self.stdout.write(
+            self.style.SUCCESS(f'Rolled up {counted} games in {time.perf_counter() - start:.1f}s')
+        )
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from game.importer import GENERATION_RANGES
+from game.registry import get_registry, invalidate_registry
+from game.solver import solve_openers, write_book
+import os
+import time
+
+class Command(BaseCommand):
+    help = 'Rank openers by information gain and compute every target\'s solve depth, using all cores'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--generation',
+            type=int,
+            action='append',
+            help='Generation to solve; repeat for several (default: every loaded generation)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes (default: one per CPU)'
+        )
+        parser.add_argument(
+            '--output-dir',
+            default=None,
+            help='Directory for the books (default: SOLVER_DATA_DIR)'
+        )
+
+    def handle(self, *args, **options):
+        registry = get_registry()
+        generations = options['generation'] or sorted({p.generation for p in registry.pokemon})
+        unknown = [g for g in generations if g not in GENERATION_RANGES]
+        if unknown:
+            raise CommandError(f'Unknown generation(s): {unknown}')
+
+        for generation in generations:
+            pool = registry.generation(generation)
+            if not pool:
+                self.stdout.write(self.style.WARNING(f'Generation {generation}: no Pokemon loaded'))
+                continue
+            start = time.perf_counter()
+            book = solve_openers(pool, workers=options['workers'], log=self.stdout.write)
+            path = write_book(generation, book, options['output_dir'])
+            best = book['openers'][0]
+            self.stdout.write(
+                f'Generation {generation}: best opener {best["name"]} ({best["bits"]} bits), '
+                f'average solve depth {book["average_depth"]}, worst {book["max_depth"]}, '
+                f'in {time.perf_counter() - start:.1f}s -> {path}'
+            )
+
+        # Difficulty tiers and /openers/ read the books once per registry snapshot
+        invalidate_registry()
+        self.stdout.write(self.style.SUCCESS(f'Solved {len(generations)} generation(s)'))
@@ -1,49 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from game.importer import POKEAPI_URL, PokeAPIClient
 from game.models import Pokemon
+from game.dataset import mark_dataset_changed
 import requests
 import time
 
 class Command(BaseCommand):
     help = 'Update Pokemon images from PokeAPI'
-    
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Refresh every Pokemon, not just those missing an image URL'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Concurrent API requests (default: 8)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Rows per bulk_update statement (default: 200)'
+        )
+        parser.add_argument(
+            '--base-url',
+            default=POKEAPI_URL,
+            help='PokeAPI base URL, e.g. a local fixture server for tests'
+        )
+        parser.add_argument(
+            '--cache-dir',
+            default=None,
+            help='Reuse/store API responses in this directory'
+        )
+
     def handle(self, *args, **options):
         self.stdout.write('Updating Pokemon images...')
-        
-        updated_count = 0
-        
-        for pokemon in Pokemon.objects.all():
+        timings = {}
+
+        start = time.perf_counter()
+        pokemon_list = Pokemon.objects.only('id', 'name', 'pokedex_number', 'image_url', 'sprite_url')
+        if not options['force']:
+            pokemon_list = pokemon_list.filter(
+                Q(image_url__isnull=True) | Q(image_url='') | Q(sprite_url__isnull=True) | Q(sprite_url='')
+            )
+        pokemon_list = list(pokemon_list)
+        timings['select'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        client = PokeAPIClient(options['base_url'], cache_dir=options['cache_dir'], pool_size=options['workers'])
+
+        def fetch(pokemon):
             try:
-                # Fetch from PokeAPI
-                response = requests.get(f'https://pokeapi.co/api/v2/pokemon/{pokemon.pokedex_number}')
-                if response.status_code != 200:
-                    self.stdout.write(self.style.WARNING(f'Failed to fetch {pokemon.name}'))
+                return pokemon, client.get_json(f'/pokemon/{pokemon.pokedex_number}')
+            except (requests.RequestException, ValueError) as e:
+                self.stdout.write(self.style.WARNING(f'Failed to fetch {pokemon.name}: {e}'))
+                return pokemon, None
+
+        changed = []
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for pokemon, pokemon_data in pool.map(fetch, pokemon_list):
+                if pokemon_data is None:
                     continue
-                
-                pokemon_data = response.json()
-                
-                # Get official artwork (high quality)
-                official_artwork = pokemon_data['sprites']['other']['official-artwork']['front_default']
-                
-                # Get game sprite (smaller, pixel art style)
-                game_sprite = pokemon_data['sprites']['front_default']
-                
-                # Update the Pokemon
-                pokemon.image_url = official_artwork
-                pokemon.sprite_url = game_sprite
-                pokemon.save()
-                
-                updated_count += 1
-                self.stdout.write(f'Updated: {pokemon.name}')
-                
-                # Rate limiting
-                time.sleep(0.1)
-                
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f'Error updating {pokemon.name}: {str(e)}')
-                )
-                continue
-        
+                sprites = pokemon_data.get('sprites') or {}
+                # Official artwork (high quality) and game sprite (pixel art)
+                official_artwork = ((sprites.get('other') or {}).get('official-artwork') or {}).get('front_default')
+                game_sprite = sprites.get('front_default')
+                if (pokemon.image_url, pokemon.sprite_url) != (official_artwork, game_sprite):
+                    pokemon.image_url = official_artwork
+                    pokemon.sprite_url = game_sprite
+                    changed.append(pokemon)
+        timings['fetch'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if changed:
+            with transaction.atomic():
+                Pokemon.objects.bulk_update(changed, ['image_url', 'sprite_url'], batch_size=options['batch_size'])
+                # bulk_update() sends no post_save signals
+                mark_dataset_changed()
+        timings['write'] = time.perf_counter() - start
+
+        self.stdout.write(
+            f'Checked {len(pokemon_list)} Pokemon ({client.requests_made} requests, '
+            f'{client.cache_hits} cache hits); '
+            + ', '.join(f'{phase} {seconds:.2f}s' for phase, seconds in timings.items())
+        )
         self.stdout.write(
-            self.style.SUCCESS(f'Successfully updated {updated_count} Pokemon images')
-        )
\ No newline at end of file
+            self.style.SUCCESS(f'Successfully updated {len(changed)} Pokemon images')
+        )
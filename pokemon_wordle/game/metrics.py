@@ -0,0 +1,272 @@
+"""
+Per-view request metrics in Prometheus text format.
+
+``MetricsMiddleware`` times every request and labels it with its URL name,
+e.g. ``game:make_guess``. It records:
+
+* requests by view, method and status;
+* a latency histogram per view;
+* database queries and database time per view. These come from a wrapper
+  that ``connection_created`` appends to each connection's
+  ``execute_wrappers`` (the list ``connection.execute_wrapper()`` manages).
+  The request being measured is found through a context variable, so
+  queries that async views run in ``sync_to_async`` threads are counted too;
+* response bytes per view.
+
+Each worker aggregates in memory under one lock. A background thread writes
+a JSON snapshot to ``METRICS_DIR/worker-<pid>.json`` every
+``METRICS_FLUSH_INTERVAL`` seconds, so requests never wait on the disk. ``/metrics`` sums the snapshots of every
+worker on the host, so gunicorn workers need no shared service. A snapshot
+whose worker has exited is folded into ``retired.json``, which keeps
+counters monotonic across worker restarts without letting files pile up.
+"""
+
+import atexit
+import contextvars
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: dead workers' snapshots are simply kept
+    fcntl = None
+
+# Upper bounds of the latency histogram, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = 'pokeguess'
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('metrics_request', default=None)
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+class QueryStats:
+    """Queries and database time of one request"""
+
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - start
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """connection_created receiver: count this connection's queries from now on"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def start_request():
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def empty_view():
+    return {
+        'buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+        'seconds': 0.0,
+        'count': 0,
+        'queries': 0,
+        'db_seconds': 0.0,
+        'bytes': 0,
+    }
+
+
+class WorkerMetrics:
+    """This process's totals, flushed periodically to its snapshot file"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Held while writing, so an older snapshot never replaces a newer one
+        self.flush_lock = threading.Lock()
+        self.requests = {}
+        self.views = {}
+
+    def observe(self, view, method, status, seconds, queries, db_seconds, size):
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+        with self.lock:
+            key = (view, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            totals = self.views.get(view)
+            if totals is None:
+                totals = self.views[view] = empty_view()
+            totals['buckets'][bucket] += 1
+            totals['seconds'] += seconds
+            totals['count'] += 1
+            totals['queries'] += queries
+            totals['db_seconds'] += db_seconds
+            totals['bytes'] += size
+        _ensure_flusher()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'pid': os.getpid(),
+                'requests': [[*key, count] for key, count in self.requests.items()],
+                'views': {view: dict(totals, buckets=list(totals['buckets'])) for view, totals in self.views.items()},
+            }
+
+    def flush(self):
+        from .importer import write_json_atomic
+        with self.flush_lock:
+            snapshot = self.snapshot()
+            if not snapshot['requests']:
+                return
+            os.makedirs(settings.METRICS_DIR, exist_ok=True)
+            write_json_atomic(snapshot_path(snapshot['pid']), snapshot)
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(settings.METRICS_FLUSH_INTERVAL)
+        try:
+            worker.flush()
+        except OSError:
+            logger.exception('Could not write the metrics snapshot')
+
+
+def _ensure_flusher():
+    global _flusher
+    # After a fork the child has the totals but not the thread
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _flusher_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_periodically, name='metrics-flush', daemon=True)
+            _flusher.start()
+
+
+def snapshot_path(pid):
+    return os.path.join(settings.METRICS_DIR, f'worker-{pid}.json')
+
+
+def retired_path():
+    return os.path.join(settings.METRICS_DIR, 'retired.json')
+
+
+def read_snapshot(path):
+    try:
+        with open(path, encoding='utf-8') as snapshot:
+            return json.load(snapshot)
+    except (OSError, ValueError):
+        return None
+
+
+def merge(snapshots):
+    """Sum worker snapshots into one"""
+    requests, views = {}, {}
+    for snapshot in snapshots:
+        for view, method, status, count in snapshot['requests']:
+            requests[(view, method, status)] = requests.get((view, method, status), 0) + count
+        for view, totals in snapshot['views'].items():
+            merged = views.setdefault(view, empty_view())
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], totals['buckets'])]
+            for field in ('seconds', 'count', 'queries', 'db_seconds', 'bytes'):
+                merged[field] += totals[field]
+    return {'requests': [[*key, count] for key, count in requests.items()], 'views': views}
+
+
+def is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def retire_dead_workers():
+    """Fold the snapshots of exited workers into retired.json"""
+    if fcntl is None:
+        return
+    from .importer import write_json_atomic
+    with open(os.path.join(settings.METRICS_DIR, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        dead = [
+            path for path in glob.glob(snapshot_path('*'))
+            if not is_running(int(os.path.basename(path)[len('worker-'):-len('.json')]))
+        ]
+        if not dead:
+            return
+        snapshots = [read_snapshot(path) for path in [retired_path(), *dead]]
+        write_json_atomic(retired_path(), merge([s for s in snapshots if s]))
+        for path in dead:
+            os.remove(path)
+
+
+def collect():
+    """Totals over every worker of this host, including exited ones"""
+    worker.flush()
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    retire_dead_workers()
+    paths = [retired_path(), *glob.glob(snapshot_path('*'))]
+    snapshots = [read_snapshot(path) for path in paths]
+    return merge([s for s in snapshots if s])
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{value}"' for name, value in labels.items())
+
+
+def render(totals):
+    """Prometheus text exposition of merged totals"""
+    lines = [
+        f'# HELP {PREFIX}_requests_total Requests by view, method and status.',
+        f'# TYPE {PREFIX}_requests_total counter',
+    ]
+    for view, method, status, count in sorted(totals['requests']):
+        lines.append(f'{PREFIX}_requests_total{{{_labels(view=view, method=method, status=status)}}} {count}')
+
+    views = sorted(totals['views'].items())
+    lines += [
+        f'# HELP {PREFIX}_request_duration_seconds Request latency by view.',
+        f'# TYPE {PREFIX}_request_duration_seconds histogram',
+    ]
+    for view, view_totals in views:
+        cumulative = 0
+        for bound, count in zip([*LATENCY_BUCKETS, '+Inf'], view_totals['buckets']):
+            cumulative += count
+            lines.append(f'{PREFIX}_request_duration_seconds_bucket{{{_labels(view=view, le=bound)}}} {cumulative}')
+        lines.append(f'{PREFIX}_request_duration_seconds_sum{{{_labels(view=view)}}} {view_totals["seconds"]:.6f}')
+        lines.append(f'{PREFIX}_request_duration_seconds_count{{{_labels(view=view)}}} {view_totals["count"]}')
+
+    for name, field, kind, description in (
+        ('db_queries_total', 'queries', 'counter', 'Database queries by view.'),
+        ('db_duration_seconds_total', 'db_seconds', 'counter', 'Time spent in database queries by view.'),
+        ('response_bytes_total', 'bytes', 'counter', 'Response body bytes by view.'),
+    ):
+        lines += [f'# HELP {PREFIX}_{name} {description}', f'# TYPE {PREFIX}_{name} {kind}']
+        for view, view_totals in views:
+            value = view_totals[field]
+            value = f'{value:.6f}' if isinstance(value, float) else value
+            lines.append(f'{PREFIX}_{name}{{{_labels(view=view)}}} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+worker = WorkerMetrics()
+atexit.register(worker.flush)
@@ -0,0 +1,109 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.string_utils import ensure_leading_trailing_slash
+from . import metrics
+from .targets import set_bag_cookie
+import os
+import re
+import time
+
+# <sha256>.<ext>: the names game.images and game.atlas give stored files
+CONTENT_HASH_NAME = re.compile(r'/[0-9a-f]{64}\.[a-z0-9]+$')
+
+
+class PokemonImageWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise that also serves the local Pokemon image store
+
+    Files in the store named after their content hash can be cached forever.
+    Anything else there, such as the atlas manifests build_sprite_atlas
+    rewrites in place, is revalidated on every use. In production (no
+    autorefresh) files are picked up at startup, which is why
+    cache_pokemon_images runs before the server starts.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        # Set before super().__init__(), which already calls immutable_file_test()
+        self.image_prefix = ensure_leading_trailing_slash(settings.POKEMON_IMAGE_URL)
+        super().__init__(get_response, settings=settings)
+        # Autorefresh looks the directory up per request, so it may appear later
+        if self.autorefresh or os.path.isdir(settings.POKEMON_IMAGE_ROOT):
+            self.add_files(str(settings.POKEMON_IMAGE_ROOT), prefix=self.image_prefix)
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.image_prefix):
+            return bool(CONTENT_HASH_NAME.search(url))
+        return super().immutable_file_test(path, url)
+
+    def add_cache_headers(self, headers, path, url):
+        super().add_cache_headers(headers, path, url)
+        if url.startswith(self.image_prefix) and not self.immutable_file_test(path, url):
+            headers['Cache-Control'] = 'no-cache'
+
+
+class MetricsMiddleware:
+    """Records latency, queries, DB time and response size per URL name (see game/metrics.py)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        self.observe(request, response, time.perf_counter() - start, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        self.observe(request, response, time.perf_counter() - start, stats)
+        return response
+
+    def observe(self, request, response, seconds, stats):
+        match = request.resolver_match
+        if response.streaming:
+            size = int(response.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+        metrics.worker.observe(
+            match.view_name if match else 'unmatched', request.method, response.status_code,
+            seconds, stats.count, stats.seconds, size,
+        )
+
+
+class TargetBagMiddleware:
+    """Sends the shuffle bag of identity sessions back as a signed cookie (see game/targets.py)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return set_bag_cookie(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return set_bag_cookie(request, await self.get_response(request))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0002_alter_gamesession_options_alter_pokemon_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='puzzle_date',
+            field=models.DateField(blank=True, help_text='Set for daily puzzle games', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0004_datasetversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pokemon',
+            name='local_images',
+            field=models.JSONField(blank=True, default=dict, help_text='Locally stored artwork and thumbnails'),
+        ),
+    ]
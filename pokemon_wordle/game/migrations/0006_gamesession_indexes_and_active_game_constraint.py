@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:22
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def close_duplicate_active_games(apps, schema_editor):
+    """Keep only the newest active game per session so the constraint can be created"""
+    GameSession = apps.get_model('game', 'GameSession')
+    duplicated = (
+        GameSession.objects.filter(is_completed=False)
+        .values('session_key')
+        .annotate(active=Count('id'))
+        .filter(active__gt=1)
+        .values_list('session_key', flat=True)
+    )
+    for session_key in duplicated.iterator():
+        active = GameSession.objects.filter(session_key=session_key, is_completed=False)
+        newest = active.order_by('-created_at', '-id').values_list('id', flat=True).first()
+        active.exclude(id=newest).update(is_completed=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0005_pokemon_local_images'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(fields=['session_key', 'is_completed'], name='game_session_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pokemon',
+            index=models.Index(fields=['generation', 'pokedex_number'], name='pokemon_generation_idx'),
+        ),
+        migrations.RunPython(close_duplicate_active_games, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='gamesession',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_completed', False)), fields=('session_key',), name='one_active_game_per_session'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0006_gamesession_indexes_and_active_game_constraint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerStats',
+            fields=[
+                ('key', models.CharField(help_text='Session key, or user:<id>', max_length=64, primary_key=True, serialize=False)),
+                ('games_played', models.IntegerField(default=0)),
+                ('games_won', models.IntegerField(default=0)),
+                ('current_streak', models.IntegerField(default=0)),
+                ('max_streak', models.IntegerField(default=0)),
+                ('guess_distribution', models.JSONField(blank=True, default=dict, help_text='Wins by number of guesses')),
+                ('last_game_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Player stats',
+            },
+        ),
+    ]
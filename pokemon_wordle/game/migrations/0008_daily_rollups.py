@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0007_playerstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FirstGuessDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('times_guessed', models.IntegerField(default=0)),
+                ('pokemon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='first_guess_rollups', to='game.pokemon')),
+            ],
+            options={
+                'ordering': ['-day', '-times_guessed'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TargetDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('games_completed', models.IntegerField(default=0)),
+                ('games_won', models.IntegerField(default=0)),
+                ('guesses_to_win', models.IntegerField(default=0, help_text='Total guesses over the won games')),
+                ('target_pokemon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='target_rollups', to='game.pokemon')),
+            ],
+            options={
+                'ordering': ['-day', 'target_pokemon'],
+                'indexes': [models.Index(fields=['day'], name='target_rollup_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='targetdailyrollup',
+            constraint=models.UniqueConstraint(fields=('target_pokemon', 'day'), name='target_rollup_per_day'),
+        ),
+        migrations.AddIndex(
+            model_name='firstguessdailyrollup',
+            index=models.Index(fields=['day'], name='first_guess_rollup_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='firstguessdailyrollup',
+            constraint=models.UniqueConstraint(fields=('pokemon', 'day'), name='first_guess_rollup_per_day'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0008_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.CharField(max_length=500)),
+                ('before', models.DateField(help_text='Games created and finished before this day were archived')),
+                ('sessions', models.IntegerField(default=0)),
+                ('guesses', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(fields=['created_at'], name='game_session_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0009_gamearchive_and_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='guess_ids',
+            field=models.JSONField(blank=True, default=list, help_text='Guessed Pokemon ids, in guess order'),
+        ),
+    ]
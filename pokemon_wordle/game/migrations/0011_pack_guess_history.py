@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:46
+
+from django.db import migrations, transaction
+
+CHUNK_SIZE = 1000
+
+
+def pack_guess_history(apps, schema_editor):
+    """Copy each game's Guess rows into GameSession.guess_ids, one short transaction per chunk"""
+    GameSession = apps.get_model('game', 'GameSession')
+    Guess = apps.get_model('game', 'Guess')
+    last_id = 0
+    while True:
+        ids = list(
+            GameSession.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', flat=True)[:CHUNK_SIZE]
+        )
+        if not ids:
+            return
+        with transaction.atomic():
+            guesses = {}
+            for game_id, pokemon_id in (
+                Guess.objects.filter(game_session_id__in=ids)
+                .order_by('game_session_id', 'guess_number', 'id')
+                .values_list('game_session_id', 'pokemon_id')
+            ):
+                guesses.setdefault(game_id, []).append(pokemon_id)
+            GameSession.objects.bulk_update(
+                [GameSession(id=game_id, guess_ids=pokemon_ids) for game_id, pokemon_ids in guesses.items()],
+                ['guess_ids'],
+            )
+        last_id = ids[-1]
+
+
+def unpack_guess_history(apps, schema_editor):
+    """Recreate Guess rows for games whose guesses exist only in guess_ids"""
+    GameSession = apps.get_model('game', 'GameSession')
+    Guess = apps.get_model('game', 'Guess')
+    last_id = 0
+    while True:
+        games = list(
+            GameSession.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'guess_ids')[:CHUNK_SIZE]
+        )
+        if not games:
+            return
+        with transaction.atomic():
+            logged = set(
+                Guess.objects.filter(game_session_id__in=[game_id for game_id, _ in games])
+                .values_list('game_session_id', 'guess_number')
+            )
+            Guess.objects.bulk_create([
+                Guess(game_session_id=game_id, pokemon_id=pokemon_id, guess_number=number)
+                for game_id, pokemon_ids in games
+                for number, pokemon_id in enumerate(pokemon_ids, start=1)
+                if (game_id, number) not in logged
+            ], ignore_conflicts=True)
+        last_id = games[-1][0]
+
+
+class Migration(migrations.Migration):
+    # Commit chunk by chunk instead of holding one transaction over every game
+    atomic = False
+
+    dependencies = [
+        ('game', '0010_gamesession_guess_ids'),
+    ]
+
+    operations = [
+        migrations.RunPython(pack_guess_history, unpack_guess_history),
+    ]
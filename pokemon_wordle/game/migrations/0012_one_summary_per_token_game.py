@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-17 09:12
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def delete_duplicate_summaries(apps, schema_editor):
+    """Keep only the first summary of each token game so the constraint can be created"""
+    GameSession = apps.get_model('game', 'GameSession')
+    duplicated = (
+        GameSession.objects.filter(session_key__startswith='token:')
+        .values('session_key')
+        .annotate(summaries=Count('id'))
+        .filter(summaries__gt=1)
+        .values_list('session_key', flat=True)
+    )
+    for session_key in duplicated.iterator():
+        summaries = GameSession.objects.filter(session_key=session_key)
+        first = summaries.order_by('id').values_list('id', flat=True).first()
+        summaries.exclude(id=first).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0011_pack_guess_history'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_summaries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='gamesession',
+            constraint=models.UniqueConstraint(condition=models.Q(('session_key__startswith', 'token:')), fields=('session_key',), name='one_summary_per_token_game'),
+        ),
+    ]
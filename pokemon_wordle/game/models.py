@@ -1,5 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.utils import timezone
+from .images import local_image_url
+from asgiref.sync import sync_to_async
+from contextlib import nullcontext
 import random
 
 class Pokemon(models.Model):
@@ -18,14 +22,25 @@ class Pokemon(models.Model):
     # Image URL fields for live web fetching
     image_url = models.URLField(max_length=500, blank=True, null=True, help_text="Official artwork URL")
     sprite_url = models.URLField(max_length=500, blank=True, null=True, help_text="Game sprite URL")
+    # Files written by cache_pokemon_images, see game/images.py
+    local_images = models.JSONField(default=dict, blank=True, help_text="Locally stored artwork and thumbnails")
     
     def __str__(self):
         return f"#{self.pokedex_number} - {self.name}"
     
-    def get_display_image(self):
-        """Returns the best available image URL (prefers official artwork)"""
+    def get_display_image(self, size='md'):
+        """Returns the best available image URL (prefers local thumbnails, then official artwork)"""
+        local = self.local_images.get(size) or self.local_images.get('original')
+        if local:
+            return local_image_url(local)
         return self.image_url or self.sprite_url
     
+    def get_icon_image(self):
+        """Small image for lists: the local thumbnail, else the game sprite"""
+        if self.local_images.get('sm'):
+            return local_image_url(self.local_images['sm'])
+        return self.sprite_url or self.get_display_image('sm')
+    
     def has_image(self):
         """Check if Pokemon has any image available"""
         return bool(self.image_url or self.sprite_url)
@@ -34,8 +49,41 @@ class Pokemon(models.Model):
         ordering = ['pokedex_number']
         verbose_name = "Pokémon"
         verbose_name_plural = "Pokémon"
+        indexes = [
+            # Per-generation listings, in Pokédex order
+            models.Index(fields=['generation', 'pokedex_number'], name='pokemon_generation_idx'),
+        ]
+
+class DatasetVersion(models.Model):
+    """Content hash of the last Pokédex bundle loaded into this database"""
+    name = models.CharField(max_length=50, unique=True)
+    content_hash = models.CharField(max_length=64)
+    record_count = models.IntegerField(default=0)
+    loaded_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} @ {self.content_hash[:12]}"
+
+class GameStateMixin:
+    """Game rules shared by database-backed and token-backed games"""
+    
+    def apply_guess_outcome(self, pokemon):
+        """Update the win/completion flags after a guess; returns True if it was correct"""
+        is_correct = pokemon.id == self.target_pokemon.id
+        if is_correct:
+            self.is_won = True
+            self.is_completed = True
+        elif self.guesses_count >= self.max_guesses:
+            self.is_completed = True
+        if self.is_completed:
+            self.completed_at = timezone.now()
+        return is_correct
+    
+    def get_completion_rate(self):
+        """Get the completion percentage"""
+        return (self.guesses_count / self.max_guesses) * 100
 
-class GameSession(models.Model):
+class GameSession(GameStateMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     session_key = models.CharField(max_length=40)
     target_pokemon = models.ForeignKey(Pokemon, on_delete=models.CASCADE)
@@ -46,17 +94,154 @@ class GameSession(models.Model):
     max_guesses = models.IntegerField(default=6)
     created_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    puzzle_date = models.DateField(null=True, blank=True, help_text="Set for daily puzzle games")
+    # The game's guesses; Guess rows are only an optional analytics log (game/guess_log.py)
+    guess_ids = models.JSONField(default=list, blank=True, help_text="Guessed Pokemon ids, in guess order")
+    
+    # What recording a guess changes, written by one UPDATE
+    GUESS_STATE_FIELDS = ['guess_ids', 'guesses_count', 'is_won', 'is_completed', 'completed_at']
     
     def __str__(self):
         status = "Won" if self.is_won else "Lost" if self.is_completed else "Active"
         return f"Game {self.id} - {self.target_pokemon.name} ({status})"
     
-    def get_completion_rate(self):
-        """Get the completion percentage"""
-        return (self.guesses_count / self.max_guesses) * 100
+    def guessed_pokemon_ids(self):
+        """Ids of the guessed Pokemon, in guess order"""
+        return list(self.guess_ids)
+    
+    def has_guessed(self, pokemon):
+        """Check if this Pokemon was already guessed in this game"""
+        return pokemon.id in self.guess_ids
+    
+    def append_guess(self, pokemon):
+        """Apply a guess in memory; returns (UPDATE queryset, changes, is_correct)
+
+        The UPDATE only matches while the row still has the guesses this
+        object was read with, so concurrent guesses cannot overwrite each other.
+        """
+        previous = self.guesses_count
+        self.guess_ids = [*self.guess_ids, pokemon.id]
+        self.guesses_count = len(self.guess_ids)
+        is_correct = self.apply_guess_outcome(pokemon)
+        changes = {field: getattr(self, field) for field in self.GUESS_STATE_FIELDS}
+        return GameSession.objects.filter(pk=self.pk, guesses_count=previous), changes, is_correct
+    
+    def can_guess(self, pokemon):
+        """True if ``pokemon`` is still a valid guess in this game"""
+        return not (self.is_completed or self.has_guessed(pokemon))
+    
+    def record_guess(self, pokemon):
+        """Store a guess and update the game state in one UPDATE; returns True if it was correct"""
+        from .guess_log import log_guesses
+        while True:
+            game_row, changes, is_correct = self.append_guess(pokemon)
+            if self.apply_guess(game_row, changes):
+                break
+            # Another request (e.g. a double submit) guessed first: retry on the current game
+            self.refresh_from_db(fields=self.GUESS_STATE_FIELDS)
+            if not self.can_guess(pokemon):
+                return pokemon.id == self.target_pokemon_id
+        transaction.on_commit(lambda: log_guesses(self.pk, [pokemon.id], self.guesses_count))
+        return is_correct
+    
+    def apply_guess(self, game_row, changes):
+        """Run the UPDATE built by append_guess(); False if the game changed underneath"""
+        # A finishing guess commits together with the stats and rollups it updates
+        with transaction.atomic() if self.is_completed else nullcontext():
+            if not game_row.update(**changes):
+                return False
+            if self.is_completed:
+                self.send_completed()
+            return True
+    
+    def send_completed(self):
+        """Announce that this game finished by play (stats and rollups listen)"""
+        from .signals import game_completed
+        game_completed.send(sender=GameSession, game=self)
+    
+    # The guesses are part of the row, so these need no query
+    async def aguessed_pokemon_ids(self):
+        """Async version of guessed_pokemon_ids()"""
+        return self.guessed_pokemon_ids()
+    
+    async def ahas_guessed(self, pokemon):
+        """Async version of has_guessed()"""
+        return self.has_guessed(pokemon)
+    
+    async def arecord_guess(self, pokemon):
+        """Async version of record_guess()"""
+        from .guess_log import log_guesses
+        while True:
+            game_row, changes, is_correct = self.append_guess(pokemon)
+            if self.is_completed:
+                # Transactions need one connection, so the finishing branch runs in a thread
+                updated = await sync_to_async(self.apply_guess)(game_row, changes)
+            else:
+                updated = await game_row.aupdate(**changes)
+            if updated:
+                break
+            await self.arefresh_from_db(fields=self.GUESS_STATE_FIELDS)
+            if not self.can_guess(pokemon):
+                return pokemon.id == self.target_pokemon_id
+        log_guesses(self.pk, [pokemon.id], self.guesses_count)
+        return is_correct
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Session history and stats: filter(session_key=..., [is_completed=...])
+            models.Index(fields=['session_key', 'is_completed'], name='game_session_key_idx'),
+            # Retention: archive_games walks games created before a cutoff
+            models.Index(fields=['created_at'], name='game_session_created_idx'),
+        ]
+        constraints = [
+            # At most one active game per session; also serves the active-game lookup
+            models.UniqueConstraint(
+                fields=['session_key'],
+                condition=models.Q(is_completed=False),
+                name='one_active_game_per_session',
+            ),
+            # A token game is summarised once, however often its final token is replayed
+            models.UniqueConstraint(
+                fields=['session_key'],
+                condition=models.Q(session_key__startswith='token:'),
+                name='one_summary_per_token_game',
+            ),
+        ]
+
+class PlayerStats(models.Model):
+    """Running totals for one player, updated as each of their games finishes"""
+    key = models.CharField(max_length=64, primary_key=True, help_text="Session key, or user:<id>")
+    games_played = models.IntegerField(default=0)
+    games_won = models.IntegerField(default=0)
+    current_streak = models.IntegerField(default=0)
+    max_streak = models.IntegerField(default=0)
+    guess_distribution = models.JSONField(default=dict, blank=True, help_text="Wins by number of guesses")
+    last_game_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.key}: {self.games_won}/{self.games_played} won"
+    
+    def get_win_rate(self):
+        """Get the win percentage"""
+        return (self.games_won / self.games_played * 100) if self.games_played else 0
+    
+    def apply_game(self, game):
+        """Fold a finished game into the totals; an abandoned one is a loss"""
+        self.games_played += 1
+        if game.is_won:
+            self.games_won += 1
+            self.current_streak += 1
+            self.max_streak = max(self.max_streak, self.current_streak)
+            guesses = str(game.guesses_count)
+            self.guess_distribution[guesses] = self.guess_distribution.get(guesses, 0) + 1
+        else:
+            self.current_streak = 0
+        # Abandoned games have no completed_at
+        self.last_game_at = game.completed_at or game.created_at
+    
+    class Meta:
+        verbose_name_plural = "Player stats"
 
 class Guess(models.Model):
     game_session = models.ForeignKey(GameSession, on_delete=models.CASCADE, related_name='guesses')
@@ -73,4 +258,52 @@ class Guess(models.Model):
     
     class Meta:
         ordering = ['guess_number']
-        unique_together = ['game_session', 'pokemon']  # Prevent duplicate guesses in same game
\ No newline at end of file
+        unique_together = ['game_session', 'pokemon']  # Prevent duplicate guesses in same game
+
+class TargetDailyRollup(models.Model):
+    """Games finished per target Pokemon and day (see game/analytics.py)"""
+    target_pokemon = models.ForeignKey(Pokemon, on_delete=models.CASCADE, related_name='target_rollups')
+    day = models.DateField()
+    games_completed = models.IntegerField(default=0)
+    games_won = models.IntegerField(default=0)
+    guesses_to_win = models.IntegerField(default=0, help_text="Total guesses over the won games")
+    
+    def __str__(self):
+        return f"{self.target_pokemon.name} on {self.day}: {self.games_won}/{self.games_completed} solved"
+    
+    class Meta:
+        ordering = ['-day', 'target_pokemon']
+        indexes = [models.Index(fields=['day'], name='target_rollup_day_idx')]
+        constraints = [
+            models.UniqueConstraint(fields=['target_pokemon', 'day'], name='target_rollup_per_day'),
+        ]
+
+class FirstGuessDailyRollup(models.Model):
+    """How often each Pokemon was the opening guess of a finished game, per day"""
+    pokemon = models.ForeignKey(Pokemon, on_delete=models.CASCADE, related_name='first_guess_rollups')
+    day = models.DateField()
+    times_guessed = models.IntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.pokemon.name} opened {self.times_guessed} games on {self.day}"
+    
+    class Meta:
+        ordering = ['-day', '-times_guessed']
+        indexes = [models.Index(fields=['day'], name='first_guess_rollup_day_idx')]
+        constraints = [
+            models.UniqueConstraint(fields=['pokemon', 'day'], name='first_guess_rollup_per_day'),
+        ]
+
+class GameArchive(models.Model):
+    """One archive_games run: games moved out of the database into a file (see game/archive.py)"""
+    file = models.CharField(max_length=500)
+    before = models.DateField(help_text="Games created and finished before this day were archived")
+    sessions = models.IntegerField(default=0)
+    guesses = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.sessions} games before {self.before} in {self.file}"
+    
+    class Meta:
+        ordering = ['-created_at']
@@ -0,0 +1,115 @@
+"""
+Pre-serialized, precompressed response bodies derived from the Pokédex.
+
+Payloads are built once per registry snapshot (i.e. once per dataset version)
+and served as bytes with a strong ETag, so conditional requests are answered
+from memory with a 304 and never reach the database.
+"""
+
+import gzip
+import hashlib
+import json
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+
+from .atlas import read_atlas
+from .comparison import FIELDS, STATUS_NAMES, display_values
+
+try:
+    import brotli
+except ImportError:  # Without Brotli (see requirements.txt) only gzip is offered
+    brotli = None
+
+
+class PreparedResponse:
+    """A JSON body plus its compressed variants and validators"""
+
+    def __init__(self, data):
+        self.body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        # Each representation gets its own strong validator
+        self.variants = {
+            'identity': (self.body, f'"{digest}"'),
+            'gzip': (gzip.compress(self.body, compresslevel=9, mtime=0), f'"{digest}-gzip"'),
+        }
+        if brotli is not None:
+            self.variants['br'] = (brotli.compress(self.body), f'"{digest}-br"')
+        self.etags = {etag for _, etag in self.variants.values()}
+
+    def choose_encoding(self, accept_encoding):
+        """Pick the smallest variant the client accepts"""
+        accepted = set()
+        for item in accept_encoding.split(','):
+            coding, *params = item.split(';')
+            quality = 1.0
+            for param in params:
+                name, _, value = param.strip().partition('=')
+                if name == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                accepted.add(coding.strip().lower())
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and (encoding in accepted or '*' in accepted):
+                return encoding
+        return 'identity'
+
+    def serve(self, request, cache_control):
+        """Return a 304 for a matching validator, else the best encoded body"""
+        encoding = self.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        body, etag = self.variants[encoding]
+
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+        tags = {tag.strip() for tag in if_none_match.split(',')} if if_none_match else set()
+        if '*' in tags or tags & self.etags:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+            if encoding != 'identity':
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        response['Vary'] = 'Accept-Encoding'
+        return response
+
+
+def build_pokemon_list(registry):
+    """Autocomplete payload for Gen 1 served by ``/pokemon-list/``
+
+    When ``build_sprite_atlas`` has run, ``atlas`` describes the packed sprite
+    image and each entry carries its ``atlas_offset``. Each entry also has the
+    Pokedex number and displayed attribute values (in ``fields`` order) that
+    compact guess results refer to.
+    """
+    atlas = read_atlas(1)
+    offsets = atlas['offsets'] if atlas else {}
+    pokemon_data = []
+    for pokemon in registry.generation(1):
+        entry = {
+            'name': pokemon.name,
+            'number': pokemon.pokedex_number,
+            'image_url': pokemon.image_url,
+            'sprite_url': pokemon.sprite_url,
+            'display_image': pokemon.get_display_image(),
+            'values': display_values(pokemon),
+        }
+        offset = offsets.get(str(pokemon.pokedex_number))
+        if offset:
+            entry['atlas_offset'] = offset
+        pokemon_data.append(entry)
+    data = {
+        'pokemon': [p['name'] for p in pokemon_data],
+        'pokemon_data': pokemon_data,
+        'fields': FIELDS,
+        'statuses': STATUS_NAMES,
+    }
+    if atlas:
+        data['atlas'] = {key: atlas[key] for key in ('url', 'cell', 'width', 'height')}
+    return PreparedResponse(data)
+
+
+def pokemon_list_cache_control():
+    return f"public, max-age={getattr(settings, 'POKEMON_LIST_MAX_AGE', 60)}, must-revalidate"
@@ -0,0 +1,156 @@
+"""
+In-process, read-only Pokédex registry.
+
+Pokemon rows only change when ``populate_pokemon`` or ``update_pokemon_images``
+runs, so every worker keeps one immutable snapshot of the table in memory and
+the views read from it instead of querying ``Pokemon`` on each request.
+
+The snapshot is tagged with a dataset version stamp kept in the
+``POKEDEX_REGISTRY_CACHE`` cache, a file-based cache shared by every process
+on the host by default. Saving or deleting a Pokemon bumps the stamp (see
+``game.signals``); every worker sharing that cache reloads its snapshot,
+including after a management command changed the data. Reading the stamp is
+a file read, and the views look the registry up several times per request,
+so a worker reads it at most once per ``POKEDEX_VERSION_CHECK_INTERVAL``
+seconds. Changes made in the worker itself are seen at once.
+"""
+
+import threading
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from .comparison import ComparisonEngine
+from .models import Pokemon
+
+VERSION_CACHE_KEY = 'pokedex:version'
+
+_registry = None
+_lock = threading.Lock()
+# time.monotonic() of the last stamp read
+_checked_at = 0.0
+
+
+def normalize_name(name):
+    """Normalize a free-text Pokemon name for lookups"""
+    return (name or '').strip().lower()
+
+
+def _version_cache():
+    return caches[getattr(settings, 'POKEDEX_REGISTRY_CACHE', 'default')]
+
+
+class PokedexRegistry:
+    """Immutable snapshot of every Pokemon, indexed for the hot views"""
+
+    def __init__(self, pokemon, version):
+        self.version = version
+        self.pokemon = tuple(pokemon)
+        self.by_id = {p.id: p for p in self.pokemon}
+        self.by_number = {p.pokedex_number: p for p in self.pokemon}
+        self.by_name = {normalize_name(p.name): p for p in self.pokemon}
+        self._by_generation = {}
+        self._derived = {}
+        self.comparison = ComparisonEngine(self.pokemon)
+
+    def __len__(self):
+        return len(self.pokemon)
+
+    def get(self, pokemon_id):
+        """Look up a Pokemon by primary key"""
+        return self.by_id.get(pokemon_id)
+
+    def get_by_number(self, pokedex_number, generation=None):
+        """Look up a Pokemon by Pokédex number, optionally within a generation"""
+        pokemon = self.by_number.get(pokedex_number)
+        if pokemon is None or (generation is not None and pokemon.generation != generation):
+            return None
+        return pokemon
+
+    def get_by_name(self, name, generation=None):
+        """Look up a Pokemon by case-insensitive name, optionally within a generation"""
+        pokemon = self.by_name.get(normalize_name(name))
+        if pokemon is None or (generation is not None and pokemon.generation != generation):
+            return None
+        return pokemon
+
+    def derived(self, key, build):
+        """Memoize ``build(self)`` for the lifetime of this snapshot"""
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = build(self)
+            return value
+
+    def generation(self, generation):
+        """All Pokemon of a generation, ordered by Pokédex number"""
+        members = self._by_generation.get(generation)
+        if members is None:
+            members = tuple(p for p in self.pokemon if p.generation == generation)
+            self._by_generation[generation] = members
+        return members
+
+
+def _is_fresh(registry):
+    """True when ``registry`` was checked against the stamp recently enough"""
+    return registry is not None and time.monotonic() - _checked_at < settings.POKEDEX_VERSION_CHECK_INTERVAL
+
+
+def _matches(registry, stamp):
+    """True if ``registry`` is current for the stamp just read, which restarts the interval"""
+    global _checked_at
+    if registry is None or (stamp is not None and stamp != registry.version):
+        return False
+    _checked_at = time.monotonic()
+    return True
+
+
+def get_registry():
+    """Return the current registry, reloading it if the dataset version changed"""
+    registry = _registry
+    if _is_fresh(registry):
+        return registry
+    stamp = _version_cache().get(VERSION_CACHE_KEY)
+    if _matches(registry, stamp):
+        return registry
+    return load_registry(stamp)
+
+
+async def aget_registry():
+    """Async version of get_registry(); only a reload leaves the event loop"""
+    registry = _registry
+    if _is_fresh(registry):
+        return registry
+    stamp = await _version_cache().aget(VERSION_CACHE_KEY)
+    if _matches(registry, stamp):
+        return registry
+    return await sync_to_async(load_registry)(stamp)
+
+
+def load_registry(version=None):
+    """Load a fresh snapshot of the Pokemon table into this worker"""
+    global _registry, _checked_at
+    with _lock:
+        if _registry is not None and version is not None and _registry.version == version:
+            return _registry
+        if version is None:
+            # Seed the stamp with the loaded bundle's content hash when there is one
+            from .dataset import current_version
+            version = current_version() or uuid.uuid4().hex
+            # Adopt a stamp another worker already published, if any
+            if not _version_cache().add(VERSION_CACHE_KEY, version, timeout=None):
+                version = _version_cache().get(VERSION_CACHE_KEY) or version
+        _registry = PokedexRegistry(Pokemon.objects.all(), version)
+        _checked_at = time.monotonic()
+        return _registry
+
+
+def invalidate_registry(version=None):
+    """Drop this worker's snapshot and publish a new dataset version stamp"""
+    global _registry
+    with _lock:
+        _registry = None
+        _version_cache().set(VERSION_CACHE_KEY, version or uuid.uuid4().hex, timeout=None)
@@ -0,0 +1,94 @@
+"""
+In-memory name search for autocomplete and guess resolution.
+
+Built once per registry snapshot and generation:
+
+* a prefix table (a trie flattened into a dict of prefix -> Pokemon, in
+  Pokédex order) answers "starts with" queries with a single lookup;
+* a trigram inverted index ranks the remaining candidates by shared trigrams,
+  which also tolerates typos ("pikahcu", "charzard").
+"""
+
+from collections import Counter
+
+from .registry import normalize_name
+
+# Spellings players actually type for names with symbols in them
+_FOLDS = {'♀': 'f', '♂': 'm', 'é': 'e'}
+
+
+def fold_name(name):
+    """Lowercase name reduced to letters and digits ("Mr. Mime" -> "mrmime")"""
+    return ''.join(_FOLDS.get(ch, ch) for ch in normalize_name(name) if ch.isalnum() or ch in _FOLDS)
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Prefix table plus trigram index over a set of Pokemon"""
+
+    # Minimum share of the query's trigrams a fuzzy match must contain
+    min_similarity = 0.3
+
+    def __init__(self, pokemon):
+        self.pokemon = tuple(pokemon)
+        self.by_name = {normalize_name(p.name): p for p in self.pokemon}
+        self.by_folded = {}
+        self.prefixes = {}
+        self.trigram_index = {}
+        for position, p in enumerate(self.pokemon):
+            folded = fold_name(p.name)
+            self.by_folded.setdefault(folded, []).append(p)
+            for key in {normalize_name(p.name), folded}:
+                for end in range(1, len(key) + 1):
+                    matches = self.prefixes.setdefault(key[:end], [])
+                    if not matches or matches[-1] != position:
+                        matches.append(position)
+            for gram in trigrams(folded):
+                self.trigram_index.setdefault(gram, []).append(position)
+        self.prefixes = {prefix: tuple(positions) for prefix, positions in self.prefixes.items()}
+
+    def resolve(self, name):
+        """The Pokemon a free-text guess refers to, or None if it is ambiguous or unknown"""
+        pokemon = self.by_name.get(normalize_name(name))
+        if pokemon is not None:
+            return pokemon
+        matches = self.by_folded.get(fold_name(name), ())
+        return matches[0] if len(matches) == 1 else None
+
+    def search(self, query, limit=8):
+        """Up to ``limit`` Pokemon for a partial name: prefix matches first, then fuzzy ones"""
+        query_name = normalize_name(query)
+        folded = fold_name(query)
+        if not folded:
+            return []
+
+        positions = list(self.prefixes.get(query_name) or self.prefixes.get(folded, ()))[:limit]
+        # Two letters share too few trigrams with anything to rank typos meaningfully
+        if len(positions) < limit and len(folded) >= 3:
+            query_grams = trigrams(folded)
+            scores = Counter()
+            for gram in query_grams:
+                scores.update(self.trigram_index.get(gram, ()))
+            threshold = max(1, self.min_similarity * len(query_grams))
+            seen = set(positions)
+            fuzzy = sorted(
+                (position for position, score in scores.items() if score >= threshold and position not in seen),
+                key=lambda position: (-scores[position], position)
+            )
+            positions.extend(fuzzy[:limit - len(positions)])
+        return [self.pokemon[position] for position in positions]
+
+
+def build_search_index(generation):
+    def build(registry):
+        return SearchIndex(registry.generation(generation))
+    return build
+
+
+def get_search_index(registry, generation=1):
+    """Search index for a generation, built once per registry snapshot"""
+    return registry.derived(('search', generation), build_search_index(generation))
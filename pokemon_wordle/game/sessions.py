@@ -0,0 +1,84 @@
+"""
+Session backend for anonymous players (``SESSION_ENGINE = 'game.sessions'``).
+
+A new visitor gets a self-verifying *identity key* instead of a
+``django_session`` row::
+
+    p<15 random characters><24 hex characters of HMAC>      (40 characters)
+
+The key is checked with the HMAC alone, so creating, reading and saving an
+empty session costs no query, and the table no longer grows with every
+visitor. ``request.session.session_key`` behaves as usual, so game code keyed
+by it works unchanged.
+
+As soon as a session holds data (e.g. an admin login) it moves to an ordinary
+stored session, the ``cached_db`` engine with ``SESSION_CACHE_ALIAS`` in front.
+That move changes the key, just like the key rotation Django does at login.
+"""
+
+from django.contrib.sessions.backends import cached_db
+from django.utils.crypto import constant_time_compare, get_random_string, salted_hmac
+
+IDENTITY_PREFIX = 'p'
+# Stock session keys are 32 characters, so a stored key never looks like one
+IDENTITY_KEY_LENGTH = 40
+IDENTITY_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789'
+KEY_SALT = 'game.sessions.identity'
+
+
+def identity_mac(nonce):
+    return salted_hmac(KEY_SALT, nonce).hexdigest()[:24]
+
+
+def new_identity_key():
+    nonce = IDENTITY_PREFIX + get_random_string(15, IDENTITY_CHARS)
+    return nonce + identity_mac(nonce)
+
+
+def looks_like_identity_key(key):
+    return bool(key) and len(key) == IDENTITY_KEY_LENGTH and key.startswith(IDENTITY_PREFIX)
+
+
+def is_identity_key(key):
+    """True for a well-formed identity key with a valid HMAC"""
+    if not looks_like_identity_key(key):
+        return False
+    return constant_time_compare(identity_mac(key[:16]), key[16:])
+
+
+class SessionStore(cached_db.SessionStore):
+    """cached_db sessions that start out as database-free identity keys"""
+
+    def _validate_session_key(self, key):
+        # Forged or stale identity keys are dropped here, before any lookup
+        if looks_like_identity_key(key):
+            return is_identity_key(key)
+        return super()._validate_session_key(key)
+
+    def load(self):
+        if is_identity_key(self.session_key):
+            return {}
+        return super().load()
+
+    def create(self):
+        self._session_key = new_identity_key()
+        self._session_cache = {}
+        self.modified = True
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        if not is_identity_key(self.session_key):
+            return super().save(must_create)
+        if self._get_session(no_load=must_create):
+            # First data in an identity session: keep it in a stored session
+            super().create()
+
+    def exists(self, session_key):
+        return is_identity_key(session_key) or super().exists(session_key)
+
+    def delete(self, session_key=None):
+        key = self.session_key if session_key is None else session_key
+        if is_identity_key(key):
+            return  # Nothing is stored for an identity key
+        super().delete(session_key)
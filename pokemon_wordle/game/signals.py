@@ -0,0 +1,29 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from .models import Pokemon
+from .dataset import mark_dataset_changed
+from . import analytics, metrics, stats
+
+# Sent with game=<GameSession> when a game finishes by play (abandoned games go to stats directly)
+game_completed = Signal()
+
+
+@receiver([post_save, post_delete], sender=Pokemon)
+def invalidate_pokedex(sender, **kwargs):
+    """Any change to the Pokemon table invalidates the registry and the bundle version"""
+    mark_dataset_changed()
+
+
+# Times every query of a request measured by MetricsMiddleware
+connection_created.connect(metrics.install_query_wrapper, dispatch_uid='game.metrics')
+
+
+@receiver(game_completed)
+def update_player_stats(sender, game, **kwargs):
+    stats.record_completed_game(game)
+
+
+@receiver(game_completed)
+def update_rollups(sender, game, **kwargs):
+    analytics.record_completed_game(game)
@@ -0,0 +1,272 @@
+"""
+Information-gain solver and opening book.
+
+For a guess, every target answers with a *feedback pattern*, the nine status
+codes of ``ComparisonEngine``. A guess is good when those patterns split the
+remaining targets into many small groups. Its information gain is the entropy
+of the split, in bits.
+
+The patterns come straight out of the comparison matrix. For guess ``g`` and
+attribute ``a``, the statuses against every target are one strided slice::
+
+    matrix[g * width + a::n * width]
+
+Each worker packs the nine slices of a guess once into an ``array`` of
+18-bit pattern codes, two bits per status. Every slice is spread over the
+32-bit lanes of one big int, shifted into place and OR-ed with the others,
+so the encoding runs in C, with no Python loop per target. Grouping targets by feedback is
+then ``Counter`` over an ``itemgetter`` of that array, and no per-row Python
+comparison runs. ``solve_openers`` spreads the work over a process pool:
+
+* every guess is scored against the whole pool (best openers);
+* the best opener splits the pool; each group's subtree is then solved
+  greedily (highest gain, preferring guesses that could be the answer), one
+  group per task. That gives each target the number of guesses the solver
+  needs (its solve depth).
+
+The book is written to ``SOLVER_DATA_DIR/gen<N>.json`` and tagged with a hash
+of the compared attributes, so a book built for other data is ignored. Views
+read it through the registry (``get_opening_book``), so a lookup is a dict
+access.
+"""
+
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import math
+from operator import itemgetter
+import os
+import sys
+
+from django.conf import settings
+
+# Workers import this module; it must not need the app registry
+from .comparison import ATTRIBUTES, CORRECT, FIELDS, ComparisonEngine, pack_statuses
+
+BOOK_FORMAT = 'pokeguess-solver'
+BOOK_VERSION = 1
+TOP_OPENERS = 20
+
+# Per-process state, set up once per worker by init_worker()
+_matrix = None
+_size = 0
+_width = len(ATTRIBUTES)
+_codes = {}
+
+
+def init_worker(matrix, size):
+    global _matrix, _size
+    _matrix, _size = bytes(matrix), size
+    _codes.clear()
+
+
+def guess_columns(guess):
+    """Status bytes of ``guess`` against every target, one bytes object per attribute"""
+    stride = _size * _width
+    return [_matrix[guess * _width + a::stride] for a in range(_width)]
+
+
+# The pattern of a guess that is the target (pattern_codes() packs like pack_statuses())
+SOLVED = pack_statuses([CORRECT] * len(ATTRIBUTES))
+
+
+def pattern_codes(guess):
+    """Feedback pattern code of ``guess`` against every target"""
+    codes = _codes.get(guess)
+    if codes is None:
+        packed = 0
+        for a, column in enumerate(guess_columns(guess)):
+            lanes = bytearray(4 * _size)
+            lanes[::4] = column
+            packed |= int.from_bytes(lanes, 'little') << (2 * a)
+        codes = array('I')
+        codes.frombytes(packed.to_bytes(4 * _size, 'little'))
+        if sys.byteorder == 'big':
+            codes.byteswap()
+        _codes[guess] = codes
+    return codes
+
+
+def partition(guess, targets):
+    """Counter of feedback patterns of ``guess`` over the ``targets`` indices"""
+    codes = pattern_codes(guess)
+    if len(targets) == _size:
+        return Counter(codes)
+    if len(targets) == 1:
+        return Counter([codes[targets[0]]])
+    return Counter(itemgetter(*targets)(codes))
+
+
+def entropy(counts, total):
+    return math.log2(total) - sum(c * math.log2(c) for c in counts.values()) / total
+
+
+def score_guesses(guesses, targets=None):
+    """(entropy, largest group, guess) for each guess index over ``targets``"""
+    targets = targets if targets is not None else range(_size)
+    scores = []
+    for guess in guesses:
+        counts = partition(guess, targets)
+        scores.append((entropy(counts, len(targets)), max(counts.values()), guess))
+    return scores
+
+
+def best_guess(targets):
+    """The guess with the highest gain; ties go to a possible answer, then fewer left worst case"""
+    candidates = set(targets)
+    best = None
+    for gain, largest, guess in score_guesses(range(_size), targets):
+        key = (round(gain, 9), guess in candidates, -largest, -guess)
+        if best is None or key > best[0]:
+            best = (key, guess)
+    return best[1]
+
+
+def solve_depths(targets, depth=1, guess=None):
+    """Guesses needed for each target index when the solver plays greedily from ``targets``"""
+    if len(targets) == 1:
+        return {targets[0]: depth}
+    if guess is None:
+        # With two left, guessing one of them is always optimal
+        guess = targets[0] if len(targets) == 2 else best_guess(targets)
+    groups = {}
+    codes = pattern_codes(guess)
+    for target in targets:
+        groups.setdefault(codes[target], []).append(target)
+    depths = {}
+    for pattern, group in groups.items():
+        if pattern == SOLVED:
+            depths[guess] = depth
+        else:
+            depths.update(solve_depths(group, depth + 1))
+    return depths
+
+
+def solve_group(group):
+    return solve_depths(group, depth=2)
+
+
+def attribute_information():
+    """Average bits each attribute alone reveals about the target, over every guess"""
+    bits = []
+    stride = _size * _width
+    for a in range(_width):
+        total = 0.0
+        for guess in range(_size):
+            column = _matrix[guess * _width + a::stride]
+            counts = Counter(column)
+            total += entropy(counts, _size)
+        bits.append(total / _size)
+    return bits
+
+
+def pool_hash(pool):
+    """Hash of every compared attribute of a pool; identifies the data a book was built from"""
+    rows = [[getattr(pokemon, field) for field in FIELDS] for pokemon in pool]
+    return hashlib.sha256(json.dumps(rows, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def chunks(items, count):
+    size = max(1, math.ceil(len(items) / count))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def solve_openers(pool, workers=None, log=None):
+    """Score every opener and every target of ``pool``; returns the book as a dict"""
+    log = log or (lambda message: None)
+    pool = tuple(pool)
+    engine = ComparisonEngine(pool)
+    workers = workers or os.cpu_count() or 1
+    indices = list(range(len(pool)))
+
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(engine.matrix, len(pool))) as executor:
+        scores = [
+            score for part in executor.map(score_guesses, chunks(indices, workers * 4))
+            for score in part
+        ]
+        scores.sort(key=lambda s: (-round(s[0], 9), s[1], s[2]))
+        opener = scores[0][2]
+        log(f'Scored {len(scores)} openers; best is {pool[opener].name} ({scores[0][0]:.3f} bits)')
+
+        # The opener's groups are independent subtrees: one task each
+        init_worker(engine.matrix, len(pool))
+        groups = {}
+        codes = pattern_codes(opener)
+        for target in indices:
+            groups.setdefault(codes[target], []).append(target)
+        depths = {opener: 1}
+        for part in executor.map(solve_group, [g for p, g in groups.items() if p != SOLVED]):
+            depths.update(part)
+        attributes = executor.submit(attribute_information).result()
+    log(f'Solved {len(depths)} targets from {len(groups)} opening groups')
+
+    return {
+        'format': BOOK_FORMAT,
+        'version': BOOK_VERSION,
+        'pool_hash': pool_hash(pool),
+        'size': len(pool),
+        'openers': [
+            {
+                'pokedex_number': pool[guess].pokedex_number,
+                'name': pool[guess].name,
+                'bits': round(gain, 4),
+                'largest_group': largest,
+            }
+            for gain, largest, guess in scores[:TOP_OPENERS]
+        ],
+        'solve_depth': {str(pool[index].pokedex_number): depth for index, depth in sorted(depths.items())},
+        'average_depth': round(sum(depths.values()) / len(depths), 4),
+        'max_depth': max(depths.values()),
+        'attribute_bits': {field: round(bits, 4) for field, bits in zip(FIELDS, attributes)},
+    }
+
+
+def book_path(generation, directory=None):
+    return os.path.join(directory or settings.SOLVER_DATA_DIR, f'gen{generation}.json')
+
+
+def write_book(generation, book, directory=None):
+    from .importer import write_json_atomic
+    path = book_path(generation, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_json_atomic(path, dict(book, generation=generation))
+    return path
+
+
+class OpeningBook:
+    """A solver book matched to the registry: openers and solve depth by Pokemon id"""
+
+    def __init__(self, registry, generation, book):
+        self.generation = generation
+        self.openers = [
+            dict(opener, pokemon=registry.get_by_number(opener['pokedex_number'], generation))
+            for opener in book['openers']
+        ]
+        self.solve_depth = {}
+        for number, depth in book['solve_depth'].items():
+            pokemon = registry.get_by_number(int(number), generation)
+            if pokemon is not None:
+                self.solve_depth[pokemon.id] = depth
+        self.average_depth = book['average_depth']
+        self.max_depth = book['max_depth']
+        self.attribute_bits = book['attribute_bits']
+
+
+def load_book(registry, generation):
+    """The book for a generation, or None if missing or built from other data"""
+    try:
+        with open(book_path(generation), encoding='utf-8') as book_file:
+            book = json.load(book_file)
+    except (OSError, ValueError):
+        return None
+    if book.get('format') != BOOK_FORMAT or book.get('version') != BOOK_VERSION:
+        return None
+    if book.get('pool_hash') != pool_hash(registry.generation(generation)):
+        return None
+    return OpeningBook(registry, generation, book)
+
+
+def get_opening_book(registry, generation=1):
+    return registry.derived(('solver', generation), lambda r: load_book(r, generation))
@@ -0,0 +1,126 @@
+"""
+Materialized per-player statistics.
+
+Every finished game is folded into a ``PlayerStats`` row keyed by the
+player's session key, and by ``user:<id>`` for logged-in players, so
+reading stats is a single primary-key lookup however many games were played.
+``backfill_player_stats`` rebuilds the rows from the GameSession history.
+
+Games that finished by play count (``completed_at`` is set). So does a game
+abandoned by starting a new one after at least one guess: it counts as a
+loss and ends the streak, so giving up on a losing game cannot save it. A
+game abandoned before any guess does not count. Summaries of token-mode
+games (session key ``token:<game id>``) have no player behind them and are
+skipped.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+
+from .models import GameSession, PlayerStats
+
+STATS_FIELDS = [
+    'games_played', 'games_won', 'current_streak', 'max_streak', 'guess_distribution', 'last_game_at',
+]
+
+
+def user_stats_key(user_id):
+    return f'user:{user_id}'
+
+
+def stats_keys(game):
+    """The PlayerStats rows a finished game belongs to"""
+    keys = []
+    if not game.session_key.startswith('token:'):
+        keys.append(game.session_key)
+    if game.user_id:
+        keys.append(user_stats_key(game.user_id))
+    return keys
+
+
+def record_completed_game(game):
+    """Fold a finished (or abandoned after a guess) game into its players' stats rows"""
+    with transaction.atomic():
+        for key in stats_keys(game):
+            stats, _ = PlayerStats.objects.select_for_update().get_or_create(key=key)
+            stats.apply_game(game)
+            stats.save()
+
+
+def request_user_id(request):
+    """Id of the logged-in player, stored on their games so stats_keys() finds them"""
+    return request.user.id if request.user.is_authenticated else None
+
+
+def request_stats_key(request):
+    if request.user.is_authenticated:
+        return user_stats_key(request.user.id)
+    return request.session.session_key
+
+
+def stats_payload(stats, max_guesses=6):
+    distribution = stats.guess_distribution
+    return {
+        'games_played': stats.games_played,
+        'games_won': stats.games_won,
+        'win_rate': round(stats.get_win_rate(), 1),
+        'current_streak': stats.current_streak,
+        'max_streak': stats.max_streak,
+        # Wins in 1..max_guesses guesses
+        'guess_distribution': [distribution.get(str(n), 0) for n in range(1, max_guesses + 1)],
+    }
+
+
+def finished_games(key_field):
+    """Counted games ordered by player then completion, for a streaming rebuild"""
+    games = GameSession.objects.filter(Q(completed_at__isnull=False) | Q(guesses_count__gt=0), is_completed=True)
+    if key_field == 'session_key':
+        games = games.exclude(session_key__startswith='token:')
+    else:
+        games = games.filter(user__isnull=False)
+    # An abandoned game sits between the game before it and the one that replaced it
+    return (
+        games.order_by(key_field, Coalesce('completed_at', 'created_at'), 'id')
+        .only('session_key', 'user_id', 'is_won', 'guesses_count', 'completed_at', 'created_at')
+    )
+
+
+def save_stats(batch):
+    PlayerStats.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=['key'],
+        update_fields=STATS_FIELDS,
+    )
+
+
+def rebuild_stats(chunk_size=2000, log=None):
+    """Recompute every PlayerStats row from the game history; returns the row count
+
+    Games are streamed with ``iterator()`` in player order, so memory stays
+    bounded by ``chunk_size`` whatever the size of the history.
+    """
+    log = log or (lambda message: None)
+    written = 0
+    for key_field in ('session_key', 'user_id'):
+        batch = []
+        stats = None
+        for game in finished_games(key_field).iterator(chunk_size=chunk_size):
+            key = game.session_key if key_field == 'session_key' else user_stats_key(game.user_id)
+            if stats is None or stats.key != key:
+                if stats is not None:
+                    batch.append(stats)
+                stats = PlayerStats(key=key)
+                if len(batch) >= chunk_size:
+                    save_stats(batch)
+                    written += len(batch)
+                    log(f'{written} stats rows written')
+                    batch = []
+            stats.apply_game(game)
+        if stats is not None:
+            batch.append(stats)
+        if batch:
+            save_stats(batch)
+            written += len(batch)
+    return written
@@ -0,0 +1,190 @@
+"""
+Target selection for random (non-daily) games.
+
+``TargetPool`` keeps the target ids of a generation, once for the whole
+generation and once per difficulty tier. It is built once per registry
+snapshot, so a pick is an index into a tuple with no query.
+
+Difficulty is, first, the number of guesses the information-gain solver
+needs for a target, when ``solve_openers`` has written a book for the
+generation (see ``game.solver``). Ties, or a missing book, fall back to how
+common a Pokemon's exact-match attributes are (type, colour, habitat, ...).
+A target that shares them with many others gives less telling feedback and
+takes more guesses. The pool is ranked and split into thirds: ``easy``,
+``normal`` and ``hard``.
+
+With a session, picks come from a *shuffle bag*: no target repeats until
+the whole pool (or tier) has been played. The bag is not stored as a list.
+It is a keyed pseudorandom permutation of the pool positions (a small
+Feistel network) plus a cursor, kept in the session as five values::
+
+    session['target_bag'] = [generation, tier, size, seed, cursor]
+
+Drawing maps ``cursor`` through the permutation, which is O(1) whatever
+the pool size.
+
+Identity sessions (``SESSION_MODE = 'identity'``) must stay empty, or they
+would move to a stored session under a new key and orphan the player's game.
+Their bag goes in a signed cookie instead (``bag_store``), which
+``TargetBagMiddleware`` writes to the response.
+"""
+
+import hashlib
+import json
+import math
+import random
+import secrets
+
+from django.conf import settings
+from django.core import signing
+
+from .comparison import ATTRIBUTES, EXACT
+from .sessions import is_identity_key
+from .solver import get_opening_book
+
+TIERS = ('easy', 'normal', 'hard')
+BAG_SESSION_KEY = 'target_bag'
+BAG_COOKIE_SALT = 'game.targets.bag'
+BAG_COOKIE_MAX_AGE = 365 * 24 * 60 * 60
+FEISTEL_ROUNDS = 4
+
+
+def difficulty_scores(pool):
+    """Pokemon id -> how many others share each of its exact-match attributes"""
+    fields = [field for field, kind, _ in ATTRIBUTES if kind == EXACT]
+    counts = {field: {} for field in fields}
+    for pokemon in pool:
+        for field in fields:
+            value = getattr(pokemon, field)
+            counts[field][value] = counts[field].get(value, 0) + 1
+    return {
+        pokemon.id: sum(counts[field][getattr(pokemon, field)] - 1 for field in fields)
+        for pokemon in pool
+    }
+
+
+class TargetPool:
+    """Target ids of one generation, overall and per difficulty tier"""
+
+    def __init__(self, registry, generation):
+        pool = registry.generation(generation)
+        self.generation = generation
+        self.ids = tuple(pokemon.id for pokemon in pool)
+        scores = difficulty_scores(pool)
+        book = get_opening_book(registry, generation)
+        depths = book.solve_depth if book else {}
+        ranked = sorted(
+            pool, key=lambda pokemon: (depths.get(pokemon.id, 0), scores[pokemon.id], pokemon.pokedex_number)
+        )
+        size = math.ceil(len(ranked) / len(TIERS))
+        self.tiers = {
+            tier: tuple(pokemon.id for pokemon in ranked[index * size:(index + 1) * size])
+            for index, tier in enumerate(TIERS)
+        }
+
+    def ids_for(self, tier=None):
+        return self.tiers[tier] if tier in self.tiers else self.ids
+
+
+def get_target_pool(registry, generation=1):
+    return registry.derived(('targets', generation), lambda r: TargetPool(r, generation))
+
+
+def _round_value(seed, round_number, value):
+    key = seed.to_bytes(8, 'big')
+    digest = hashlib.blake2b(value.to_bytes(4, 'big'), key=key, digest_size=4, salt=bytes([round_number]))
+    return int.from_bytes(digest.digest(), 'big')
+
+
+def permute(index, size, seed):
+    """Position ``index`` of the permutation of ``range(size)`` keyed by ``seed``
+
+    A balanced Feistel network permutes the smallest 4**k domain covering
+    ``size``. Results outside ``range(size)`` are permuted again (cycle
+    walking), which takes fewer than four passes on average.
+    """
+    if size <= 1:
+        return 0
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half_bits) - 1
+    while True:
+        left, right = index >> half_bits, index & mask
+        for round_number in range(FEISTEL_ROUNDS):
+            left, right = right, left ^ (_round_value(seed, round_number, right) & mask)
+        index = (left << half_bits) | right
+        if index < size:
+            return index
+
+
+def new_seed():
+    return secrets.randbits(63)
+
+
+def draw_from_bag(session, ids, generation, tier):
+    """Next target id from the session's shuffle bag for ``ids``, refilling it when empty"""
+    bag = session.get(BAG_SESSION_KEY)
+    size = len(ids)
+    if not bag or bag[:3] != [generation, tier or '', size]:
+        seed, cursor = new_seed(), 0
+    elif bag[4] >= size:
+        # Bag exhausted: reshuffle, without repeating the last target first
+        seed, cursor = new_seed(), 0
+        if size > 1:
+            last = permute(size - 1, size, bag[3])
+            while permute(0, size, seed) == last:
+                seed = new_seed()
+    else:
+        seed, cursor = bag[3], bag[4]
+    session[BAG_SESSION_KEY] = [generation, tier or '', size, seed, cursor + 1]
+    return ids[permute(cursor, size, seed)]
+
+
+class CookieBag:
+    """The shuffle bag of an identity session, read from and written to a signed cookie
+
+    Implements the two mapping operations ``draw_from_bag`` uses; the new
+    value waits on ``request.target_bag`` for ``TargetBagMiddleware``.
+    """
+
+    def __init__(self, request):
+        self.request = request
+
+    def get(self, key, default=None):
+        if getattr(self.request, 'target_bag', None) is not None:
+            return self.request.target_bag
+        try:
+            return json.loads(self.request.get_signed_cookie(BAG_SESSION_KEY, salt=BAG_COOKIE_SALT))
+        except (KeyError, signing.BadSignature, ValueError):
+            return default
+
+    def __setitem__(self, key, value):
+        self.request.target_bag = value
+
+
+def bag_store(request):
+    """Where a player's shuffle bag is kept: their session, or a cookie for identity sessions"""
+    if is_identity_key(request.session.session_key):
+        return CookieBag(request)
+    return request.session
+
+
+def set_bag_cookie(request, response):
+    bag = getattr(request, 'target_bag', None)
+    if bag is not None:
+        response.set_signed_cookie(
+            BAG_SESSION_KEY, json.dumps(bag), salt=BAG_COOKIE_SALT, max_age=BAG_COOKIE_MAX_AGE,
+            secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite='Lax',
+        )
+    return response
+
+
+def pick_target(registry, session=None, generation=1, tier=None):
+    """Target Pokemon for a new random game
+
+    With a session, the pick comes from that player's shuffle bag; without
+    one (e.g. token games), it is uniform.
+    """
+    ids = get_target_pool(registry, generation).ids_for(tier)
+    if session is None:
+        return registry.get(random.choice(ids))
+    return registry.get(draw_from_bag(session, ids, generation, tier))
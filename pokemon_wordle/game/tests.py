@@ -1,3 +1,1097 @@
-from django.test import TestCase
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+import datetime
+import gzip
+import hashlib
+import json
+import math
+import os
+import random
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import zlib
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+import brotli
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import QuerySet
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import analytics, async_views, atlas, daily, images, metrics, solver, views
+from . import registry as registry_module
+from .archive import archive_games, read_archive
+from .candidates import get_candidate_index
+from .comparison import (
+    CORRECT, FIELDS, HIGH, LOW, STATUS_NAMES, ComparisonEngine, build_guess_result, compare, pack_statuses,
+)
+from .dataset import BundleError, current_version, export_bundle, load_bundle, read_bundle_header
+from .models import FirstGuessDailyRollup, GameSession, Guess, PlayerStats, Pokemon, TargetDailyRollup
+from .registry import aget_registry, get_registry, invalidate_registry
+from .search import get_search_index
+from .sessions import SessionStore, is_identity_key
+from .stats import STATS_FIELDS
+from .tokens import TokenGame
+from .views import replace_active_game
+
+
+class PokedexTestCase(TestCase):
+    """Test case with the shipped Pokédex bundle loaded"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_bundle(settings.POKEDEX_BUNDLE_PATH, force=True)
+        invalidate_registry()
+
+    def setUp(self):
+        invalidate_registry()
+
+
+class PokemonListTests(PokedexTestCase):
+    def get(self, accept_encoding, **headers):
+        return Client().get('/pokemon-list/', HTTP_ACCEPT_ENCODING=accept_encoding, **headers)
+
+    def test_serves_the_smallest_accepted_encoding(self):
+        decoders = {'br': brotli.decompress, 'gzip': gzip.decompress, None: bytes}
+        for accept_encoding, encoding in (
+            ('gzip', 'gzip'),
+            ('br', 'br'),
+            ('gzip, deflate, br', 'br'),
+            ('br;q=0, gzip', 'gzip'),
+            ('', None),
+            ('gzip;q=0', None),
+        ):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.get(accept_encoding)
+                self.assertEqual(response.get('Content-Encoding'), encoding)
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+                data = json.loads(decoders[encoding](response.content))
+                self.assertEqual(len(data['pokemon']), 151)
+
+    def test_matching_etag_gets_304_without_queries(self):
+        for accept_encoding in ('gzip', 'br', ''):
+            etag = self.get(accept_encoding)['ETag']
+            with self.subTest(accept_encoding=accept_encoding), self.assertNumQueries(0):
+                response = self.get(accept_encoding, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(response.content, b'')
+        # Each encoding is its own representation
+        self.assertEqual(len({self.get(encoding)['ETag'] for encoding in ('gzip', 'br', '')}), 3)
+        self.assertEqual(self.get('gzip', HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+class BundleTests(PokedexTestCase):
+    def test_unchanged_bundle_is_skipped_after_one_query(self):
+        with self.assertNumQueries(1):
+            header, loaded = load_bundle(settings.POKEDEX_BUNDLE_PATH)
+        self.assertFalse(loaded)
+        out = StringIO()
+        call_command('load_pokedex', stdout=out)
+        self.assertIn('already loaded; nothing to do', out.getvalue())
+
+    def test_export_round_trip_and_changed_bundle(self):
+        shipped = read_bundle_header(settings.POKEDEX_BUNDLE_PATH)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pokedex.jsonl.gz')
+            self.assertEqual(export_bundle(path)['content_hash'], shipped['content_hash'])
+
+            Pokemon.objects.filter(name='Pikachu').update(color='Blue')
+            changed = export_bundle(path)
+            self.assertNotEqual(changed['content_hash'], shipped['content_hash'])
+            Pokemon.objects.filter(name='Pikachu').update(color='Yellow')
+            header, loaded = load_bundle(path)
+        self.assertTrue(loaded)
+        self.assertEqual(Pokemon.objects.get(name='Pikachu').color, 'Blue')
+        self.assertEqual(current_version(), changed['content_hash'])
+
+    def test_tampered_bundle_fails_its_hash_check(self):
+        with gzip.open(settings.POKEDEX_BUNDLE_PATH, 'rt', encoding='utf-8') as bundle:
+            lines = bundle.read().splitlines()
+        lines[1] = lines[1].replace('"Bulbasaur"', '"Bulbasaurus"')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pokedex.jsonl.gz')
+            with gzip.open(path, 'wt', encoding='utf-8') as bundle:
+                bundle.write('\n'.join(lines) + '\n')
+            with self.assertRaises(BundleError):
+                load_bundle(path, force=True)
+            with self.assertRaisesMessage(CommandError, 'failed its content hash check'):
+                call_command('load_pokedex', path, '--force', stdout=StringIO())
+        self.assertTrue(Pokemon.objects.filter(name='Bulbasaur').exists())
+
+class ComparisonTests(PokedexTestCase):
+    @staticmethod
+    def field_by_field_result(guess, target):
+        """The per-request comparison the matrix replaced"""
+        def compare_attribute(guess_val, target_val):
+            return 'correct' if guess_val == target_val else 'incorrect'
+
+        def compare_numeric(guess_val, target_val):
+            if guess_val == target_val:
+                return 'correct'
+            return 'low' if guess_val < target_val else 'high'
+
+        result = {
+            'pokemon_name': guess.name,
+            'image_url': guess.image_url,
+            'sprite_url': guess.sprite_url,
+            'display_image': guess.get_display_image(),
+        }
+        for field, compare, empty in (
+            ('pokedex_number', compare_numeric, None),
+            ('type1', compare_attribute, None),
+            ('type2', compare_attribute, 'None'),
+            ('height', compare_numeric, None),
+            ('weight', compare_numeric, None),
+            ('base_stat_total', compare_numeric, None),
+            ('is_legendary', compare_attribute, None),
+            ('color', compare_attribute, None),
+            ('habitat', compare_attribute, 'Unknown'),
+        ):
+            value = getattr(guess, field)
+            result[field] = {
+                'value': (value or empty) if empty else value,
+                'status': compare(value, getattr(target, field)),
+            }
+        return result
+
+    def test_matrix_matches_field_by_field_comparison(self):
+        registry = get_registry()
+        pokemon = registry.generation(1)
+        for target in pokemon:
+            for guess in pokemon:
+                self.assertEqual(
+                    build_guess_result(registry.comparison, guess, target),
+                    self.field_by_field_result(guess, target),
+                )
+
+    def test_pokemon_outside_the_matrix_fall_back_to_comparing_fields(self):
+        registry = get_registry()
+        target = registry.generation(1)[0]
+        unknown = Pokemon(id=-1, name='Missingno', pokedex_number=0, type1='Bird', height=3.0, weight=10.0,
+                          base_stat_total=0, color='White', generation=1)
+        self.assertEqual(
+            build_guess_result(registry.comparison, unknown, target),
+            self.field_by_field_result(unknown, target),
+        )
+
+class SearchTests(PokedexTestCase):
+    def names(self, query, limit=8):
+        return [pokemon.name for pokemon in get_search_index(get_registry(), 1).search(query, limit)]
+
+    def test_prefix_matches_come_first_in_pokedex_order(self):
+        self.assertEqual(self.names('char', limit=3), ['Charmander', 'Charmeleon', 'Charizard'])
+        self.assertEqual(self.names('PIKA')[0], 'Pikachu')
+        self.assertEqual(self.names('mr mi')[0], 'Mr. Mime')
+        self.assertEqual(self.names(''), [])
+
+    def test_typos_find_the_pokemon_by_trigrams(self):
+        self.assertEqual(self.names('pikahcu')[0], 'Pikachu')
+        self.assertEqual(self.names('charzard')[0], 'Charizard')
+        self.assertEqual(self.names('xyzzy'), [])
+
+    def test_resolve_accepts_folded_names_but_not_typos(self):
+        index = get_search_index(get_registry(), 1)
+        self.assertEqual(index.resolve('mr mime').name, 'Mr. Mime')
+        self.assertEqual(index.resolve('Farfetchd').name, "Farfetch'd")
+        self.assertEqual(index.resolve('nidoranf').name, 'Nidoran♀')
+        self.assertIsNone(index.resolve('pikahcu'))
+
+    def test_search_endpoint(self):
+        response = Client().get('/pokemon-search/', {'q': 'bulb', 'limit': 1})
+        self.assertEqual([match['name'] for match in response.json()['results']], ['Bulbasaur'])
+
+class CandidateTests(PokedexTestCase):
+    def test_bitsets_match_a_brute_force_filter(self):
+        registry = get_registry()
+        pool = registry.generation(1)
+        index = get_candidate_index(registry, 1)
+        rng = random.Random(151)
+        for _ in range(200):
+            target = rng.choice(pool)
+            feedback = [(guess, compare(guess, target)) for guess in rng.sample(pool, rng.randint(0, 4))]
+            expected = [
+                pokemon for pokemon in pool
+                if all(compare(guess, pokemon) == statuses for guess, statuses in feedback)
+            ]
+            with self.subTest(target=target.name, guesses=[guess.name for guess, _ in feedback]):
+                candidates = index.filter(feedback)
+                self.assertEqual(index.members(candidates), expected)
+                self.assertEqual(index.count(candidates), len(expected))
+                self.assertIn(target, expected)
+
+    def test_candidates_endpoint_lists_the_remaining_pokemon(self):
+        client = Client()
+        client.post('/new-game/')
+        game = GameSession.objects.get(session_key=client.session.session_key, is_completed=False)
+        registry = get_registry()
+        target = registry.get(game.target_pokemon_id)
+        guess = next(pokemon for pokemon in registry.generation(1) if pokemon != target)
+        client.post('/guess/', json.dumps({'pokemon_name': guess.name}), content_type='application/json')
+
+        data = client.get('/candidates/', {'list': 1}).json()
+        expected = [
+            pokemon.name for pokemon in registry.generation(1)
+            if compare(guess, pokemon) == compare(guess, target)
+        ]
+        self.assertEqual((data['remaining'], data['candidates']), (len(expected), expected))
+        self.assertIn(data['suggestion']['name'], expected)
+
+class SolverTests(PokedexTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = get_registry().generation(1)
+        solver.init_worker(ComparisonEngine(self.pool).matrix, len(self.pool))
+
+    def test_pattern_codes_and_gain_match_the_comparison(self):
+        for guess in (0, 24, 150):
+            patterns = [pack_statuses(compare(self.pool[guess], target)) for target in self.pool]
+            self.assertEqual(list(solver.pattern_codes(guess)), patterns)
+            groups = Counter(patterns)
+            gain = -sum(size / len(patterns) * math.log2(size / len(patterns)) for size in groups.values())
+            [(score, largest, _)] = solver.score_guesses([guess])
+            self.assertAlmostEqual(score, gain)
+            self.assertEqual(largest, max(groups.values()))
+
+    def test_solve_depths_replay_as_real_games(self):
+        opener = solver.best_guess(range(len(self.pool)))
+        depths = solver.solve_depths(list(range(len(self.pool))), guess=opener)
+        self.assertEqual(sorted(depths), list(range(len(self.pool))))
+        for target in range(0, len(self.pool), 10):
+            remaining, guess, played = list(range(len(self.pool))), opener, 1
+            while guess != target:
+                statuses = compare(self.pool[guess], self.pool[target])
+                remaining = [t for t in remaining if compare(self.pool[guess], self.pool[t]) == statuses]
+                guess = remaining[0] if len(remaining) <= 2 else solver.best_guess(remaining)
+                played += 1
+            self.assertEqual(depths[target], played, self.pool[target].name)
+
+    def test_book_round_trip(self):
+        pool = self.pool[:30]
+        book = solver.solve_openers(pool, workers=2)
+        self.assertEqual(len(book['solve_depth']), 30)
+        bits = [opener['bits'] for opener in book['openers']]
+        self.assertEqual(bits, sorted(bits, reverse=True))
+        self.assertEqual(book['solve_depth'][str(book['openers'][0]['pokedex_number'])], 1)
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(SOLVER_DATA_DIR=tmp):
+            solver.write_book(1, book)
+            # Built for another pool, so the registry ignores it
+            self.assertIsNone(solver.load_book(get_registry(), 1))
+            solver.write_book(1, dict(book, pool_hash=solver.pool_hash(self.pool)))
+            loaded = solver.load_book(get_registry(), 1)
+        self.assertEqual(loaded.openers[0]['pokemon'].pokedex_number, book['openers'][0]['pokedex_number'])
+        self.assertEqual(loaded.max_depth, book['max_depth'])
+
+    def test_openers_endpoint_reads_the_shipped_book(self):
+        data = Client().get('/openers/', {'limit': 3}).json()
+        self.assertEqual(len(data['openers']), 3)
+        self.assertGreater(data['openers'][0]['bits'], data['openers'][2]['bits'])
+
+class CompactWireFormatTests(PokedexTestCase):
+    @staticmethod
+    def decode(result):
+        """The name and statuses of a compact guess result, as the client unpacks them"""
+        number, code = result
+        decoded = {'pokemon_name': get_registry().get_by_number(number, generation=1).name}
+        for attribute, field in enumerate(FIELDS):
+            decoded[field] = STATUS_NAMES[(code >> (2 * attribute)) & 3]
+        return decoded
+
+    @staticmethod
+    def summarize(result):
+        return {'pokemon_name': result['pokemon_name'], **{field: result[field]['status'] for field in FIELDS}}
+
+    def test_compact_results_decode_to_the_full_ones(self):
+        client = Client()
+        client.post('/new-game/')
+        registry = get_registry()
+        target = registry.get(GameSession.objects.get(session_key=client.session.session_key).target_pokemon_id)
+        guesses = [pokemon for pokemon in registry.generation(1) if pokemon != target][:3]
+        for guess in guesses:
+            full = client.post('/guess/', json.dumps({'pokemon_name': guess.name}), content_type='application/json')
+            self.assertEqual(full['Vary'], 'Accept')
+
+        full = client.get('/game-state/').json()
+        self.assertEqual(len(full['guesses']), 3)
+        for compact in (
+            client.get('/game-state/', {'format': 'compact'}).json(),
+            client.get('/game-state/', HTTP_ACCEPT='application/vnd.pokeguess.compact+json').json(),
+        ):
+            self.assertEqual(compact['format'], 'compact')
+            self.assertEqual(
+                [self.decode(result) for result in compact['guesses']],
+                [self.summarize(result) for result in full['guesses']],
+            )
+
+        compact = client.post(
+            '/guess/', json.dumps({'pokemon_name': target.name, 'format': 'compact'}),
+            content_type='application/json',
+        )
+        self.assertEqual(compact['Content-Type'], 'application/vnd.pokeguess.compact+json')
+        self.assertEqual(
+            self.decode(compact.json()['result']),
+            self.summarize(build_guess_result(registry.comparison, target, target)),
+        )
+
+    def test_pack_statuses_puts_attribute_a_at_bits_2a(self):
+        self.assertEqual(pack_statuses([CORRECT] * len(FIELDS)), 0)
+        self.assertEqual(pack_statuses([HIGH] + [CORRECT] * (len(FIELDS) - 1)), 3)
+        self.assertEqual(pack_statuses([CORRECT, LOW] + [CORRECT] * (len(FIELDS) - 2)), 2 << 2)
+
+class DailyPuzzleTests(PokedexTestCase):
+    def daily_target(self, client, day):
+        with mock.patch('game.daily.puzzle_day', return_value=day):
+            client.post('/new-game/?mode=daily')
+        game = GameSession.objects.get(session_key=client.session.session_key, is_completed=False)
+        self.assertEqual(game.puzzle_date, day)
+        return game.target_pokemon_id
+
+    def test_players_share_the_target_of_the_day(self):
+        players = [Client(), Client()]
+        days = [datetime.date(2026, 3, 1) + datetime.timedelta(days=n) for n in range(3)]
+        targets = [[self.daily_target(player, day) for player in players] for day in days]
+        for day, (first, second) in zip(days, targets):
+            with self.subTest(day=day):
+                self.assertEqual(first, second)
+        self.assertEqual(len({first for first, _ in targets}), len(days))
+
+    def test_worker_keeps_only_todays_puzzle(self):
+        registry = get_registry()
+        for n in range(5):
+            day = datetime.date(2026, 3, 1) + datetime.timedelta(days=n)
+            with mock.patch('game.daily.puzzle_day', return_value=day):
+                puzzle = daily.get_daily_puzzle(registry)
+                self.assertIs(daily.get_daily_puzzle(registry), puzzle)
+                # An older day's puzzle is rebuilt, not kept
+                yesterday = daily.get_daily_puzzle(registry, day - datetime.timedelta(days=1))
+                self.assertEqual(yesterday.day, day - datetime.timedelta(days=1))
+        self.assertEqual(list(registry.derived(('daily', 1), dict)), [day])
+
+class GameStateQueryTests(PokedexTestCase):
+    def play(self, guesses):
+        """A client whose current game holds ``guesses`` wrong guesses"""
+        client = Client()
+        client.post('/new-game/')
+        game = GameSession.objects.get(session_key=client.session.session_key, is_completed=False)
+        # Room for every guess without finishing the game
+        GameSession.objects.filter(pk=game.pk).update(max_guesses=guesses + 1)
+        wrong = [p for p in get_registry().generation(1) if p.id != game.target_pokemon_id][:guesses]
+        for pokemon in wrong:
+            response = client.post('/guess/', json.dumps({'pokemon_name': pokemon.name}), content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(GameSession.objects.get(pk=game.pk).guesses_count, guesses)
+        return client
+
+    def test_game_state_queries_do_not_grow_with_guesses(self):
+        for guesses in (1, 3, 6):
+            client = self.play(guesses)
+            with self.subTest(guesses=guesses), self.assertNumQueries(1):
+                response = client.get('/game-state/')
+            self.assertEqual(len(response.json()['guesses']), guesses)
+
+
+class PlayerStatsTests(PokedexTestCase):
+    def test_logged_in_player_stats_count_their_games(self):
+        client = Client()
+        client.force_login(User.objects.create_user('ash'))
+        client.post('/new-game/')
+        game = GameSession.objects.get(session_key=client.session.session_key, is_completed=False)
+        self.assertEqual(game.user.username, 'ash')
+
+        target = get_registry().get(game.target_pokemon_id)
+        client.post('/guess/', json.dumps({'pokemon_name': target.name}), content_type='application/json')
+
+        stats = client.get('/stats/').json()
+        self.assertEqual((stats['games_played'], stats['games_won']), (1, 1))
+
+    def test_abandoning_a_guessed_game_counts_as_a_loss(self):
+        client = Client()
+        registry = get_registry()
+
+        def play(*wrong, win=False):
+            client.post('/new-game/')
+            game = GameSession.objects.get(session_key=client.session.session_key, is_completed=False)
+            target = registry.get(game.target_pokemon_id)
+            names = [pokemon.name for pokemon in registry.generation(1) if pokemon != target][:len(wrong)]
+            for name in names + ([target.name] if win else []):
+                client.post('/guess/', json.dumps({'pokemon_name': name}), content_type='application/json')
+
+        def stats():
+            data = client.get('/stats/').json()
+            return data['games_played'], data['games_won'], data['current_streak'], data['max_streak']
+
+        play(win=True)
+        play(win=True)
+        play('wrong')
+        play()  # abandons the guessed game
+        self.assertEqual(stats(), (3, 2, 0, 2))
+        play()  # abandons a game nobody guessed in
+        play(win=True)
+        self.assertEqual(stats(), (4, 3, 1, 2))
+
+        live = PlayerStats.objects.values_list(*STATS_FIELDS).get(key=client.session.session_key)
+        PlayerStats.objects.all().delete()
+        call_command('backfill_player_stats', stdout=StringIO())
+        self.assertEqual(PlayerStats.objects.values_list(*STATS_FIELDS).get(key=client.session.session_key), live)
+
+def past_game(session_key, days_ago, target=None, **fields):
+    """A game created ``days_ago`` days ago, finished then too if ``is_completed`` is set"""
+    target = target or get_registry().generation(1)[0]
+    game = GameSession.objects.create(session_key=session_key, target_pokemon_id=target.id, generation=1)
+    at = timezone.now() - datetime.timedelta(days=days_ago)
+    if fields.get('is_completed') and 'completed_at' not in fields:
+        fields['completed_at'] = at
+    GameSession.objects.filter(pk=game.pk).update(created_at=at, **fields)
+    game.refresh_from_db()
+    return game
+
+class RollupTests(PokedexTestCase):
+    def rollups(self):
+        return (
+            sorted(TargetDailyRollup.objects.values_list('target_pokemon_id', 'day', 'games_completed', 'games_won',
+                                                         'guesses_to_win')),
+            sorted(FirstGuessDailyRollup.objects.values_list('pokemon_id', 'day', 'times_guessed')),
+        )
+
+    def test_rebuild_matches_the_increments(self):
+        first, second, third = get_registry().generation(1)[:3]
+        games = [
+            past_game('a', 3, first, is_completed=True, is_won=True, guesses_count=2, guess_ids=[second.id, first.id]),
+            past_game('b', 3, first, is_completed=True, guesses_count=6, guess_ids=[second.id] * 6),
+            past_game('c', 2, second, is_completed=True, is_won=True, guesses_count=1, guess_ids=[second.id]),
+            past_game('d', 2, third, is_completed=True, is_won=True, guesses_count=3,
+                      guess_ids=[first.id, second.id, third.id]),
+            # Neither abandoned nor active games are rolled up
+            past_game('e', 2, third, is_completed=True, completed_at=None),
+            past_game('f', 2, third),
+        ]
+        for game in games:
+            analytics.record_completed_game(game)
+        incremental = self.rollups()
+        day = timezone.localdate(games[0].completed_at)
+        self.assertIn((first.id, day, 2, 1, 2), incremental[0])
+        self.assertIn((second.id, day, 2), incremental[1])
+
+        TargetDailyRollup.objects.update(games_completed=99)
+        FirstGuessDailyRollup.objects.all().delete()
+        call_command('rollup_games', '--all', stdout=StringIO())
+        self.assertEqual(self.rollups(), incremental)
+
+        response = Client().get('/analytics/', {'days': 7}).json()
+        by_name = {row['name']: row for row in response['targets']}
+        self.assertEqual(
+            (by_name[first.name]['games'], by_name[first.name]['solve_rate'],
+             by_name[first.name]['average_guesses_to_solve']),
+            (2, 50.0, 2.0),
+        )
+        self.assertEqual(response['first_guesses'][0], {'name': second.name, 'games': 3})
+
+    def test_today_is_never_rebuilt(self):
+        target = get_registry().generation(1)[0]
+        game = past_game('a', 0, target, is_completed=True, is_won=True, guesses_count=1, guess_ids=[target.id])
+        analytics.record_completed_game(game)
+        today = self.rollups()
+
+        with self.assertRaisesMessage(CommandError, '--until must be before today'):
+            call_command('rollup_games', '--until', timezone.localdate().isoformat(), stdout=StringIO())
+        with self.assertRaises(ValueError):
+            analytics.rebuild_rollups(timezone.localdate(), timezone.localdate())
+        # By default the latest rolled-up day, today, is clamped to yesterday
+        call_command('rollup_games', stdout=StringIO())
+        self.assertEqual(self.rollups(), today)
+
+class ArchiveTests(PokedexTestCase):
+    def test_archive_round_trip_keeps_active_games_and_aggregates(self):
+        target = get_registry().generation(1)[0]
+        other = get_registry().generation(1)[1]
+        won = past_game('abc', 100, is_completed=True, is_won=True, guesses_count=2, guess_ids=[other.id, target.id])
+        Guess.objects.bulk_create([
+            Guess(game_session=won, pokemon_id=pokemon_id, guess_number=number)
+            for number, pokemon_id in enumerate(won.guess_ids, 1)
+        ])
+        lost = past_game('abc', 100, is_completed=True, guesses_count=6, guess_ids=[other.id] * 6)
+        abandoned = past_game('abc', 100, is_completed=True, completed_at=None)
+        recent = past_game('abc', 1, is_completed=True, is_won=True, guesses_count=1, guess_ids=[target.id])
+        active = past_game('xyz', 100)
+
+        before = timezone.localdate() - datetime.timedelta(days=90)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'games.jsonl.gz')
+            record = archive_games(before, path)
+            archived = list(read_archive(path))
+
+        self.assertEqual((record.sessions, record.guesses), (3, 2))
+        self.assertCountEqual(GameSession.objects.values_list('id', flat=True), [recent.id, active.id])
+        self.assertEqual([game['id'] for game in archived], [won.id, lost.id, abandoned.id])
+        self.assertEqual(archived[0]['guess_ids'], [other.id, target.id])
+        self.assertEqual([guess['pokemon_id'] for guess in archived[0]['guesses']], [other.id, target.id])
+        self.assertEqual((archived[1]['is_won'], archived[1]['guesses_count']), (False, 6))
+        self.assertIsNone(archived[2]['completed_at'])
+
+        # The archived games are still counted
+        rollup = TargetDailyRollup.objects.get(target_pokemon_id=target.id, day=timezone.localdate(won.completed_at))
+        self.assertEqual((rollup.games_completed, rollup.games_won, rollup.guesses_to_win), (2, 1, 2))
+        stats = PlayerStats.objects.get(key='abc')
+        self.assertEqual((stats.games_played, stats.games_won), (3, 2))
+
+class PackGuessHistoryMigrationTests(TransactionTestCase):
+    before, after = '0010_gamesession_guess_ids', '0011_pack_guess_history'
+
+    def migrate(self, name):
+        executor = MigrationExecutor(connection)
+        executor.migrate([('game', name)])
+        return executor.loader.project_state([('game', name)]).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes('game'))
+
+    def test_guesses_are_packed_and_unpacked(self):
+        apps = self.migrate(self.before)
+        Pokemon = apps.get_model('game', 'Pokemon')
+        GameSession = apps.get_model('game', 'GameSession')
+        Guess = apps.get_model('game', 'Guess')
+        first, second = (
+            Pokemon.objects.create(name=name, pokedex_number=number, type1='Normal', generation=1, height=1.0,
+                                   weight=1.0, base_stat_total=300, color='Red')
+            for number, name in ((1, 'First'), (2, 'Second'))
+        )
+        played = GameSession.objects.create(session_key='a', target_pokemon=first, generation=1)
+        unplayed = GameSession.objects.create(session_key='b', target_pokemon=first, generation=1)
+        Guess.objects.create(game_session=played, pokemon=first, guess_number=2)
+        Guess.objects.create(game_session=played, pokemon=second, guess_number=1)
+
+        # Chunks of one game, so the packing crosses chunk boundaries
+        with mock.patch.object(import_module('game.migrations.0011_pack_guess_history'), 'CHUNK_SIZE', 1):
+            apps = self.migrate(self.after)
+            GameSession = apps.get_model('game', 'GameSession')
+            self.assertEqual(GameSession.objects.get(pk=played.pk).guess_ids, [second.pk, first.pk])
+            self.assertEqual(GameSession.objects.get(pk=unplayed.pk).guess_ids, [])
+
+            # A guess only in guess_ids (the log lagging behind) is logged again on the way back
+            GameSession.objects.filter(pk=unplayed.pk).update(guess_ids=[first.pk])
+            apps.get_model('game', 'Guess').objects.filter(game_session_id=played.pk, guess_number=2).delete()
+            apps = self.migrate(self.before)
+        Guess = apps.get_model('game', 'Guess')
+        self.assertEqual(
+            sorted(Guess.objects.values_list('game_session_id', 'guess_number', 'pokemon_id')),
+            [(played.pk, 1, second.pk), (played.pk, 2, first.pk), (unplayed.pk, 1, first.pk)],
+        )
+
+class FinishingGuessTests(PokedexTestCase):
+    def assert_finishing_guess_rolls_back(self, record_guess):
+        target = get_registry().generation(1)[0]
+        game = GameSession.objects.create(session_key='abc', target_pokemon_id=target.id, generation=1)
+        # As the views do: the target comes from the registry, not a lazy query
+        game.target_pokemon = target
+        with mock.patch('game.analytics.record_completed_game', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                record_guess(game, target)
+        # The stats row written before the failing rollup went with the game update
+        game.refresh_from_db()
+        self.assertEqual((game.is_completed, game.guesses_count), (False, 0))
+        self.assertFalse(PlayerStats.objects.exists())
+
+    def test_finishing_guess_is_atomic(self):
+        self.assert_finishing_guess_rolls_back(lambda game, pokemon: game.record_guess(pokemon))
+
+    def test_async_finishing_guess_is_atomic(self):
+        self.assert_finishing_guess_rolls_back(lambda game, pokemon: async_to_sync(game.arecord_guess)(pokemon))
+
+class GuessValidationTests(PokedexTestCase):
+    bodies = {
+        '[1, 2]': 'Invalid JSON',
+        '"Pikachu"': 'Invalid JSON',
+        '{"pokemon_name": 5}': 'Pokemon name required',
+        '{"pokemon_name": ["Pikachu"]}': 'Pokemon name required',
+        '{"pokemon_name": "  "}': 'Pokemon name required',
+    }
+
+    def test_malformed_guesses_are_rejected(self):
+        factory = RequestFactory()
+        for view in (views.make_guess, async_to_sync(async_views.make_guess)):
+            for body, error in self.bodies.items():
+                with self.subTest(view=view, body=body):
+                    response = view(factory.post('/guess/', body, content_type='application/json'))
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(json.loads(response.content), {'error': error})
+
+@override_settings(GAME_STATE_MODE='token', GAME_TOKEN_SUMMARY_WRITE=True)
+class TokenGameTests(PokedexTestCase):
+    def guess(self, client, token, pokemon_name):
+        return client.post(
+            '/guess/', json.dumps({'pokemon_name': pokemon_name, 'game_token': token}),
+            content_type='application/json',
+        )
+
+    def test_tampered_token_is_rejected(self):
+        client = Client()
+        token = client.post('/new-game/').json()['game_token']
+        tampered = token[:-1] + ('A' if token[-1] != 'A' else 'B')
+        response = self.guess(client, tampered, 'Pikachu')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Invalid game token'})
+        self.assertFalse(GameSession.objects.exists())
+
+    def test_finished_game_is_summarised_once(self):
+        client = Client()
+        token = client.post('/new-game/').json()['game_token']
+        target = TokenGame.from_token(token, get_registry()).target_pokemon
+        wrong = next(p for p in get_registry().generation(1) if p.id != target.id)
+        token = self.guess(client, token, wrong.name).json()['game_token']
+        # No database writes until the game ends
+        self.assertFalse(GameSession.objects.exists())
+
+        for _ in range(2):  # the second request replays the same token
+            response = self.guess(client, token, target.name)
+            self.assertEqual(response.status_code, 200)
+        game = GameSession.objects.get()
+        self.assertTrue(game.session_key.startswith('token:'))
+        self.assertEqual(
+            (game.target_pokemon_id, game.is_completed, game.is_won, game.guesses_count, game.guess_ids),
+            (target.id, True, True, 2, [wrong.id, target.id]),
+        )
+        self.assertIsNotNone(game.completed_at)
+        self.assertEqual(TargetDailyRollup.objects.get(target_pokemon=target).games_completed, 1)
+
+class GameSessionIndexTests(PokedexTestCase):
+    def test_finished_games_lookup_uses_session_index(self):
+        plan = GameSession.objects.filter(session_key='abc', is_completed=True).explain()
+        self.assertIn('game_session_key_idx', plan)
+
+    def test_active_game_lookup_uses_partial_unique_index(self):
+        plan = GameSession.objects.filter(session_key='abc', is_completed=False).explain()
+        self.assertIn('one_active_game_per_session', plan)
+
+    def test_second_active_game_per_session_is_rejected(self):
+        target = get_registry().generation(1)[0]
+        GameSession.objects.create(session_key='abc', target_pokemon_id=target.id, generation=1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            GameSession.objects.create(session_key='abc', target_pokemon_id=target.id, generation=1)
+        # Finished games do not count
+        GameSession.objects.create(session_key='abc', target_pokemon_id=target.id, generation=1, is_completed=True)
+
+    def test_new_game_ends_previous_game_only_if_the_new_one_is_created(self):
+        target = get_registry().generation(1)[0]
+        game = GameSession.objects.create(session_key='abc', target_pokemon_id=target.id, generation=1)
+        with mock.patch.object(GameSession.objects, 'create', side_effect=IntegrityError):
+            replace_active_game('abc', None, target, None)
+        game.refresh_from_db()
+        self.assertFalse(game.is_completed)
+
+        replace_active_game('abc', None, target, None)
+        game.refresh_from_db()
+        self.assertTrue(game.is_completed)
+        self.assertEqual(GameSession.objects.filter(session_key='abc', is_completed=False).count(), 1)
+
+
+@override_settings(SESSION_ENGINE='game.sessions')
+class IdentitySessionGameTests(PokedexTestCase):
+    def test_new_game_keeps_identity_key(self):
+        client = Client()
+        client.post('/new-game/')
+        key = client.cookies['sessionid'].value
+        self.assertTrue(GameSession.objects.filter(session_key=key, is_completed=False).exists())
+
+        client.get('/game-state/')
+        self.assertEqual(client.cookies['sessionid'].value, key)
+        self.assertEqual(GameSession.objects.filter(session_key=key).count(), 1)
+        self.assertFalse(Session.objects.exists())
+        # The shuffle bag went to its own cookie instead of the session
+        self.assertIn('target_bag', client.cookies)
+
+    def test_bag_does_not_repeat_targets(self):
+        client = Client()
+        targets = []
+        for _ in range(20):
+            client.post('/new-game/')
+            key = client.cookies['sessionid'].value
+            targets.append(GameSession.objects.get(session_key=key, is_completed=False).target_pokemon_id)
+        self.assertEqual(len(set(targets)), len(targets))
+
+
+class IdentitySessionStoreTests(TestCase):
+    def test_new_session_gets_identity_key_without_row(self):
+        session = SessionStore()
+        session.save()
+        self.assertTrue(is_identity_key(session.session_key))
+        self.assertFalse(Session.objects.exists())
+
+    def test_forged_identity_key_is_dropped(self):
+        self.assertIsNone(SessionStore(session_key='p' + 'a' * 39).session_key)
+
+    def test_data_moves_identity_session_to_stored_session(self):
+        session = SessionStore()
+        session.create()
+        session['x'] = 1
+        session.save()
+        self.assertFalse(is_identity_key(session.session_key))
+        self.assertEqual(SessionStore(session_key=session.session_key).load(), {'x': 1})
+
+    def test_stored_key_starting_with_identity_prefix_keeps_data(self):
+        # Stock keys are [a-z0-9]{32}: about 1 in 36 starts with the identity prefix
+        key = 'p' + 'a' * 31
+        session = SessionStore()
+        session.create()
+        session['x'] = 1
+        with mock.patch.object(SessionStore, '_get_new_session_key', return_value=key):
+            session.save()
+        self.assertEqual(session.session_key, key)
+        self.assertEqual(SessionStore(session_key=key).load(), {'x': 1})
+
+
+def png_bytes(rgb):
+    """A 1x1 PNG of one colour"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0)),
+        chunk(b'IDAT', zlib.compress(b'\x00' + bytes(rgb))),
+        chunk(b'IEND', b''),
+    ])
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves ``server.fixtures[path]`` and records every requested path"""
+
+    def do_GET(self):
+        self.server.requested.append(self.path)
+        body = self.server.fixtures.get(self.path)
+        self.send_response(200 if body else 404)
+        self.send_header('Content-Length', str(len(body or b'')))
+        self.end_headers()
+        self.wfile.write(body or b'')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServerTestCase(PokedexTestCase):
+    """Serves ``responses`` (URL path -> bytes) from a local HTTP server, with a temporary image store"""
+
+    responses = {}
+
+    def setUp(self):
+        super().setUp()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        self.server.fixtures = dict(self.responses)
+        self.server.requested = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}'
+
+        image_root = tempfile.TemporaryDirectory()
+        self.addCleanup(image_root.cleanup)
+        self.root = image_root.name
+        settings_override = override_settings(POKEMON_IMAGE_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class CachePokemonImagesTests(FixtureServerTestCase):
+    responses = {'/1.png': png_bytes((255, 0, 0)), '/2.png': png_bytes((0, 0, 255))}
+
+    def setUp(self):
+        super().setUp()
+        Pokemon.objects.exclude(pokedex_number__in=[1, 2]).update(image_url='', sprite_url='')
+        for number in (1, 2):
+            Pokemon.objects.filter(pokedex_number=number).update(image_url=f'{self.base_url}/{number}.png')
+
+    def test_stores_images_under_content_hash_and_skips_on_rerun(self):
+        call_command('cache_pokemon_images', '--workers', '2', stdout=StringIO())
+
+        for number in (1, 2):
+            pokemon = Pokemon.objects.get(pokedex_number=number)
+            digest = hashlib.sha256(self.server.fixtures[f'/{number}.png']).hexdigest()
+            self.assertEqual(pokemon.local_images['source'], pokemon.image_url)
+            self.assertEqual(pokemon.local_images['original'], f'original/{digest}.png')
+            self.assertEqual(pokemon.get_icon_image(), f'{settings.POKEMON_IMAGE_URL}sm/{digest}.webp')
+            self.assertEqual(set(pokemon.local_images), {'source', 'original', *settings.POKEMON_IMAGE_SIZES})
+            for name, path in pokemon.local_images.items():
+                if name != 'source':
+                    self.assertTrue(path.endswith(digest + os.path.splitext(path)[1]))
+                    self.assertTrue(os.path.isfile(os.path.join(self.root, path)))
+            with open(os.path.join(self.root, pokemon.local_images['original']), 'rb') as original:
+                self.assertEqual(original.read(), self.server.fixtures[f'/{number}.png'])
+        self.assertCountEqual(self.server.requested, ['/1.png', '/2.png'])
+
+        out = StringIO()
+        call_command('cache_pokemon_images', stdout=out)
+        self.assertIn('Caching images for 0 Pokemon', out.getvalue())
+        self.assertEqual(len(self.server.requested), 2)
+
+    def test_missing_pillow_stops_unless_originals_only(self):
+        with mock.patch('game.images.Image', None):
+            with self.assertRaisesMessage(CommandError, 'requires Pillow'):
+                call_command('cache_pokemon_images', stdout=StringIO())
+            self.assertEqual(self.server.requested, [])
+
+            call_command('cache_pokemon_images', '--originals-only', stdout=StringIO())
+        pokemon = Pokemon.objects.get(pokedex_number=1)
+        self.assertEqual(set(pokemon.local_images), {'source', 'original'})
+
+
+def pokeapi_responses(pokemon_list):
+    """PokéAPI /pokemon/<n> and /pokemon-species/<n> bodies describing ``pokemon_list``"""
+    responses = {}
+    for p in pokemon_list:
+        types = [p.type1] + ([p.type2] if p.type2 else [])
+        responses[f'/pokemon/{p.pokedex_number}'] = json.dumps({
+            'id': p.pokedex_number,
+            'name': p.name.lower(),
+            'types': [{'slot': slot, 'type': {'name': name.lower()}} for slot, name in enumerate(types, 1)],
+            'height': round(p.height * 10),
+            'weight': round(p.weight * 10),
+            'stats': [{'base_stat': p.base_stat_total}],
+            'sprites': {'front_default': p.sprite_url, 'other': {'official-artwork': {'front_default': p.image_url}}},
+        }).encode()
+        responses[f'/pokemon-species/{p.pokedex_number}'] = json.dumps({
+            'is_legendary': p.is_legendary,
+            'color': {'name': p.color.lower()},
+            'habitat': {'name': p.habitat.lower()} if p.habitat else None,
+        }).encode()
+    return responses
+
+
+class PopulatePokemonTests(FixtureServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.server.fixtures.update(pokeapi_responses(get_registry().generation(1)))
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = cache_dir.name
+
+    def populate(self, *args):
+        out = StringIO()
+        call_command(
+            'populate_pokemon', '--base-url', self.base_url, '--cache-dir', self.cache_dir, *args, stdout=out
+        )
+        return out.getvalue()
+
+    def test_resumes_from_checkpoint_after_failure(self):
+        mewtwo = self.server.fixtures.pop('/pokemon/150')
+        with self.assertRaisesMessage(CommandError, '1 Pokemon could not be fetched (150)'):
+            self.populate()
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, 'populate_checkpoint.json')))
+
+        self.server.fixtures['/pokemon/150'] = mewtwo
+        self.server.requested.clear()
+        Pokemon.objects.filter(pokedex_number=25).update(weight=1)
+        self.assertIn('1 to fetch, 150 already checkpointed', self.populate())
+        self.assertEqual(self.server.requested, ['/pokemon/150', '/pokemon-species/150'])
+        self.assertEqual(Pokemon.objects.get(pokedex_number=25).weight, 6)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'populate_checkpoint.json')))
+
+    def test_rerun_is_served_from_cache_and_force_refetches(self):
+        self.populate()
+        self.assertEqual(len(self.server.requested), 302)
+
+        # A changed API response is not seen until --force
+        body = json.loads(self.server.fixtures['/pokemon/25'])
+        self.server.fixtures['/pokemon/25'] = json.dumps(dict(body, weight=70)).encode()
+        self.assertIn('(0 requests, 302 cache hits)', self.populate())
+        self.assertEqual(len(self.server.requested), 302)
+        self.assertEqual(Pokemon.objects.get(pokedex_number=25).weight, 6)
+
+        self.assertIn('(302 requests, 0 cache hits)', self.populate('--force'))
+        self.assertEqual(len(self.server.requested), 604)
+        self.assertEqual(Pokemon.objects.get(pokedex_number=25).weight, 7)
+
+class UpdatePokemonImagesTests(FixtureServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.server.fixtures.update(pokeapi_responses(get_registry().generation(1)))
+
+    def update_images(self, *args):
+        out = StringIO()
+        with mock.patch.object(QuerySet, 'bulk_update', autospec=True, side_effect=QuerySet.bulk_update) as bulk_update:
+            call_command('update_pokemon_images', '--base-url', self.base_url, *args, stdout=out)
+        written = [pokemon.pokedex_number for call in bulk_update.call_args_list for pokemon in call.args[1]]
+        return out.getvalue(), sorted(written)
+
+    def test_fetches_only_pokemon_missing_images(self):
+        Pokemon.objects.filter(pokedex_number__in=[4, 7]).update(image_url='')
+        out, written = self.update_images()
+        self.assertCountEqual(self.server.requested, ['/pokemon/4', '/pokemon/7'])
+        self.assertEqual(written, [4, 7])
+        self.assertIn('Successfully updated 2 Pokemon images', out)
+        self.assertFalse(Pokemon.objects.filter(image_url='').exists())
+
+    def test_force_writes_only_changed_urls(self):
+        body = json.loads(self.server.fixtures['/pokemon/25'])
+        body['sprites']['front_default'] = 'https://example.com/pikachu.png'
+        self.server.fixtures['/pokemon/25'] = json.dumps(body).encode()
+
+        out, written = self.update_images('--force')
+        self.assertEqual(len(self.server.requested), 151)
+        self.assertEqual(written, [25])
+        self.assertEqual(Pokemon.objects.get(pokedex_number=25).sprite_url, 'https://example.com/pikachu.png')
+
+        # Nothing differs any more, so nothing is written
+        out, written = self.update_images('--force')
+        self.assertEqual(written, [])
+        self.assertIn('Successfully updated 0 Pokemon images', out)
+
+class BuildSpriteAtlasTests(FixtureServerTestCase):
+    responses = {f'/sprites/{n}.png': png_bytes((n * 80, 0, 0)) for n in (1, 2, 3)}
+
+    def setUp(self):
+        super().setUp()
+        Pokemon.objects.exclude(pokedex_number__in=[1, 2, 3]).update(image_url='', sprite_url='')
+        for number in (1, 2, 3):
+            Pokemon.objects.filter(pokedex_number=number).update(sprite_url=f'{self.base_url}/sprites/{number}.png')
+
+    def test_packs_sprites_into_grid_and_skips_unchanged_set(self):
+        call_command('build_sprite_atlas', '--generation', '1', '--cell', '16', stdout=StringIO())
+
+        manifest = atlas.read_atlas(1)
+        # Three sprites fill a 2x2 grid row by row
+        self.assertEqual(manifest['offsets'], {'1': [0, 0], '2': [16, 0], '3': [0, 16]})
+        self.assertEqual((manifest['cell'], manifest['width'], manifest['height']), (16, 32, 32))
+        self.assertTrue(manifest['complete'])
+        self.assertEqual(manifest['url'], settings.POKEMON_IMAGE_URL + manifest['file'])
+        with images.Image.open(os.path.join(self.root, manifest['file'])) as sheet:
+            self.assertEqual(sheet.size, (32, 32))
+            # Sprites are only ever shrunk, so each 1x1 sprite sits in the middle of its cell
+            self.assertEqual(sheet.convert('RGBA').getpixel((16 + 7, 0 + 7)), (160, 0, 0, 255))
+
+        out = StringIO()
+        call_command('build_sprite_atlas', '--generation', '1', '--cell', '16', stdout=out)
+        self.assertIn('is up to date', out.getvalue())
+        self.assertEqual(len(self.server.requested), 3)
+
+class ImageStoreHeaderTests(TestCase):
+    def test_only_content_hashed_files_are_immutable(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(POKEMON_IMAGE_ROOT=root):
+            hashed = f'original/{hashlib.sha256(b"x").hexdigest()}.png'
+            for name in (hashed, 'atlas/gen1.json'):
+                os.makedirs(os.path.dirname(os.path.join(root, name)), exist_ok=True)
+                with open(os.path.join(root, name), 'wb') as stored:
+                    stored.write(b'x')
+            client = Client()
+            hashed_response = client.get(settings.POKEMON_IMAGE_URL + hashed)
+            manifest_response = client.get(settings.POKEMON_IMAGE_URL + 'atlas/gen1.json')
+        self.assertIn('immutable', hashed_response['Cache-Control'])
+        self.assertEqual(manifest_response['Cache-Control'], 'no-cache')
+
+class MetricsTests(TestCase):
+    def snapshot(self, requests, **view):
+        return {'pid': 1, 'requests': requests, 'views': {'game:make_guess': dict(metrics.empty_view(), **view)}}
+
+    def test_merge_sums_worker_snapshots(self):
+        first = self.snapshot(
+            [['game:make_guess', 'POST', 200, 3]],
+            buckets=[1, 2] + [0] * 10, seconds=0.5, count=3, queries=6, db_seconds=0.1, bytes=300,
+        )
+        second = self.snapshot(
+            [['game:make_guess', 'POST', 200, 2], ['game:make_guess', 'POST', 400, 1]],
+            buckets=[0, 1] + [0] * 9 + [2], seconds=1.5, count=3, queries=5, db_seconds=0.2, bytes=100,
+        )
+        merged = metrics.merge([first, second])
+        self.assertCountEqual(
+            merged['requests'], [['game:make_guess', 'POST', 200, 5], ['game:make_guess', 'POST', 400, 1]]
+        )
+        totals = merged['views']['game:make_guess']
+        self.assertEqual(totals['buckets'], [1, 3] + [0] * 9 + [2])
+        self.assertEqual(
+            (totals['count'], totals['queries'], totals['bytes']), (6, 11, 400)
+        )
+        self.assertAlmostEqual(totals['seconds'], 2.0)
+        self.assertAlmostEqual(totals['db_seconds'], 0.3)
+
+    @override_settings(METRICS_FLUSH_INTERVAL=0)
+    def test_requests_leave_snapshots_to_the_flush_thread(self):
+        with mock.patch.object(metrics.WorkerMetrics, 'flush') as flush, \
+                mock.patch('game.metrics._ensure_flusher') as ensure_flusher:
+            Client().get('/no-such-page/')
+        flush.assert_not_called()
+        ensure_flusher.assert_called()
+
+    def test_metrics_need_token_outside_debug(self):
+        with tempfile.TemporaryDirectory() as metrics_dir, override_settings(METRICS_DIR=metrics_dir):
+            with override_settings(METRICS_TOKEN=''):
+                self.assertEqual(Client().get('/metrics').status_code, 403)
+            with override_settings(METRICS_TOKEN='secret'):
+                self.assertEqual(Client().get('/metrics').status_code, 401)
+                response = Client().get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'pokeguess_requests_total', response.content)
+
+class SessionCacheTests(TestCase):
+    def test_session_deleted_in_another_process_is_not_served_from_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            caches = dict(settings.CACHES, sessions=dict(settings.CACHES['sessions'], LOCATION=cache_dir))
+            with override_settings(CACHES=caches):
+                session = SessionStore()
+                session.create()
+                session['x'] = 1
+                session.save()
+                key = session.session_key
+                self.assertEqual(SessionStore(session_key=key).load(), {'x': 1})
+
+                # Another worker logs the session out: its row and cache entry go
+                Session.objects.filter(session_key=key).delete()
+                subprocess.run(
+                    [sys.executable, 'manage.py', 'shell', '-c',
+                     'from django.contrib.sessions.backends.cached_db import KEY_PREFIX; '
+                     'from django.core.cache import caches; '
+                     f'caches[{settings.SESSION_CACHE_ALIAS!r}].delete(KEY_PREFIX + {key!r})'],
+                    cwd=Path(settings.BASE_DIR),
+                    env=dict(os.environ, SESSION_CACHE_DIR=cache_dir),
+                    check=True,
+                )
+                self.assertEqual(SessionStore(session_key=key).load(), {})
+
+
+class RegistryVersionTests(PokedexTestCase):
+    def test_invalidation_in_another_process_reloads_registry(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            caches = dict(settings.CACHES, pokedex=dict(settings.CACHES['pokedex'], LOCATION=cache_dir))
+            with override_settings(CACHES=caches, POKEDEX_VERSION_CHECK_INTERVAL=0):
+                invalidate_registry()
+                registry = get_registry()
+                self.assertIs(get_registry(), registry)
+
+                # What a management command run next to the workers does
+                subprocess.run(
+                    [sys.executable, 'manage.py', 'shell', '-c',
+                     'from game.registry import invalidate_registry; invalidate_registry()'],
+                    cwd=Path(settings.BASE_DIR),
+                    env=dict(os.environ, POKEDEX_CACHE_DIR=cache_dir),
+                    check=True,
+                )
+                self.assertIsNot(get_registry(), registry)
+
+    def test_stamp_is_read_at_most_once_per_interval(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            caches = dict(settings.CACHES, pokedex=dict(settings.CACHES['pokedex'], LOCATION=cache_dir))
+            with override_settings(CACHES=caches, POKEDEX_VERSION_CHECK_INTERVAL=60):
+                invalidate_registry()
+                registry = get_registry()
+                with mock.patch.object(registry_module, '_version_cache') as version_cache:
+                    for _ in range(3):
+                        self.assertIs(get_registry(), registry)
+                        self.assertIs(async_to_sync(aget_registry)(), registry)
+                version_cache.assert_not_called()
+
+                # Another process publishes a new stamp: picked up once the interval is over
+                registry_module._version_cache().set(registry_module.VERSION_CACHE_KEY, 'elsewhere', timeout=None)
+                self.assertIs(get_registry(), registry)
+                with mock.patch.object(registry_module, '_checked_at', registry_module._checked_at - 61):
+                    reloaded = get_registry()
+                self.assertIsNot(reloaded, registry)
+                self.assertEqual(reloaded.version, 'elsewhere')
@@ -0,0 +1,148 @@
+"""
+Stateless game mode: the whole game lives in a signed token.
+
+With ``GAME_STATE_MODE = 'token'`` the views never read or write the database
+while a game is being played. The client receives a compact token from every
+game endpoint and sends it back with the next request; the signature stops
+tampering and the target id is masked with a keyed HMAC so it can't be read
+out of the token. With ``GAME_TOKEN_SUMMARY_WRITE`` on, the finishing guess
+writes a summary ``GameSession`` row, keyed ``token:<game id>`` so that a
+replayed final token cannot record the game twice.
+"""
+
+import datetime
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.utils.crypto import salted_hmac
+
+from .guess_log import log_guesses
+from .models import GameStateMixin, GameSession
+
+TOKEN_SALT = 'game.tokens'
+TOKEN_VERSION = 1
+
+COMPLETED = 1
+WON = 2
+
+
+def _target_mask(game_id):
+    digest = salted_hmac(f'{TOKEN_SALT}.target', game_id).digest()
+    return int.from_bytes(digest[:4], 'big')
+
+
+class TokenGame(GameStateMixin):
+    """A game whose state is carried by the client instead of a GameSession row"""
+
+    def __init__(self, game_id, target_pokemon, generation=1, max_guesses=6,
+                 guess_ids=(), is_completed=False, is_won=False, puzzle_date=None):
+        self.game_id = game_id
+        self.target_pokemon = target_pokemon
+        self.generation = generation
+        self.puzzle_date = puzzle_date
+        self.max_guesses = max_guesses
+        self.guess_ids = list(guess_ids)
+        self.is_completed = is_completed
+        self.is_won = is_won
+        self.completed_at = None
+
+    @classmethod
+    def start(cls, target_pokemon, generation=1, puzzle_date=None):
+        return cls(secrets.token_urlsafe(9), target_pokemon, generation, puzzle_date=puzzle_date)
+
+    @classmethod
+    def from_token(cls, token, registry):
+        """Verify and decode a token; raises ``signing.BadSignature`` if invalid"""
+        try:
+            version, game_id, masked_target, generation, max_guesses, guess_ids, flags, puzzle = signing.loads(
+                token, salt=TOKEN_SALT
+            )
+            target_pokemon = registry.get(masked_target ^ _target_mask(game_id))
+            puzzle_date = datetime.date.fromordinal(puzzle) if puzzle else None
+        except (TypeError, ValueError):
+            raise signing.BadSignature('Malformed game token')
+        if version != TOKEN_VERSION or target_pokemon is None:
+            raise signing.BadSignature('Unknown game token')
+        return cls(
+            game_id, target_pokemon, generation, max_guesses, guess_ids,
+            is_completed=bool(flags & COMPLETED), is_won=bool(flags & WON), puzzle_date=puzzle_date
+        )
+
+    def to_token(self):
+        flags = (COMPLETED if self.is_completed else 0) | (WON if self.is_won else 0)
+        return signing.dumps(
+            [TOKEN_VERSION, self.game_id, self.target_pokemon.id ^ _target_mask(self.game_id),
+             self.generation, self.max_guesses, self.guess_ids, flags,
+             self.puzzle_date.toordinal() if self.puzzle_date else 0],
+            salt=TOKEN_SALT,
+            compress=True,
+        )
+
+    @property
+    def guesses_count(self):
+        return len(self.guess_ids)
+
+    def guessed_pokemon_ids(self):
+        return list(self.guess_ids)
+
+    def has_guessed(self, pokemon):
+        return pokemon.id in self.guess_ids
+
+    def add_guess(self, pokemon):
+        """Add a guess to the token state; returns True if it was correct"""
+        self.guess_ids.append(pokemon.id)
+        return self.apply_guess_outcome(pokemon)
+
+    def needs_summary(self):
+        return self.is_completed and getattr(settings, 'GAME_TOKEN_SUMMARY_WRITE', False)
+
+    def record_guess(self, pokemon):
+        """Add a guess, writing the summary if it finished the game; returns True if it was correct"""
+        is_correct = self.add_guess(pokemon)
+        if self.needs_summary():
+            write_summary(self)
+        return is_correct
+
+    # Token games only touch the database for the summary, so the rest of the async API is the sync one
+    async def aguessed_pokemon_ids(self):
+        return self.guessed_pokemon_ids()
+
+    async def ahas_guessed(self, pokemon):
+        return self.has_guessed(pokemon)
+
+    async def arecord_guess(self, pokemon):
+        """Async version of record_guess()"""
+        is_correct = self.add_guess(pokemon)
+        if self.needs_summary():
+            await sync_to_async(write_summary)(self)
+        return is_correct
+
+
+def write_summary(game):
+    """Persist a finished token game as a completed GameSession with its guesses
+
+    The row, the stats and the rollups commit together. A replayed final token
+    finds the row (one_summary_per_token_game) and records nothing.
+    """
+    with transaction.atomic():
+        game_session, created = GameSession.objects.get_or_create(
+            session_key=f'token:{game.game_id}',
+            defaults={
+                'target_pokemon': game.target_pokemon,
+                'generation': game.generation,
+                'is_completed': True,
+                'is_won': game.is_won,
+                'guesses_count': game.guesses_count,
+                'max_guesses': game.max_guesses,
+                'completed_at': game.completed_at,
+                'puzzle_date': game.puzzle_date,
+                'guess_ids': game.guess_ids,
+            },
+        )
+        if not created:
+            return
+        game_session.send_completed()
+        transaction.on_commit(lambda: log_guesses(game_session.id, game.guess_ids))
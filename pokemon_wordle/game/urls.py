@@ -1,11 +1,25 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# The hot endpoints have async versions for ASGI deployments
+if getattr(settings, 'GAME_ASYNC_VIEWS', False):
+    from . import async_views as game_views
+else:
+    game_views = views
+
 app_name = 'game'
 urlpatterns = [
     path('', views.index, name='index'),
-    path('new-game/', views.new_game, name='new_game'),
-    path('pokemon-list/', views.get_pokemon_list, name='pokemon_list'),
-    path('guess/', views.make_guess, name='make_guess'),
-    path('game-state/', views.get_game_state, name='game_state'),
+    path('new-game/', game_views.new_game, name='new_game'),
+    path('pokemon-list/', game_views.get_pokemon_list, name='pokemon_list'),
+    path('pokemon-search/', views.search_pokemon, name='pokemon_search'),
+    path('guess/', game_views.make_guess, name='make_guess'),
+    path('game-state/', game_views.get_game_state, name='game_state'),
+    path('candidates/', game_views.get_candidates, name='candidates'),
+    path('daily/', views.get_daily_info, name='daily'),
+    path('stats/', views.get_game_stats, name='stats'),
+    path('analytics/', views.get_pokemon_analytics, name='analytics'),
+    path('openers/', views.get_openers, name='openers'),
+    path('metrics', views.get_metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -1,11 +1,31 @@
+from django.conf import settings
+from django.core import signing
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.sessions.models import Session
+from django.db import IntegrityError, transaction
 from django.db.models import Q
-from .models import Pokemon, GameSession, Guess
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from .models import GameSession, PlayerStats
+from .analytics import first_guess_summary, target_summary
+from . import metrics
+from .candidates import remaining_candidates
+from .comparison import build_compact_guess_result, build_guess_result
+from .daily import get_daily_puzzle, seconds_until_next_puzzle
+from .payloads import build_pokemon_list, pokemon_list_cache_control
+from .registry import get_registry
+from .search import get_search_index
+from .solver import get_opening_book
+from .stats import record_completed_game, request_stats_key, request_user_id, stats_payload
+from .targets import TIERS, bag_store, pick_target
+from .tokens import TokenGame
+from datetime import timedelta
 import json
-import random
+
+# Accept header value (or ?format=compact) for compact guess results
+COMPACT_MEDIA_TYPE = 'application/vnd.pokeguess.compact+json'
 
 def get_or_create_session(request):
     """Get or create a game session"""
@@ -13,6 +33,7 @@ def get_or_create_session(request):
         request.session.create()
     
     session_key = request.session.session_key
+    registry = get_registry()
     
     # Check if there's an active game
     try:
@@ -20,266 +41,330 @@ def get_or_create_session(request):
             session_key=session_key,
             is_completed=False
         )
+        # Attach the target from the registry instead of lazily querying it
+        game_session.target_pokemon = registry.get(game_session.target_pokemon_id)
     except GameSession.DoesNotExist:
-        # Create new game with random Gen 1 Pokemon
-        gen1_pokemon = Pokemon.objects.filter(generation=1)
-        target_pokemon = random.choice(gen1_pokemon)
+        # Create new game with the next Gen 1 Pokemon from the player's shuffle bag
+        target_pokemon = pick_target(registry, bag_store(request))
         
-        game_session = GameSession.objects.create(
-            session_key=session_key,
-            target_pokemon=target_pokemon,
-            generation=1
-        )
+        try:
+            with transaction.atomic():
+                game_session = GameSession.objects.create(
+                    session_key=session_key,
+                    user_id=request_user_id(request),
+                    target_pokemon=target_pokemon,
+                    generation=1
+                )
+        except IntegrityError:
+            # A concurrent request created the active game first (one_active_game_per_session)
+            game_session = GameSession.objects.get(session_key=session_key, is_completed=False)
+            game_session.target_pokemon = registry.get(game_session.target_pokemon_id)
     
     return game_session
 
+def uses_game_tokens():
+    """True when games are carried in signed tokens instead of GameSession rows"""
+    return getattr(settings, 'GAME_STATE_MODE', 'db') == 'token'
+
+def requested_option(request, name):
+    """A new-game option from the query string or the JSON body"""
+    value = request.GET.get(name)
+    if not value and request.body:
+        try:
+            value = json.loads(request.body).get(name)
+        except (json.JSONDecodeError, AttributeError):
+            value = None
+    return value
+
+def requested_game_mode(request):
+    """'daily' for the shared daily puzzle, otherwise None for a random target"""
+    return 'daily' if requested_option(request, 'mode') == 'daily' else None
+
+def requested_difficulty(request):
+    """'easy', 'normal' or 'hard' to limit random targets to a tier, otherwise None"""
+    difficulty = requested_option(request, 'difficulty')
+    return difficulty if difficulty in TIERS else None
+
+def choose_target(registry, mode=None, session=None, difficulty=None):
+    """Target Pokemon and puzzle date for a new game"""
+    if mode == 'daily':
+        puzzle = get_daily_puzzle(registry)
+        return puzzle.target, puzzle.day
+    return pick_target(registry, session, tier=difficulty), None
+
+def get_current_game(request, token=None, mode=None, difficulty=None):
+    """Get the player's current game in whichever mode is configured"""
+    if not uses_game_tokens():
+        return get_or_create_session(request)
+    registry = get_registry()
+    if token:
+        return TokenGame.from_token(token, registry)
+    # Token games keep no server-side state, so their targets are drawn uniformly
+    target_pokemon, puzzle_date = choose_target(registry, mode, difficulty=difficulty)
+    return TokenGame.start(target_pokemon, puzzle_date=puzzle_date)
+
+def game_response(game, data):
+    """Attach the updated game token to a response in token mode"""
+    if isinstance(game, TokenGame):
+        data['game_token'] = game.to_token()
+    return JsonResponse(data)
+
+def wants_compact(request, data=None):
+    """True when the client asked for compact guess results"""
+    requested = request.GET.get('format') or (data or {}).get('format')
+    return requested == 'compact' or COMPACT_MEDIA_TYPE in request.headers.get('Accept', '')
+
+def results_response(game, data, compact):
+    """game_response for a payload of guess results, labelled with its format"""
+    if compact:
+        data['format'] = 'compact'
+    response = game_response(game, data)
+    if compact:
+        response['Content-Type'] = COMPACT_MEDIA_TYPE
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+def get_guess_result(registry, game, guessed_pokemon, compact=False):
+    """Comparison result for one guess; daily puzzles share results between players"""
+    if compact:
+        return build_compact_guess_result(registry.comparison, guessed_pokemon, game.target_pokemon)
+    if game.puzzle_date:
+        puzzle = get_daily_puzzle(registry, game.puzzle_date, game.generation)
+        return puzzle.guess_result(guessed_pokemon)
+    return build_guess_result(registry.comparison, guessed_pokemon, game.target_pokemon)
+
+def get_answer_reveal(registry, game):
+    """Target name and image shown once a game is over"""
+    if game.puzzle_date:
+        return get_daily_puzzle(registry, game.puzzle_date, game.generation).reveal
+    return {
+        'target_pokemon': game.target_pokemon.name,
+        'target_image': game.target_pokemon.get_display_image('lg'),
+    }
+
+def get_guess_history(registry, game, pokemon_ids, compact=False):
+    """Comparison results for every guessed Pokemon id of a game, in order"""
+    return [get_guess_result(registry, game, registry.get(pokemon_id), compact) for pokemon_id in pokemon_ids]
+
+def parse_guess(request):
+    """Read a guess request body; returns (data, pokemon_name, error_response)"""
+    if request.method != 'POST':
+        return None, None, JsonResponse({'error': 'Only POST allowed'}, status=405)
+    
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return None, None, JsonResponse({'error': 'Invalid JSON'}, status=400)
+    if not isinstance(data, dict):
+        return None, None, JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    pokemon_name = data.get('pokemon_name', '')
+    if not isinstance(pokemon_name, str) or not pokemon_name.strip():
+        return None, None, JsonResponse({'error': 'Pokemon name required'}, status=400)
+    
+    return data, pokemon_name.strip().title(), None
+
+def resolve_guess(registry, game, pokemon_name):
+    """Validate a guess against the game; returns (guessed_pokemon, error_response)"""
+    if game.is_completed:
+        return None, JsonResponse({'error': 'Game already completed'}, status=400)
+    
+    if game.guesses_count >= game.max_guesses:
+        return None, JsonResponse({'error': 'Max guesses reached'}, status=400)
+    
+    # Find the guessed Pokemon
+    guessed_pokemon = get_search_index(registry, 1).resolve(pokemon_name)
+    if guessed_pokemon is None:
+        return None, JsonResponse({'error': 'Pokemon not found in Gen 1'}, status=400)
+    
+    return guessed_pokemon, None
+
+def guess_response(registry, game, guessed_pokemon, is_correct, compact=False):
+    """Response for a recorded guess"""
+    # Build comparison result with images
+    result = get_guess_result(registry, game, guessed_pokemon, compact)
+    
+    response_data = {
+        'result': result,
+        'is_correct': is_correct,
+        'game_over': game.is_completed,
+        'guesses_remaining': game.max_guesses - game.guesses_count,
+        'target_pokemon': None,
+        'target_image': None
+    }
+    if game.is_completed and not is_correct:
+        response_data.update(get_answer_reveal(registry, game))
+    
+    return results_response(game, response_data, compact)
+
+def game_state_response(registry, game, pokemon_ids, compact=False):
+    """Response describing the whole game so far"""
+    data = {
+        'guesses': get_guess_history(registry, game, pokemon_ids, compact),
+        'guesses_remaining': game.max_guesses - game.guesses_count,
+        'is_completed': game.is_completed,
+        'is_won': game.is_won,
+        'target_pokemon': None,
+        'target_image': None,
+        'completion_rate': game.get_completion_rate(),
+        'daily': game.puzzle_date.isoformat() if game.puzzle_date else None
+    }
+    if game.is_completed:
+        data.update(get_answer_reveal(registry, game))
+    return results_response(game, data, compact)
+
+def candidates_response(registry, game, pokemon_ids, include_list=False):
+    """How many Pokemon still fit the game's feedback, with a suggested next guess"""
+    index, candidates = remaining_candidates(registry, game, pokemon_ids)
+    suggestion = None
+    if candidates and not game.is_completed:
+        # Stable for a given game state, so asking again gives the same hint
+        hint = index.pick(candidates, f'{game.target_pokemon.id}:{pokemon_ids}')
+        suggestion = {'name': hint.name, 'image': hint.get_icon_image()}
+    data = {'remaining': index.count(candidates), 'suggestion': suggestion}
+    if include_list:
+        data['candidates'] = [pokemon.name for pokemon in index.members(candidates)]
+    response = game_response(game, data)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+def game_token_from(request):
+    """Token sent by the client for GET requests in token mode"""
+    return request.headers.get('X-Game-Token') or request.GET.get('token')
+
 def index(request):
     """Main game page"""
     return render(request, 'game/index.html')
 
 @csrf_exempt
 def new_game(request):
-    """Start a new game"""
+    """Start a new game (``mode=daily`` plays the shared daily puzzle)"""
+    mode = requested_game_mode(request)
+    if uses_game_tokens():
+        game = get_current_game(request, mode=mode, difficulty=requested_difficulty(request))
+        return game_response(game, {'status': 'success', 'message': 'New game started!'})
+    
     if not request.session.session_key:
         request.session.create()
     
-    # End current game if exists
-    GameSession.objects.filter(
-        session_key=request.session.session_key,
-        is_completed=False
-    ).update(is_completed=True)
-    
-    # Create new game
-    gen1_pokemon = Pokemon.objects.filter(generation=1)
-    target_pokemon = random.choice(gen1_pokemon)
-    
-    game_session = GameSession.objects.create(
-        session_key=request.session.session_key,
-        target_pokemon=target_pokemon,
-        generation=1
+    target_pokemon, puzzle_date = choose_target(
+        get_registry(), mode, bag_store(request), requested_difficulty(request)
     )
-    
+    replace_active_game(request.session.session_key, request_user_id(request), target_pokemon, puzzle_date)
     return JsonResponse({'status': 'success', 'message': 'New game started!'})
 
+def replace_active_game(session_key, user_id, target_pokemon, puzzle_date):
+    """End the session's active game, if any, and start a new one, atomically"""
+    try:
+        with transaction.atomic():
+            # End current game if exists
+            active = GameSession.objects.select_for_update().filter(
+                session_key=session_key,
+                is_completed=False
+            ).first()
+            if active is not None:
+                GameSession.objects.filter(pk=active.pk).update(is_completed=True)
+                # Giving up after a guess counts as a loss, so it cannot save a streak
+                if active.guesses_count:
+                    record_completed_game(active)
+            
+            # Create new game
+            GameSession.objects.create(
+                session_key=session_key,
+                user_id=user_id,
+                target_pokemon=target_pokemon,
+                generation=1,
+                puzzle_date=puzzle_date
+            )
+    except IntegrityError:
+        # A concurrent new_game for this session won the race; its game is the new one
+        pass
+
+def get_daily_info(request):
+    """Today's shared puzzle; identical for every player, so it is publicly cacheable"""
+    puzzle = get_daily_puzzle(get_registry())
+    response = JsonResponse(puzzle.info())
+    response['Cache-Control'] = f'public, max-age={seconds_until_next_puzzle()}'
+    return response
+
+def search_pokemon(request):
+    """Autocomplete matches for a partial name, with sprites"""
+    query = request.GET.get('q', '')
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 8)), 50))
+    except ValueError:
+        limit = 8
+    
+    matches = get_search_index(get_registry(), 1).search(query, limit)
+    response = JsonResponse({'results': [
+        {
+            'id': pokemon.id,
+            'name': pokemon.name,
+            'pokedex_number': pokemon.pokedex_number,
+            'sprite_url': pokemon.sprite_url,
+            'image': pokemon.get_icon_image()
+        }
+        for pokemon in matches
+    ]})
+    response['Cache-Control'] = pokemon_list_cache_control()
+    return response
+
 def get_pokemon_list(request):
     """Get list of Gen 1 Pokemon for autocomplete"""
-    gen1_pokemon = Pokemon.objects.filter(generation=1).values('name', 'image_url', 'sprite_url')
-    pokemon_data = []
-    
-    for pokemon in gen1_pokemon:
-        pokemon_data.append({
-            'name': pokemon['name'],
-            'image_url': pokemon['image_url'],
-            'sprite_url': pokemon['sprite_url']
-        })
-    
-    return JsonResponse({'pokemon': [p['name'] for p in pokemon_data], 'pokemon_data': pokemon_data})
+    payload = get_registry().derived('pokemon_list', build_pokemon_list)
+    return payload.serve(request, pokemon_list_cache_control())
 
 @csrf_exempt
 def make_guess(request):
     """Process a guess"""
-    if request.method != 'POST':
-        return JsonResponse({'error': 'Only POST allowed'}, status=405)
+    data, pokemon_name, error = parse_guess(request)
+    if error:
+        return error
     
+    # Get current game
     try:
-        data = json.loads(request.body)
-        pokemon_name = data.get('pokemon_name', '').strip().title()
-    except json.JSONDecodeError:
-        return JsonResponse({'error': 'Invalid JSON'}, status=400)
-    
-    if not pokemon_name:
-        return JsonResponse({'error': 'Pokemon name required'}, status=400)
+        game = get_current_game(request, data.get('game_token'))
+    except signing.BadSignature:
+        return JsonResponse({'error': 'Invalid game token'}, status=400)
     
-    # Get current game session
-    game_session = get_or_create_session(request)
-    
-    if game_session.is_completed:
-        return JsonResponse({'error': 'Game already completed'}, status=400)
-    
-    if game_session.guesses_count >= game_session.max_guesses:
-        return JsonResponse({'error': 'Max guesses reached'}, status=400)
-    
-    # Find the guessed Pokemon
-    try:
-        guessed_pokemon = Pokemon.objects.get(name__iexact=pokemon_name, generation=1)
-    except Pokemon.DoesNotExist:
-        return JsonResponse({'error': 'Pokemon not found in Gen 1'}, status=400)
+    registry = get_registry()
+    guessed_pokemon, error = resolve_guess(registry, game, pokemon_name)
+    if error:
+        return error
     
     # Check if already guessed
-    if Guess.objects.filter(game_session=game_session, pokemon=guessed_pokemon).exists():
+    if game.has_guessed(guessed_pokemon):
         return JsonResponse({'error': 'Pokemon already guessed'}, status=400)
     
-    # Create guess
-    game_session.guesses_count += 1
-    guess = Guess.objects.create(
-        game_session=game_session,
-        pokemon=guessed_pokemon,
-        guess_number=game_session.guesses_count
-    )
-    
-    target = game_session.target_pokemon
-    
-    # Compare attributes
-    def compare_attribute(guess_val, target_val):
-        if guess_val == target_val:
-            return 'correct'
-        else:
-            return 'incorrect'
-    
-    def compare_numeric(guess_val, target_val):
-        if guess_val == target_val:
-            return 'correct'
-        elif guess_val < target_val:
-            return 'low'
-        else:
-            return 'high'
-    
-    # Build comparison result with images
-    result = {
-        'pokemon_name': guessed_pokemon.name,
-        'image_url': guessed_pokemon.image_url,
-        'sprite_url': guessed_pokemon.sprite_url,
-        'display_image': guessed_pokemon.get_display_image(),  # Best available image
-        'pokedex_number': {
-            'value': guessed_pokemon.pokedex_number,
-            'status': compare_numeric(guessed_pokemon.pokedex_number, target.pokedex_number)
-        },
-        'type1': {
-            'value': guessed_pokemon.type1,
-            'status': compare_attribute(guessed_pokemon.type1, target.type1)
-        },
-        'type2': {
-            'value': guessed_pokemon.type2 or 'None',
-            'status': compare_attribute(guessed_pokemon.type2, target.type2)
-        },
-        'height': {
-            'value': guessed_pokemon.height,
-            'status': compare_numeric(guessed_pokemon.height, target.height)
-        },
-        'weight': {
-            'value': guessed_pokemon.weight,
-            'status': compare_numeric(guessed_pokemon.weight, target.weight)
-        },
-        'base_stat_total': {
-            'value': guessed_pokemon.base_stat_total,
-            'status': compare_numeric(guessed_pokemon.base_stat_total, target.base_stat_total)
-        },
-        'is_legendary': {
-            'value': guessed_pokemon.is_legendary,
-            'status': compare_attribute(guessed_pokemon.is_legendary, target.is_legendary)
-        },
-        'color': {
-            'value': guessed_pokemon.color,
-            'status': compare_attribute(guessed_pokemon.color, target.color)
-        },
-        'habitat': {
-            'value': guessed_pokemon.habitat or 'Unknown',
-            'status': compare_attribute(guessed_pokemon.habitat, target.habitat)
-        }
-    }
-    
-    # Check if won
-    is_correct = guessed_pokemon == target
-    if is_correct:
-        game_session.is_won = True
-        game_session.is_completed = True
-    elif game_session.guesses_count >= game_session.max_guesses:
-        game_session.is_completed = True
-    
-    game_session.save()
-    
-    response_data = {
-        'result': result,
-        'is_correct': is_correct,
-        'game_over': game_session.is_completed,
-        'guesses_remaining': game_session.max_guesses - game_session.guesses_count,
-        'target_pokemon': target.name if game_session.is_completed and not is_correct else None,
-        'target_image': target.get_display_image() if game_session.is_completed and not is_correct else None
-    }
-    
-    return JsonResponse(response_data)
+    is_correct = game.record_guess(guessed_pokemon)
+    return guess_response(registry, game, guessed_pokemon, is_correct, wants_compact(request, data))
 
 def get_game_state(request):
     """Get current game state with images"""
-    game_session = get_or_create_session(request)
+    try:
+        game = get_current_game(request, game_token_from(request))
+    except signing.BadSignature:
+        # Unusable token: start over, like an expired session would
+        game = get_current_game(request)
     
-    # Get all guesses
-    guesses = []
-    for guess in game_session.guesses.all():
-        target = game_session.target_pokemon
-        
-        # Rebuild comparison for each guess
-        def compare_attribute(guess_val, target_val):
-            return 'correct' if guess_val == target_val else 'incorrect'
-        
-        def compare_numeric(guess_val, target_val):
-            if guess_val == target_val:
-                return 'correct'
-            elif guess_val < target_val:
-                return 'low'
-            else:
-                return 'high'
-        
-        guess_result = {
-            'pokemon_name': guess.pokemon.name,
-            'image_url': guess.pokemon.image_url,
-            'sprite_url': guess.pokemon.sprite_url,
-            'display_image': guess.pokemon.get_display_image(),  # Best available image
-            'pokedex_number': {
-                'value': guess.pokemon.pokedex_number,
-                'status': compare_numeric(guess.pokemon.pokedex_number, target.pokedex_number)
-            },
-            'type1': {
-                'value': guess.pokemon.type1,
-                'status': compare_attribute(guess.pokemon.type1, target.type1)
-            },
-            'type2': {
-                'value': guess.pokemon.type2 or 'None',
-                'status': compare_attribute(guess.pokemon.type2, target.type2)
-            },
-            'height': {
-                'value': guess.pokemon.height,
-                'status': compare_numeric(guess.pokemon.height, target.height)
-            },
-            'weight': {
-                'value': guess.pokemon.weight,
-                'status': compare_numeric(guess.pokemon.weight, target.weight)
-            },
-            'base_stat_total': {
-                'value': guess.pokemon.base_stat_total,
-                'status': compare_numeric(guess.pokemon.base_stat_total, target.base_stat_total)
-            },
-            'is_legendary': {
-                'value': guess.pokemon.is_legendary,
-                'status': compare_attribute(guess.pokemon.is_legendary, target.is_legendary)
-            },
-            'color': {
-                'value': guess.pokemon.color,
-                'status': compare_attribute(guess.pokemon.color, target.color)
-            },
-            'habitat': {
-                'value': guess.pokemon.habitat or 'Unknown',
-                'status': compare_attribute(guess.pokemon.habitat, target.habitat)
-            }
-        }
-        guesses.append(guess_result)
+    return game_state_response(get_registry(), game, game.guessed_pokemon_ids(), wants_compact(request))
+
+def get_candidates(request):
+    """Pokemon still consistent with the current game's feedback (``list=1`` names them)"""
+    try:
+        game = get_current_game(request, game_token_from(request))
+    except signing.BadSignature:
+        return JsonResponse({'error': 'Invalid game token'}, status=400)
     
-    return JsonResponse({
-        'guesses': guesses,
-        'guesses_remaining': game_session.max_guesses - game_session.guesses_count,
-        'is_completed': game_session.is_completed,
-        'is_won': game_session.is_won,
-        'target_pokemon': game_session.target_pokemon.name if game_session.is_completed else None,
-        'target_image': game_session.target_pokemon.get_display_image() if game_session.is_completed else None,
-        'completion_rate': game_session.get_completion_rate()
-    })
+    include_list = request.GET.get('list') in ('1', 'true')
+    return candidates_response(get_registry(), game, game.guessed_pokemon_ids(), include_list)
 
 # NEW: Additional helpful endpoints
 
 def get_pokemon_details(request, pokemon_id):
     """Get detailed info about a specific Pokemon"""
-    try:
-        pokemon = Pokemon.objects.get(pokedex_number=pokemon_id, generation=1)
+    pokemon = get_registry().get_by_number(pokemon_id, generation=1)
+    if pokemon is not None:
         return JsonResponse({
             'name': pokemon.name,
             'pokedex_number': pokemon.pokedex_number,
@@ -295,27 +380,98 @@ def get_pokemon_details(request, pokemon_id):
             'sprite_url': pokemon.sprite_url,
             'display_image': pokemon.get_display_image()
         })
-    except Pokemon.DoesNotExist:
-        return JsonResponse({'error': 'Pokemon not found'}, status=404)
+    return JsonResponse({'error': 'Pokemon not found'}, status=404)
 
 def get_game_stats(request):
-    """Get overall game statistics for this session"""
-    if not request.session.session_key:
-        return JsonResponse({'error': 'No session found'}, status=404)
-    
-    session_key = request.session.session_key
-    games = GameSession.objects.filter(session_key=session_key)
+    """Win and streak statistics for this player, read from their PlayerStats row"""
+    key = request_stats_key(request)
+    stats = PlayerStats.objects.filter(pk=key).first() if key else None
+    response = JsonResponse(stats_payload(stats or PlayerStats(key=key or '')))
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+def get_openers(request):
+    """Best opening guesses by information gain, from the precomputed opening book"""
+    registry = get_registry()
+    book = get_opening_book(registry, 1)
+    if book is None:
+        return JsonResponse({'error': 'No opening book for this Pokédex'}, status=404)
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 5)), len(book.openers)))
+    except ValueError:
+        limit = 5
     
-    total_games = games.count()
-    won_games = games.filter(is_won=True).count()
-    completed_games = games.filter(is_completed=True).count()
+    response = JsonResponse({
+        'generation': book.generation,
+        'openers': [
+            {
+                'name': opener['pokemon'].name,
+                'image': opener['pokemon'].get_icon_image(),
+                'bits': opener['bits'],
+                'largest_group': opener['largest_group'],
+            }
+            for opener in book.openers[:limit] if opener['pokemon'] is not None
+        ],
+        'average_solve_depth': book.average_depth,
+        'max_solve_depth': book.max_depth,
+        'attribute_bits': book.attribute_bits,
+    })
+    response['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+def get_metrics(request):
+    """Request metrics of every worker, in Prometheus text format"""
+    if not settings.METRICS_ENABLED:
+        return JsonResponse({'error': 'Metrics are disabled'}, status=404)
+    if not settings.METRICS_TOKEN:
+        # Without a token the metrics are only open in development
+        if not settings.DEBUG:
+            return JsonResponse({'error': 'Set METRICS_TOKEN to serve metrics'}, status=403)
+    elif request.headers.get('Authorization') != f'Bearer {settings.METRICS_TOKEN}':
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    response = HttpResponse(
+        metrics.render(metrics.collect()), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+    response['Cache-Control'] = 'no-store'
+    return response
+
+def analytics_days(request, default=7):
+    try:
+        return max(1, min(int(request.GET.get('days', default)), 90))
+    except ValueError:
+        return default
+
+def get_pokemon_analytics(request):
+    """Solve rates and opening guesses over the last ``days`` complete days, from the rollups"""
+    days = analytics_days(request)
+    # Stop at yesterday so the stats never hint at today's daily puzzle
+    until = timezone.localdate() - timedelta(days=1)
+    since = until - timedelta(days=days - 1)
+    registry = get_registry()
     
-    win_rate = (won_games / completed_games * 100) if completed_games > 0 else 0
+    targets = []
+    for row in target_summary(since, until):
+        pokemon = registry.get(row['target_pokemon_id'])
+        if pokemon is None:
+            continue
+        targets.append({
+            'name': pokemon.name,
+            'pokedex_number': pokemon.pokedex_number,
+            'games': row['games'],
+            'solve_rate': round(row['won'] / row['games'] * 100, 1),
+            'average_guesses_to_solve': round(row['guesses'] / row['won'], 2) if row['won'] else None,
+        })
+    first_guesses = [
+        {'name': registry.get(row['pokemon_id']).name, 'games': row['times']}
+        for row in first_guess_summary(since, until)
+        if registry.get(row['pokemon_id']) is not None
+    ]
     
-    return JsonResponse({
-        'total_games': total_games,
-        'completed_games': completed_games,
-        'won_games': won_games,
-        'win_rate': round(win_rate, 1),
-        'active_games': total_games - completed_games
-    })
\ No newline at end of file
+    response = JsonResponse({
+        'since': since.isoformat(),
+        'until': until.isoformat(),
+        'targets': targets,
+        'first_guesses': first_guesses,
+    })
+    response['Cache-Control'] = 'public, max-age=300'
+    return response
@@ -4,6 +4,7 @@ Django settings for pokemon_wordle project.
 
 from pathlib import Path
 import os
+import tempfile
 import dj_database_url
 from decouple import config 
 
@@ -29,8 +30,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files
+    'game.middleware.PokemonImageWhiteNoiseMiddleware',  # Static files and cached Pokemon images
+    'game.middleware.MetricsMiddleware',  # Per-view metrics for /metrics (static files are not counted)
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'game.middleware.TargetBagMiddleware',  # Shuffle bags of identity sessions, see game/targets.py
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -67,6 +70,37 @@ DATABASES = {
     )
 }
 
+# 'default' is a per-process cache. 'pokedex' and 'sessions' are file-based
+# caches shared by every process on the host: a management command's registry
+# invalidation reaches the gunicorn workers, and a logout or session flush in
+# one worker is seen by the others. With several hosts, point both at a cache
+# they all share (Redis, database cache).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pokedex': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('POKEDEX_CACHE_DIR', default=os.path.join(tempfile.gettempdir(), 'pokeguess-cache')),
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('SESSION_CACHE_DIR', default=os.path.join(tempfile.gettempdir(), 'pokeguess-sessions')),
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+
+# Session storage: 'db' (Django's default), 'cached_db' (the database behind the
+# 'sessions' cache) or 'identity' (anonymous players get self-verifying keys and
+# no django_session row, see game/sessions.py)
+SESSION_MODE = config('SESSION_MODE', default='db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'identity': 'game.sessions',
+}[SESSION_MODE]
+SESSION_CACHE_ALIAS = 'sessions'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -105,4 +139,65 @@ if not DEBUG:
     SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
     SECURE_SSL_REDIRECT = False
     SECURE_BROWSER_XSS_FILTER = True
-    SECURE_CONTENT_TYPE_NOSNIFF = True
\ No newline at end of file
+    SECURE_CONTENT_TYPE_NOSNIFF = True
+
+# Pokedex registry
+# Cache alias holding the dataset version stamp. Every worker and management
+# command must share it so workers reload after a repopulate. The file-based
+# 'pokedex' cache covers one host; with several hosts point it at Redis or the
+# database cache.
+POKEDEX_REGISTRY_CACHE = 'pokedex'
+# Seconds a worker trusts its snapshot before reading the stamp again. Other
+# processes' changes show up within this delay; 0 checks on every lookup.
+POKEDEX_VERSION_CHECK_INTERVAL = config('POKEDEX_VERSION_CHECK_INTERVAL', default=2.0, cast=float)
+
+# Seconds browsers may reuse /pokemon-list/ before revalidating its ETag
+POKEMON_LIST_MAX_AGE = 60
+
+# Game state storage: 'db' keeps games in GameSession/Guess rows, 'token'
+# carries them in a signed client-side token with no writes per guess
+GAME_STATE_MODE = config('GAME_STATE_MODE', default='db')
+# In token mode, record each finished game as a GameSession row when it ends
+GAME_TOKEN_SUMMARY_WRITE = config('GAME_TOKEN_SUMMARY_WRITE', default=True, cast=bool)
+
+# Games keep their guesses in GameSession.guess_ids. With this on, every guess
+# is also written as a Guess row by a background thread (an analytics log that
+# nothing on the request path reads)
+GAME_GUESS_LOG = config('GAME_GUESS_LOG', default=True, cast=bool)
+
+# Route the game endpoints to their async versions (use with an ASGI server)
+GAME_ASYNC_VIEWS = config('GAME_ASYNC_VIEWS', default=False, cast=bool)
+
+# archive_games moves games older than this many days into GAME_ARCHIVE_DIR
+GAME_RETENTION_DAYS = config('GAME_RETENTION_DAYS', default=90, cast=int)
+GAME_ARCHIVE_DIR = config('GAME_ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
+
+# Request metrics served at /metrics in Prometheus text format. Each worker
+# flushes its totals to METRICS_DIR every METRICS_FLUSH_INTERVAL seconds;
+# /metrics adds up every worker sharing the directory. Scrapes must send
+# "Authorization: Bearer <METRICS_TOKEN>"; without a token /metrics is only
+# served when DEBUG is on.
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_DIR = config('METRICS_DIR', default=os.path.join(tempfile.gettempdir(), 'pokeguess-metrics'))
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5.0, cast=float)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Results benchmark_endpoints compares against (write one with --save-baseline)
+BENCHMARK_BASELINE_PATH = BASE_DIR / 'benchmark-baseline.json'
+
+# On-disk cache of PokeAPI responses used by populate_pokemon
+POKEAPI_CACHE_DIR = BASE_DIR / '.pokeapi-cache'
+
+# Versioned Pokedex bundle written by export_pokedex and seeded by load_pokedex
+POKEDEX_BUNDLE_PATH = BASE_DIR / 'game' / 'data' / 'pokedex.jsonl.gz'
+
+# Opening books written by solve_openers (best openers and per-target solve depth)
+SOLVER_DATA_DIR = BASE_DIR / 'game' / 'data' / 'solver'
+
+# Content-addressed Pokemon artwork written by cache_pokemon_images and served
+# by WhiteNoise with immutable cache headers
+POKEMON_IMAGE_ROOT = BASE_DIR / 'pokemon-images'
+POKEMON_IMAGE_URL = '/pokemon-images/'
+# Thumbnail edge in pixels: 2x the boxes game.js renders (32px autocomplete,
+# 46px guess rows, 80px game-over modal)
+POKEMON_IMAGE_SIZES = {'sm': 64, 'md': 96, 'lg': 160}
@@ -1,14 +1,20 @@
 class PokemonWordle {
     constructor() {
-        this.pokemonList = [];
-        this.pokemonData = [];
         this.currentInput = '';
         this.filteredPokemon = [];
+        this.searchResults = {};
+        this.searchTimer = null;
+        this.searchSequence = 0;
+        this.spriteAtlas = null;
+        this.atlasOffsets = {};
+        this.pokedex = null;
+        this.pokedexFields = [];
+        this.statusNames = [];
         this.selectedIndex = -1;
         this.gameStarted = false;
+        this.gameToken = localStorage.getItem('gameToken');
         
         this.initializeElements();
-        this.loadPokemonList();
         this.setupCSRF();
     }
     
@@ -32,13 +38,24 @@ class PokemonWordle {
         return cookieValue;
     }
     
+    // In token mode the server hands back the whole game state as a signed token
+    storeGameToken(data) {
+        if (data && data.game_token) {
+            this.gameToken = data.game_token;
+            localStorage.setItem('gameToken', data.game_token);
+        }
+    }
+    
     initializeElements() {
         this.pokemonInput = document.getElementById('pokemon-input');
         this.guessBtn = document.getElementById('guess-btn');
         this.newGameBtn = document.getElementById('new-game-btn');
+        this.dailyGameBtn = document.getElementById('daily-game-btn');
         this.autocomplete = document.getElementById('autocomplete');
         this.resultsGrid = document.getElementById('results-grid');
         this.guessesRemaining = document.getElementById('guesses-remaining');
+        this.hintBtn = document.getElementById('hint-btn');
+        this.hintMessage = document.getElementById('hint-message');
         this.modal = document.getElementById('game-over-modal');
         this.gameOverTitle = document.getElementById('game-over-title');
         this.gameOverMessage = document.getElementById('game-over-message');
@@ -46,6 +63,7 @@ class PokemonWordle {
     }
     
     initialize() {
+        this.pokemonListLoaded = this.loadPokemonList();
         this.loadGameState();
         this.setupEventListeners();
         this.gameStarted = true;
@@ -57,24 +75,81 @@ class PokemonWordle {
         }, 600);
     }
     
+    // The Pokédex compact guess results refer to, plus one atlas image for
+    // every autocomplete sprite instead of one request each
     async loadPokemonList() {
         try {
             const response = await fetch('/pokemon-list/');
             const data = await response.json();
-            this.pokemonList = data.pokemon.sort();
-            this.pokemonData = data.pokemon_data || [];
+            
+            this.pokedex = {};
+            this.pokedexFields = data.fields;
+            this.statusNames = data.statuses;
+            data.pokemon_data.forEach(pokemon => {
+                this.pokedex[pokemon.number] = pokemon;
+                if (data.atlas && pokemon.atlas_offset) {
+                    this.atlasOffsets[pokemon.name] = pokemon.atlas_offset;
+                }
+            });
+            this.spriteAtlas = data.atlas || null;
+            return true;
         } catch (error) {
-            console.error('Error loading Pokemon list:', error);
+            console.error('Error loading Pokémon list:', error);
+            this.pokedex = null;
+            return false;
         }
     }
     
+    // Compact results are [Pokédex number, statuses packed two bits per attribute]
+    decodeGuess(guess) {
+        if (!Array.isArray(guess)) return guess;
+        
+        const [number, packed] = guess;
+        const pokemon = this.pokedex[number];
+        const result = {
+            pokemon_name: pokemon.name,
+            image_url: pokemon.image_url,
+            sprite_url: pokemon.sprite_url,
+            display_image: pokemon.display_image
+        };
+        this.pokedexFields.forEach((field, index) => {
+            result[field] = {
+                value: pokemon.values[index],
+                status: this.statusNames[(packed >> (2 * index)) & 3]
+            };
+        });
+        return result;
+    }
+    
+    createAtlasSprite(pokemon, size = 32) {
+        const offset = this.atlasOffsets[pokemon];
+        if (!this.spriteAtlas || !offset) return null;
+        
+        const scale = size / this.spriteAtlas.cell;
+        const sprite = document.createElement('span');
+        sprite.className = 'autocomplete-image autocomplete-sprite';
+        sprite.setAttribute('role', 'img');
+        sprite.setAttribute('aria-label', pokemon);
+        sprite.style.backgroundImage = `url(${this.spriteAtlas.url})`;
+        sprite.style.backgroundSize = `${this.spriteAtlas.width * scale}px ${this.spriteAtlas.height * scale}px`;
+        sprite.style.backgroundPosition = `-${offset[0] * scale}px -${offset[1] * scale}px`;
+        return sprite;
+    }
+    
     async loadGameState() {
         try {
-            const response = await fetch('/game-state/');
-            const data = await response.json();
+            const headers = this.gameToken ? { 'X-Game-Token': this.gameToken } : {};
+            // Requested alongside /pokemon-list/; without the list, ask again in full
+            let response = await fetch('/game-state/?format=compact', { headers });
+            let data = await response.json();
+            if (!(await this.pokemonListLoaded)) {
+                response = await fetch('/game-state/', { headers });
+                data = await response.json();
+            }
+            this.storeGameToken(data);
             
             this.updateGuessesRemaining(data.guesses_remaining);
-            this.displayGuesses(data.guesses);
+            this.displayGuesses(data.guesses.map(guess => this.decodeGuess(guess)));
             
             if (data.is_completed) {
                 if (data.is_won) {
@@ -111,6 +186,18 @@ class PokemonWordle {
             this.startNewGame();
         });
         
+        if (this.dailyGameBtn) {
+            this.dailyGameBtn.addEventListener('click', () => {
+                this.startNewGame('daily');
+            });
+        }
+        
+        if (this.hintBtn) {
+            this.hintBtn.addEventListener('click', () => {
+                this.showHint();
+            });
+        }
+        
         this.playAgainBtn.addEventListener('click', () => {
             this.hideModal();
             this.startNewGame();
@@ -125,18 +212,34 @@ class PokemonWordle {
     
     handleInput(value) {
         this.currentInput = value;
+        clearTimeout(this.searchTimer);
         
         if (value.length < 2) {
+            this.searchSequence++;
             this.hideAutocomplete();
             return;
         }
         
-        this.filteredPokemon = this.pokemonList.filter(pokemon =>
-            pokemon.toLowerCase().includes(value.toLowerCase())
-        ).slice(0, 8);
-        
-        this.selectedIndex = -1;
-        this.showAutocomplete();
+        this.searchTimer = setTimeout(() => this.searchPokemon(value), 120);
+    }
+    
+    async searchPokemon(query) {
+        // Drop responses that arrive after a newer query was sent
+        const sequence = ++this.searchSequence;
+        try {
+            const response = await fetch(`/pokemon-search/?q=${encodeURIComponent(query)}&limit=8`);
+            const data = await response.json();
+            if (sequence !== this.searchSequence) return;
+            
+            data.results.forEach(result => {
+                this.searchResults[result.name] = result;
+            });
+            this.filteredPokemon = data.results.map(result => result.name);
+            this.selectedIndex = -1;
+            this.showAutocomplete();
+        } catch (error) {
+            console.error('Error searching Pokemon:', error);
+        }
     }
     
     handleKeyDown(e) {
@@ -173,11 +276,20 @@ class PokemonWordle {
             const item = document.createElement('div');
             item.className = 'autocomplete-item';
             
-            const pokemonInfo = this.pokemonData.find(p => p.name === pokemon);
+            const pokemonInfo = this.searchResults[pokemon];
             
-            if (pokemonInfo && pokemonInfo.sprite_url) {
+            const sprite = this.createAtlasSprite(pokemon);
+            const imageUrl = pokemonInfo && (pokemonInfo.image || pokemonInfo.sprite_url);
+            if (sprite) {
+                const text = document.createElement('span');
+                text.textContent = pokemon;
+                text.className = 'autocomplete-text';
+                
+                item.appendChild(sprite);
+                item.appendChild(text);
+            } else if (imageUrl) {
                 const img = document.createElement('img');
-                img.src = pokemonInfo.sprite_url;
+                img.src = imageUrl;
                 img.alt = pokemon;
                 img.className = 'autocomplete-image';
                 img.onerror = () => {
@@ -236,11 +348,6 @@ class PokemonWordle {
             return;
         }
         
-        if (!this.pokemonList.some(p => p.toLowerCase() === pokemonName.toLowerCase())) {
-            alert('Please enter a valid Generation 1 Pokémon name!');
-            return;
-        }
-        
         try {
             const response = await fetch('/guess/', {
                 method: 'POST',
@@ -248,23 +355,30 @@ class PokemonWordle {
                     'Content-Type': 'application/json',
                     'X-CSRFToken': this.csrfToken,
                 },
-                body: JSON.stringify({ pokemon_name: pokemonName })
+                body: JSON.stringify({
+                    pokemon_name: pokemonName,
+                    game_token: this.gameToken,
+                    format: this.pokedex ? 'compact' : undefined
+                })
             });
             
             const data = await response.json();
+            this.storeGameToken(data);
             
             if (!response.ok) {
                 alert(data.error || 'An error occurred');
                 return;
             }
             
-            this.displayGuess(data.result);
+            const result = this.decodeGuess(data.result);
+            this.displayGuess(result);
             this.updateGuessesRemaining(data.guesses_remaining);
+            this.setHint('');
             this.pokemonInput.value = '';
             this.hideAutocomplete();
             
             if (data.is_correct) {
-                this.showGameOver(true, data.result.pokemon_name, data.result.display_image);
+                this.showGameOver(true, result.pokemon_name, result.display_image);
             } else if (data.game_over) {
                 this.showGameOver(false, data.target_pokemon, data.target_image);
             }
@@ -374,6 +488,31 @@ class PokemonWordle {
         });
     }
     
+    // The server counts the Pokémon that still fit every guess so far
+    async showHint() {
+        try {
+            const headers = this.gameToken ? { 'X-Game-Token': this.gameToken } : {};
+            const response = await fetch('/candidates/', { headers });
+            const data = await response.json();
+            
+            if (!response.ok) {
+                this.setHint(data.error || 'No hint available');
+                return;
+            }
+            
+            const matches = data.remaining === 1 ? '1 Pokémon still fits' : `${data.remaining} Pokémon still fit`;
+            this.setHint(data.suggestion ? `${matches}. Try ${data.suggestion.name}?` : `${matches}.`);
+        } catch (error) {
+            console.error('Error loading hint:', error);
+        }
+    }
+    
+    setHint(message) {
+        if (this.hintMessage) {
+            this.hintMessage.textContent = message;
+        }
+    }
+    
     updateGuessesRemaining(remaining) {
         if (!this.guessesRemaining) return;
         
@@ -425,20 +564,23 @@ class PokemonWordle {
         modalContent.classList.remove('win', 'lose');
     }
     
-    async startNewGame() {
+    async startNewGame(mode = null) {
         try {
             const response = await fetch('/new-game/', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                     'X-CSRFToken': this.csrfToken,
-                }
+                },
+                body: JSON.stringify(mode ? { mode } : {})
             });
             
             if (response.ok) {
+                this.storeGameToken(await response.json());
                 if (this.resultsGrid) this.resultsGrid.innerHTML = '';
                 if (this.pokemonInput) this.pokemonInput.value = '';
                 this.updateGuessesRemaining(6);
+                this.setHint('');
                 this.hideAutocomplete();
                 this.hideModal();
                 